@@ -38,7 +38,7 @@ This script performs the full assignment pipeline:
      All results are written to:
        pert_summary.csv
 
-  3. Run a Monte Carlo simulation with N = 1000 iterations:
+  3. Run a Monte Carlo simulation with N iterations (1000 by default):
        - For each task and each iteration, sample a value from a
          triangular distribution with:
              low  = Optimistic
@@ -74,17 +74,29 @@ Usage:
       python3 pert_mc_simulation.py
 
   You will be prompted for the input filename; pressing Enter will use
-  the default "Critical Path Data.csv".
+  the default "Critical Path Data.csv". Optional prompts follow for a
+  precedence network file, the number of iterations ('auto' keeps
+  simulating until the 70/80/90% durations reach a chosen precision),
+  a random seed and the number of worker processes.
 """
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, Dict, Any, List
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Folder of the Module 10 network diagram solver in this repository,
+# used by load_network() when no copy sits next to this script.
+NETWORK_SOLVER_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, os.pardir, os.pardir,
+    "Module 10", "Network_diagram_bsingh55",
+)
+
 
 # ---------------------------------------------------------------------------
 # Utility: read the input file (CSV or Excel) and normalize it
@@ -252,76 +264,743 @@ def compute_pert_summary(clean_df: pd.DataFrame) -> pd.DataFrame:
 # Monte Carlo simulation using triangular distributions
 # ---------------------------------------------------------------------------
 
-def run_monte_carlo(clean_df: pd.DataFrame, n_iter: int = 1000):
+def triangular_parameters(clean_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Run Monte Carlo simulation for the critical path.
+    Return per-task (low, mode, high) arrays ready for sampling.
 
-    For each task:
-      - If O < P and O <= ML <= P  -> sample from triangular(O, ML, P).
-      - If O == ML == P            -> deterministic task, use constant value.
-    Returns:
-      mc_matrix: 2D numpy array shape (n_iter, n_tasks)
-      total_durations: 1D numpy array length n_iter
+    Data that is slightly off is fixed gracefully, all at once:
+      - Optimistic > Pessimistic    -> the two are swapped
+      - Most likely outside [O, P]  -> clamped into the range
+      - O == ML == P (within tolerance) -> deterministic task; all three
+        are set to ML so the triangle collapses to a point
     """
-    task_names = clean_df["Task"].tolist()
     optimistic = clean_df["Optimistic"].to_numpy(dtype=float)
     most_likely = clean_df["MostLikely"].to_numpy(dtype=float)
     pessimistic = clean_df["Pessimistic"].to_numpy(dtype=float)
 
-    n_tasks = len(task_names)
+    low = np.minimum(optimistic, pessimistic)
+    high = np.maximum(optimistic, pessimistic)
+    mode = np.clip(most_likely, low, high)
 
-    # Matrix of samples: each column is a task, each row is one simulation run.
-    mc_matrix = np.zeros((n_iter, n_tasks), dtype=float)
+    deterministic = np.isclose(low, mode) & np.isclose(mode, high)
+    low = np.where(deterministic, most_likely, low)
+    high = np.where(deterministic, most_likely, high)
+    mode = np.where(deterministic, most_likely, mode)
 
-    for j in range(n_tasks):
-        o = optimistic[j]
-        m = most_likely[j]
-        p = pessimistic[j]
+    return low, mode, high
 
-        # Basic sanity check; if data is slightly off, fix it gracefully
-        if p < o:
-            o, p = p, o  # swap so that o <= p
 
-        # Degenerate case: deterministic task (triangle collapses to a point)
-        if np.isclose(o, m) and np.isclose(m, p):
-            samples = np.full(n_iter, m, dtype=float)
-        else:
-            # Regular triangular sampling
-            # Ensure mode is within [o, p]; if not, clamp it.
-            if m < o:
-                m = o
-            elif m > p:
-                m = p
+def sample_task_durations(
+    clean_df: pd.DataFrame,
+    n_iter: int = 1000,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """
+    Sample every task's duration n_iter times from triangular(O, ML, P).
+
+    All tasks are sampled together by inverting the triangular CDF over
+    the whole (n_iter, n_tasks) matrix of uniforms U:
+        F(mode) = (mode - low) / (high - low)
+        U <  F(mode): low  + sqrt(U * (high - low) * (mode - low))
+        U >= F(mode): high - sqrt((1 - U) * (high - low) * (high - mode))
+    Deterministic tasks have low == mode == high, so both branches give
+    the constant value without special-casing any column.
+
+    rng is a numpy.random.Generator (default: a freshly seeded one).
+
+    Returns:
+      mc_matrix: 2D numpy array shape (n_iter, n_tasks), one column per
+                 task in clean_df order.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    low, mode, high = triangular_parameters(clean_df)
+    width = high - low
+    left_area = width * (mode - low)
+    right_area = width * (high - mode)
+    peak = np.divide(mode - low, width, out=np.ones_like(width), where=width > 0)
 
-            samples = np.random.triangular(left=o, mode=m, right=p, size=n_iter)
+    samples = rng.random((n_iter, len(low)))
+    left_of_mode = samples < peak
 
-        mc_matrix[:, j] = samples
+    # Distance from the nearer end of the range, computed in place with
+    # masks so no full-size temporaries are created per branch.
+    offset = samples * left_area
+    np.subtract(1.0, samples, out=samples)
+    np.multiply(samples, right_area, out=offset, where=~left_of_mode)
+    np.sqrt(offset, out=offset)
+
+    np.subtract(high, offset, out=samples)
+    np.add(low, offset, out=samples, where=left_of_mode)
+
+    return samples
+
+
+def run_monte_carlo(
+    clean_df: pd.DataFrame,
+    n_iter: int = 1000,
+    rng: np.random.Generator = None,
+):
+    """
+    Run Monte Carlo simulation for the critical path, treating the
+    tasks as one serial chain (see run_network_monte_carlo for a
+    precedence network with parallel branches).
+
+    Returns:
+      mc_matrix: 2D numpy array shape (n_iter, n_tasks)
+      total_durations: 1D numpy array length n_iter
+    """
+    mc_matrix = sample_task_durations(clean_df, n_iter, rng)
 
     # Total duration per simulation = row-wise sum
     total_durations = mc_matrix.sum(axis=1)
     return mc_matrix, total_durations
 
+
+# ---------------------------------------------------------------------------
+# Network-aware Monte Carlo (stochastic CPM)
+# ---------------------------------------------------------------------------
+
+def load_network(network_file: str, clean_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Read a precedence network in the SER416,1 format (see the Module 10
+    network diagram solver) and prepare it for a vectorized forward pass.
+
+    Three-point estimates come from clean_df, matched by task name.
+    A network task without estimates keeps the single duration from
+    the network file as a deterministic task; estimated tasks that do
+    not appear in the network are ignored (both with a warning).
+
+    Tasks are grouped into topological levels: level 0 has no
+    predecessors and every other task sits one level after its latest
+    predecessor, so all tasks of a level can be computed together.
+    Tasks are reordered level by level, in file order within a level,
+    making each level a contiguous block of columns.
+
+    Returns a dict with:
+      tasks:  DataFrame (Task, Optimistic, MostLikely, Pessimistic) in
+              level order, usable with sample_task_durations()
+      levels: list of (start, stop, pred_index) where columns start:stop
+              form one level and pred_index is an int array of shape
+              (stop - start, max predecessors) of predecessor columns,
+              padded with n_tasks (a row of zeros in the pass)
+      terminal: column indices of tasks with no successors
+    """
+    # The SER416,1 reader belongs to the Module 10 solver. It is imported
+    # here so the serial mode does not depend on it.
+    try:
+        from network_diagram_solver import read_network_from_csv, topological_sort
+    except ImportError:
+        sys.path.append(NETWORK_SOLVER_DIR)
+        from network_diagram_solver import read_network_from_csv, topological_sort
+
+    tasks, order = read_network_from_csv(network_file)
+    topo_order = topological_sort(tasks)
+
+    level: Dict[str, int] = {}
+    for name in topo_order:
+        preds = tasks[name]["pred"]
+        level[name] = 1 + max(level[p] for p in preds) if preds else 0
+
+    # Inside a level, tasks keep their row order from the network file.
+    # (The solver's successor sets make topo_order depend on string
+    # hashing, which would change the columns, and so the sampled
+    # durations for a given seed, from one run to the next.)
+    row = {name: i for i, name in enumerate(order)}
+    level_order = sorted(topo_order, key=lambda name: (level[name], row[name]))
+    column = {name: i for i, name in enumerate(level_order)}
+    n_tasks = len(level_order)
+
+    estimates = clean_df.set_index("Task")
+    for name in estimates.index:
+        if name not in tasks:
+            print(
+                f"[WARNING] Task '{name}' is not in the network and will be ignored.",
+                file=sys.stderr,
+            )
+
+    rows: List[Dict[str, Any]] = []
+    for name in level_order:
+        if name in estimates.index:
+            est = estimates.loc[name]
+            rows.append({
+                "Task": name,
+                "Optimistic": float(est["Optimistic"]),
+                "MostLikely": float(est["MostLikely"]),
+                "Pessimistic": float(est["Pessimistic"]),
+            })
+        else:
+            duration = tasks[name]["duration"]
+            if duration != 0:
+                print(
+                    f"[WARNING] No estimates for network task '{name}'; "
+                    f"using its fixed duration {duration}.",
+                    file=sys.stderr,
+                )
+            rows.append({
+                "Task": name,
+                "Optimistic": duration,
+                "MostLikely": duration,
+                "Pessimistic": duration,
+            })
+
+    levels: List[Tuple[int, int, np.ndarray]] = []
+    start = 0
+    while start < n_tasks:
+        stop = start
+        while stop < n_tasks and level[level_order[stop]] == level[level_order[start]]:
+            stop += 1
+
+        names = level_order[start:stop]
+        width = max(1, max(len(tasks[n]["pred"]) for n in names))
+        pred_index = np.full((stop - start, width), n_tasks, dtype=np.intp)
+        for i, name in enumerate(names):
+            for k, pred in enumerate(tasks[name]["pred"]):
+                pred_index[i, k] = column[pred]
+
+        levels.append((start, stop, pred_index))
+        start = stop
+
+    terminal = np.array(
+        [column[name] for name in level_order if not tasks[name]["succ"]],
+        dtype=np.intp,
+    )
+
+    return {
+        "tasks": pd.DataFrame(rows, columns=["Task", "Optimistic", "MostLikely", "Pessimistic"]),
+        "levels": levels,
+        "terminal": terminal,
+    }
+
+
+def network_forward_pass(durations: np.ndarray, network: Dict[str, Any]) -> np.ndarray:
+    """
+    CPM forward pass for many iterations at once.
+
+    durations has shape (n_iter, n_tasks) with columns in network
+    level order. For each level, ES is the element-wise maximum of the
+    predecessors' EF values and EF = ES + duration, so the work is a
+    handful of NumPy max/add operations per level instead of a Python
+    loop over iterations.
+
+    Internally each task is one row (task-major), so gathering the
+    predecessors' finish times copies contiguous rows.
+
+    Returns the project duration (max EF over terminal tasks) of each
+    iteration.
+    """
+    n_iter, n_tasks = durations.shape
+    task_durations = np.ascontiguousarray(durations.T)
+
+    # Extra last row of zeros stands in for "no predecessor".
+    finish = np.zeros((n_tasks + 1, n_iter), dtype=float)
+
+    for start, stop, pred_index in network["levels"]:
+        early_start = finish[pred_index[:, 0]]
+        for k in range(1, pred_index.shape[1]):
+            np.maximum(early_start, finish[pred_index[:, k]], out=early_start)
+        np.add(early_start, task_durations[start:stop], out=finish[start:stop])
+
+    return finish[network["terminal"]].max(axis=0)
+
+
+def run_network_monte_carlo(
+    network: Dict[str, Any],
+    n_iter: int = 1000,
+    rng: np.random.Generator = None,
+):
+    """
+    Run Monte Carlo simulation over a precedence network (see
+    load_network). Each iteration samples every task and takes the
+    project duration from a CPM forward pass, so parallel branches
+    overlap instead of adding up.
+
+    Returns:
+      mc_matrix: 2D numpy array shape (n_iter, n_tasks), columns in
+                 network["tasks"] order
+      total_durations: 1D numpy array length n_iter
+    """
+    mc_matrix = sample_task_durations(network["tasks"], n_iter, rng)
+    total_durations = network_forward_pass(mc_matrix, network)
+    return mc_matrix, total_durations
+
+# ---------------------------------------------------------------------------
+# Streaming Monte Carlo (constant memory)
+# ---------------------------------------------------------------------------
+
+# Histogram bins used by the project-duration quantile sketch.
+SKETCH_BINS = 65536
+
+# Bins of the Task 1 histogram (same as the full-matrix plot).
+TASK1_BINS = 30
+
+# Samples (iterations x tasks) simulated per chunk in streaming mode,
+# i.e. about 16 MB per float array regardless of the iteration count.
+CHUNK_CELLS = 2_000_000
+
+
+class QuantileSketch:
+    """
+    Mergeable summary of simulated values that fall in a known range.
+
+    The range [low, high] is split into equal-width bins and only the
+    bin counts are kept, together with running totals (count, sum, sum
+    of squares, min, max). Memory is fixed by the number of bins, not
+    by how many values were added. A percentile is read from the
+    cumulative counts and is accurate to within one bin width
+    ((high - low) / bins).
+
+    Two sketches with the same range and bins merge by adding their
+    counts. Integer addition is exact and order-independent, so merged
+    percentiles do not depend on how the work was split.
+    """
+
+    def __init__(self, low: float, high: float, bins: int = SKETCH_BINS):
+        self.low = float(low)
+        self.high = float(high)
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Bin edges, length bins + 1."""
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(max(self.total_sq / self.count - self.mean ** 2, 0.0)))
+
+    def add(self, values: np.ndarray) -> None:
+        """Add a batch of values (anything outside the range is clamped)."""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+
+        width = self.high - self.low
+        if width > 0:
+            index = ((values - self.low) * (self.bins / width)).astype(np.intp)
+            np.clip(index, 0, self.bins - 1, out=index)
+        else:
+            index = np.zeros(values.size, dtype=np.intp)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+        self.count += values.size
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch with the same range and bins into this one."""
+        if (other.low, other.high, other.bins) != (self.low, self.high, self.bins):
+            raise ValueError("Only sketches with the same range and bins can be merged.")
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentiles(self, q) -> np.ndarray:
+        """
+        Approximate np.percentile(values, q) for q in [0, 100].
+
+        The rank q/100 * (count - 1) is located in the cumulative counts
+        and interpolated linearly inside its bin.
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute percentiles of an empty sketch.")
+
+        q = np.asarray(q, dtype=float)
+        rank = q / 100.0 * (self.count - 1)
+        cumulative = np.cumsum(self.counts)
+        index = np.searchsorted(cumulative, rank, side="right")
+        index = np.minimum(index, self.bins - 1)
+
+        before = cumulative[index] - self.counts[index]
+        inside = (rank - before + 0.5) / np.maximum(self.counts[index], 1)
+        width = (self.high - self.low) / self.bins
+        values = self.low + (index + np.clip(inside, 0.0, 1.0)) * width
+
+        return np.clip(values, self.min, self.max)
+
+
+def duration_bounds(tasks_df: pd.DataFrame, network: Dict[str, Any] = None) -> Tuple[float, float]:
+    """
+    Smallest and largest possible project duration: every task at its
+    low (resp. high) estimate, summed for a serial path or pushed
+    through the network forward pass.
+    """
+    low, _, high = triangular_parameters(tasks_df)
+    if network is None:
+        return float(low.sum()), float(high.sum())
+    extremes = network_forward_pass(np.vstack([low, high]), network)
+    return float(extremes[0]), float(extremes[1])
+
+
+def new_summary(tasks_df: pd.DataFrame, network: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Empty streaming result: a QuantileSketch of project durations over
+    duration_bounds() and a TASK1_BINS histogram of the first task.
+    """
+    low, mode, high = triangular_parameters(tasks_df.iloc[:1])
+    task_low, task_high = float(low[0]), float(high[0])
+    if task_low == task_high:
+        # Same default range np.histogram uses for a constant.
+        task_low, task_high = task_low - 0.5, task_high + 0.5
+
+    return {
+        "durations": QuantileSketch(*duration_bounds(tasks_df, network)),
+        "task1": QuantileSketch(task_low, task_high, bins=TASK1_BINS),
+        "task1_name": str(tasks_df["Task"].iloc[0]),
+    }
+
+
+def merge_summaries(summary: Dict[str, Any], other: Dict[str, Any]) -> None:
+    """Merge another streaming result (same tasks) into summary."""
+    summary["durations"].merge(other["durations"])
+    summary["task1"].merge(other["task1"])
+
+
+def run_streaming_monte_carlo(
+    tasks_df: pd.DataFrame,
+    n_iter: int,
+    network: Dict[str, Any] = None,
+    rng: np.random.Generator = None,
+    chunk_size: int = None,
+    summary: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    """
+    Run the Monte Carlo simulation in fixed-size chunks of iterations.
+
+    Each chunk is sampled, turned into project durations (serial sum,
+    or network forward pass when network is given) and folded into the
+    summary's sketches; the samples themselves are then discarded, so
+    memory depends on chunk_size and the number of tasks but not on
+    n_iter.
+
+    chunk_size defaults to CHUNK_CELLS // n_tasks iterations. Pass an
+    existing summary to keep adding iterations to it.
+
+    Returns the summary (see new_summary()).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if summary is None:
+        summary = new_summary(tasks_df, network)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_CELLS // max(1, len(tasks_df)))
+
+    done = 0
+    while done < n_iter:
+        size = min(chunk_size, n_iter - done)
+        samples = sample_task_durations(tasks_df, size, rng)
+        if network is None:
+            totals = samples.sum(axis=1)
+        else:
+            totals = network_forward_pass(samples, network)
+
+        summary["durations"].add(totals)
+        summary["task1"].add(samples[:, 0])
+        done += size
+
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Parallel Monte Carlo (process pool)
+# ---------------------------------------------------------------------------
+
+def split_iterations(
+    n_iter: int,
+    seed=None,
+    workers: int = 1,
+) -> List[Tuple[int, np.random.SeedSequence]]:
+    """
+    The seeding scheme shared by every Monte Carlo path: n_iter divided
+    as evenly as possible over the workers, worker i seeded with the
+    i-th child of np.random.SeedSequence(seed).spawn(workers). seed may
+    also be a SeedSequence. Returns one (iterations, seed sequence) pair
+    per worker.
+    """
+    workers = max(1, int(workers))
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    children = seed.spawn(workers)
+    return [(n_iter // workers + (i < n_iter % workers), children[i]) for i in range(workers)]
+
+
+def _streaming_worker(
+    tasks_df: pd.DataFrame,
+    n_iter: int,
+    network: Dict[str, Any],
+    seed_seq: np.random.SeedSequence,
+) -> Dict[str, Any]:
+    """Process-pool entry point: one worker's share of the iterations."""
+    return run_streaming_monte_carlo(
+        tasks_df, n_iter, network, np.random.default_rng(seed_seq)
+    )
+
+
+# Tasks and network of a worker process, set once by _init_worker().
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(tasks_df: pd.DataFrame, network: Dict[str, Any]) -> None:
+    _worker_state["tasks"] = tasks_df
+    _worker_state["network"] = network
+
+
+def _pool_worker(n_iter: int, seed_seq: np.random.SeedSequence) -> Dict[str, Any]:
+    """Pool task: a share of iterations on the worker's stored tasks."""
+    return _streaming_worker(
+        _worker_state["tasks"], n_iter, _worker_state["network"], seed_seq
+    )
+
+
+def start_worker_pool(
+    tasks_df: pd.DataFrame,
+    network: Dict[str, Any],
+    workers: int,
+) -> ProcessPoolExecutor:
+    """
+    Process pool for run_parallel_monte_carlo(). The tasks and network
+    are sent to each worker once, when it starts, so a pool reused for
+    many runs (see run_adaptive_monte_carlo()) only sends seeds and
+    iteration counts per run. The caller shuts the pool down.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(tasks_df, network)
+    )
+
+
+def run_parallel_monte_carlo(
+    tasks_df: pd.DataFrame,
+    n_iter: int,
+    network: Dict[str, Any] = None,
+    seed: int = None,
+    workers: int = 1,
+    pool: ProcessPoolExecutor = None,
+) -> Dict[str, Any]:
+    """
+    Split a streaming Monte Carlo run across a pool of worker processes.
+
+    The iterations and seeds are split by split_iterations(), so the
+    workers' streams are independent, and the partial summaries are
+    merged in worker order. The result is therefore bit-identical for
+    the same seed and number of workers. workers=1 runs in this process.
+    seed may also be a SeedSequence.
+
+    pool is an optional start_worker_pool() built for the same tasks_df
+    and network; without one a pool is started for this run only.
+
+    Returns the merged summary (see new_summary()).
+    """
+    workers = max(1, int(workers))
+    shares, children = zip(*split_iterations(n_iter, seed, workers))
+
+    if workers == 1:
+        return _streaming_worker(tasks_df, shares[0], network, children[0])
+
+    summary = new_summary(tasks_df, network)
+    own_pool = pool is None
+    if own_pool:
+        pool = start_worker_pool(tasks_df, network, workers)
+    try:
+        for part in pool.map(_pool_worker, shares, children):
+            merge_summaries(summary, part)
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    return summary
+
+
+def run_seeded_monte_carlo(
+    tasks_df: pd.DataFrame,
+    n_iter: int,
+    network: Dict[str, Any] = None,
+    seed=None,
+    workers: int = 1,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Full-matrix counterpart of run_parallel_monte_carlo() for small runs.
+
+    Each worker's share is drawn in this process from the same seeds
+    (split_iterations()) and the shares are stacked in worker order, so
+    for a given seed and number of workers the samples are exactly the
+    ones a streaming run would draw.
+
+    Returns (mc_matrix, total_durations) like run_monte_carlo().
+    """
+    parts = []
+    for share, seed_seq in split_iterations(n_iter, seed, workers):
+        rng = np.random.default_rng(seed_seq)
+        if network is None:
+            parts.append(run_monte_carlo(tasks_df, share, rng))
+        else:
+            parts.append(run_network_monte_carlo(network, share, rng))
+
+    mc_matrix = np.vstack([matrix for matrix, _ in parts])
+    total_durations = np.concatenate([totals for _, totals in parts])
+    return mc_matrix, total_durations
+
+
+# ---------------------------------------------------------------------------
+# Adaptive iteration count
+# ---------------------------------------------------------------------------
+
+# Confidence levels reported by write_confidence_answers() and checked
+# by the adaptive mode.
+CONFIDENCE_TARGETS = [70.0, 80.0, 90.0]
+
+# Default adaptive stopping rule: every target percentile's 95%
+# confidence interval half-width within 0.1% of its value.
+ADAPTIVE_TOLERANCE = 0.001
+
+# Iterations in the first adaptive batch, and the most ever simulated.
+ADAPTIVE_FIRST_BATCH = 10_000
+ADAPTIVE_MAX_ITER = 50_000_000
+
+# Normal quantile of a two-sided 95% confidence interval.
+CI_Z = 1.96
+
+
+def percentile_interval(
+    sketch: QuantileSketch,
+    q,
+    z: float = CI_Z,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distribution-free confidence interval for the q-th percentiles.
+
+    The number of simulated durations below the true p-quantile is
+    Binomial(n, p), so (normal approximation) the interval runs from the
+    sample percentile at p - z*sqrt(p(1-p)/n) to the one at
+    p + z*sqrt(p(1-p)/n). Returns (lower, upper) arrays.
+    """
+    p = np.asarray(q, dtype=float) / 100.0
+    margin = z * np.sqrt(p * (1.0 - p) / sketch.count)
+    lower = sketch.percentiles(100.0 * np.clip(p - margin, 0.0, 1.0))
+    upper = sketch.percentiles(100.0 * np.clip(p + margin, 0.0, 1.0))
+    return lower, upper
+
+
+def run_adaptive_monte_carlo(
+    tasks_df: pd.DataFrame,
+    network: Dict[str, Any] = None,
+    tolerance: float = ADAPTIVE_TOLERANCE,
+    seed: int = None,
+    workers: int = 1,
+    targets: List[float] = None,
+    first_batch: int = ADAPTIVE_FIRST_BATCH,
+    max_iter: int = ADAPTIVE_MAX_ITER,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Simulate in batches until the target percentiles are precise enough.
+
+    After each batch the 95% confidence interval of every target
+    percentile (percentile_interval(), widened by one sketch bin width
+    for the sketch's own error) is compared with tolerance, a fraction
+    of the percentile's value. The run stops once all of them are within
+    it, or after max_iter iterations. Because the half-width shrinks like
+    1/sqrt(n), the next batch is sized from the current one to reach the
+    tolerance in one step where possible.
+
+    Batches run through run_parallel_monte_carlo() with child seeds
+    spawned in order from SeedSequence(seed), so a given seed and number
+    of workers reproduces the same run. With several workers one process
+    pool serves every batch, so processes start (and receive the tasks)
+    only once.
+
+    Returns (summary, precision), where precision holds iterations,
+    converged, tolerance, targets, values and half_widths (absolute
+    half-widths, one per target).
+    """
+    if targets is None:
+        targets = CONFIDENCE_TARGETS
+    root = np.random.SeedSequence(seed)
+    summary = new_summary(tasks_df, network)
+    sketch = summary["durations"]
+    bin_width = (sketch.high - sketch.low) / sketch.bins
+
+    pool = start_worker_pool(tasks_df, network, workers) if workers > 1 else None
+    batch = min(first_batch, max_iter)
+    try:
+        while True:
+            merge_summaries(
+                summary,
+                run_parallel_monte_carlo(
+                    tasks_df, batch, network, seed=root.spawn(1)[0],
+                    workers=workers, pool=pool,
+                ),
+            )
+
+            values = sketch.percentiles(targets)
+            lower, upper = percentile_interval(sketch, targets)
+            half_widths = (upper - lower) / 2.0 + bin_width
+            relative = half_widths / np.maximum(np.abs(values), np.finfo(float).tiny)
+            converged = bool(np.all(relative <= tolerance))
+            if converged or sketch.count >= max_iter:
+                break
+
+            needed = int(np.ceil(sketch.count * (relative.max() / tolerance) ** 2 * 1.1))
+            batch = min(max(needed - sketch.count, first_batch), max_iter - sketch.count)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    precision = {
+        "iterations": sketch.count,
+        "converged": converged,
+        "tolerance": tolerance,
+        "targets": list(targets),
+        "values": values,
+        "half_widths": half_widths,
+    }
+    return summary, precision
+
+
 # ---------------------------------------------------------------------------
 # Plotting helpers
 # ---------------------------------------------------------------------------
 
-def plot_task1_histogram(df_samples: pd.DataFrame, output_file: str) -> None:
+def plot_task1_histogram(df_samples, output_file: str) -> None:
     """
     Plot a histogram of the simulated durations for Task 1 and save to file.
 
     "Task 1" is defined as the first task column (leftmost) in df_samples.
     This avoids hardcoding a particular task name.
+
+    df_samples may also be a streaming summary (see new_summary()),
+    whose Task 1 histogram counts are plotted directly.
     """
-    # The last column is "TotalDuration"; task columns come before it.
-    task_columns = [c for c in df_samples.columns if c != "TotalDuration"]
-    if not task_columns:
-        raise ValueError("No task columns found in Monte Carlo samples.")
+    plt.figure()
+
+    if isinstance(df_samples, dict):
+        first_task = df_samples["task1_name"]
+        sketch = df_samples["task1"]
+        plt.stairs(sketch.counts, sketch.edges, fill=True, edgecolor="black")
+    else:
+        # The last column is "TotalDuration"; task columns come before it.
+        task_columns = [c for c in df_samples.columns if c != "TotalDuration"]
+        if not task_columns:
+            raise ValueError("No task columns found in Monte Carlo samples.")
 
-    first_task = task_columns[0]
-    values = df_samples[first_task].to_numpy()
+        first_task = task_columns[0]
+        values = df_samples[first_task].to_numpy()
+        plt.hist(values, bins=TASK1_BINS, edgecolor="black")
 
-    plt.figure()
-    plt.hist(values, bins=30, edgecolor="black")
     plt.title(f"Histogram of simulated durations for {first_task}")
     plt.xlabel("Duration")
     plt.ylabel("Frequency")
@@ -332,13 +1011,17 @@ def plot_task1_histogram(df_samples: pd.DataFrame, output_file: str) -> None:
 
 
 def build_confidence_curve(
-    total_durations: np.ndarray,
+    total_durations,
     output_csv: str,
     output_plot: str,
 ) -> pd.DataFrame:
     """
     Build a confidence curve from total project durations.
 
+    total_durations is either the array of simulated durations or a
+    QuantileSketch of them (streaming mode), in which case the
+    percentiles are read from the sketch.
+
     Percentiles:
       from 60.0% to 99.9% in 0.1% increments (inclusive).
 
@@ -350,7 +1033,10 @@ def build_confidence_curve(
     """
     # Percentiles for numpy are in [0, 100].
     percentiles = np.arange(60.0, 100.0, 0.1)  # 60.0, 60.1, ..., 99.9
-    durations = np.percentile(total_durations, percentiles)
+    if isinstance(total_durations, QuantileSketch):
+        durations = total_durations.percentiles(percentiles)
+    else:
+        durations = np.percentile(total_durations, percentiles)
 
     curve_df = pd.DataFrame(
         {"Percentile": percentiles, "Duration": durations}
@@ -375,15 +1061,22 @@ def write_confidence_answers(
     curve_df: pd.DataFrame,
     output_file: str,
     targets: List[float] = None,
+    precision: Dict[str, Any] = None,
 ) -> None:
     """
     Extract durations at specific confidence levels and write them to a
     simple text file for management.
 
     targets: list of percentiles (e.g., [70.0, 80.0, 90.0]).
+    precision: optional result of run_adaptive_monte_carlo(); each
+    answer then shows its 95% confidence half-width and the number of
+    iterations used is added.
     """
     if targets is None:
-        targets = [70.0, 80.0, 90.0]
+        targets = CONFIDENCE_TARGETS
+    half_widths = {}
+    if precision is not None:
+        half_widths = dict(zip(precision["targets"], precision["half_widths"]))
 
     # For each target percentile, find the nearest row in the curve_df.
     lines: List[str] = []
@@ -392,10 +1085,20 @@ def write_confidence_answers(
         idx = (curve_df["Percentile"] - p).abs().idxmin()
         row = curve_df.loc[idx]
         duration = row["Duration"]
-        lines.append(
+        line = (
             f"Approximate minimum project duration for {p:.1f}% confidence: "
             f"{duration:.4f}"
         )
+        if p in half_widths:
+            line += f" (± {half_widths[p]:.4f} at 95% confidence)"
+        lines.append(line)
+
+    if precision is not None:
+        status = "reached" if precision["converged"] else "NOT reached"
+        lines.append(
+            f"Adaptive run: {precision['iterations']} iterations; tolerance "
+            f"{precision['tolerance']:.4%} of each duration {status}."
+        )
 
     with open(output_file, "w", encoding="utf-8") as f:
         f.write("Confidence Analysis (from Monte Carlo Simulation)\n")
@@ -421,7 +1124,50 @@ def main() -> None:
     else:
         filename = user_input
 
+    network_file = input(
+        "Enter precedence network file in SER416,1 format "
+        "(press Enter to treat the tasks as one serial path): "
+    ).strip()
+
+    iterations_text = input(
+        "Enter number of Monte Carlo iterations (press Enter for 1000, "
+        "or 'auto' to stop at a target precision): "
+    ).strip()
+
+    adaptive = iterations_text.lower() == "auto"
+    tolerance_text = ""
+    if adaptive:
+        tolerance_text = input(
+            "Enter tolerance for the 70/80/90% durations as a percent of each "
+            f"duration (press Enter for {ADAPTIVE_TOLERANCE * 100:g}): "
+        ).strip()
+
+    seed_text = input(
+        "Enter random seed (press Enter for a new random seed): "
+    ).strip()
+
+    workers_text = input(
+        "Enter number of worker processes (press Enter for 1): "
+    ).strip()
+
     try:
+        if adaptive:
+            n_iter = None
+            tolerance = float(tolerance_text) / 100 if tolerance_text else ADAPTIVE_TOLERANCE
+            if tolerance <= 0:
+                raise ValueError("Tolerance must be a positive number.")
+            run_label = f"adaptive, tolerance {tolerance:.4%}"
+        else:
+            n_iter = int(iterations_text) if iterations_text else 1000
+            if n_iter < 1:
+                raise ValueError("Number of iterations must be a positive whole number.")
+            run_label = f"{n_iter} iterations"
+        workers = int(workers_text) if workers_text else 1
+        if workers < 1:
+            raise ValueError("Number of worker processes must be a positive whole number.")
+        # A fresh seed is still recorded so the run can be repeated.
+        seed = int(seed_text) if seed_text else np.random.SeedSequence().entropy
+
         # 1) Read and clean the input data.
         print(f"\n[1] Reading and validating input file: {filename}")
         clean_df = read_and_clean_input(filename)
@@ -443,25 +1189,74 @@ def main() -> None:
         )
 
         # 3) Monte Carlo simulation.
-        print("\n[3] Running Monte Carlo simulation (1000 iterations)...")
-        mc_matrix, total_durations = run_monte_carlo(clean_df)
+        network = None
+        sim_tasks = clean_df
+        if network_file:
+            network = load_network(network_file, clean_df)
+            sim_tasks = network["tasks"]
+            print(
+                f"\n[3] Running Monte Carlo simulation ({run_label}) over "
+                f"'{network_file}' ({len(sim_tasks)} tasks, "
+                f"{len(network['levels'])} levels)..."
+            )
+        else:
+            print(f"\n[3] Running Monte Carlo simulation ({run_label})...")
+        print(f"    Random seed: {seed}")
+
+        # Small runs keep every sample; larger and adaptive ones stream in
+        # chunks and keep only sketches, so memory does not grow with n_iter.
+        precision = None
+        if adaptive:
+            df_samples, precision = run_adaptive_monte_carlo(
+                sim_tasks, network, tolerance, seed=seed, workers=workers
+            )
+            total_durations = df_samples["durations"]
+            status = "reached" if precision["converged"] else "NOT reached (iteration cap)"
+            print(
+                f"    Used {precision['iterations']} iterations on {workers} worker "
+                f"process(es); tolerance {status}. "
+                "'monte_carlo_raw.csv' is not written in adaptive mode."
+            )
+            for p, value, half in zip(
+                precision["targets"], precision["values"], precision["half_widths"]
+            ):
+                print(
+                    f"    P{p:g}: {value:.4f} ± {half:.4f} "
+                    f"({half / value:.4%}, 95% confidence)"
+                )
+        elif n_iter * len(sim_tasks) <= CHUNK_CELLS:
+            mc_matrix, total_durations = run_seeded_monte_carlo(
+                sim_tasks, n_iter, network, seed=seed, workers=workers
+            )
 
-        # Convert to DataFrame so we can save and plot
-        df_samples = pd.DataFrame(
-            mc_matrix,
-            columns=clean_df["Task"].tolist()
-        )
+            # Convert to DataFrame so we can save and plot
+            df_samples = pd.DataFrame(
+                mc_matrix,
+                columns=sim_tasks["Task"].tolist()
+            )
 
-        # Add total duration column
-        df_samples["TotalDuration"] = total_durations
+            # Add total duration column
+            df_samples["TotalDuration"] = total_durations
 
-        df_samples.to_csv("monte_carlo_raw.csv", index=False)
+            df_samples.to_csv("monte_carlo_raw.csv", index=False)
+
+            print(
+                "    Monte Carlo samples written to 'monte_carlo_raw.csv'. "
+                f"Simulated {len(total_durations)} total durations."
+            )
+        else:
+            df_samples = run_parallel_monte_carlo(
+                sim_tasks, n_iter, network, seed=seed, workers=workers
+            )
+            total_durations = df_samples["durations"]
+            print(
+                f"    Streamed {total_durations.count} total durations in chunks "
+                f"on {workers} worker process(es) "
+                "(raw samples are not kept, so 'monte_carlo_raw.csv' is not written).\n"
+                f"    Mean: {total_durations.mean:.4f}  Std dev: {total_durations.std:.4f}  "
+                f"Range: {total_durations.min:.4f} – {total_durations.max:.4f}"
+            )
 
-        print(
-            "    Monte Carlo samples written to 'monte_carlo_raw.csv'. "
-            f"Simulated {len(total_durations)} total durations."
-        )
-        
         # 4) Histogram for Task 1.
         print("\n[4] Generating histogram for Task 1 samples...")
         plot_task1_histogram(df_samples, "task1_histogram.png")
@@ -481,7 +1276,7 @@ def main() -> None:
 
         # 6) Management-level answers for 70/80/90%.
         print("\n[6] Extracting durations for 70%, 80%, and 90% confidence...")
-        write_confidence_answers(curve_df, "confidence_answers.txt")
+        write_confidence_answers(curve_df, "confidence_answers.txt", precision=precision)
         print("    Answers written to 'confidence_answers.txt'.")
 
         print("\n=== All steps completed successfully. ===")
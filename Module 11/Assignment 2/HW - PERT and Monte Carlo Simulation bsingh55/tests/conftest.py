@@ -0,0 +1,26 @@
+"""
+Shared helpers for the PERT / Monte Carlo simulation tests.
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+# Plots are written to files only; no display is needed.
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPT_DIR)
+
+
+def tasks(*estimates):
+    """
+    Cleaned task data as read_and_clean_input() returns it. Each
+    estimate is (name, optimistic, most_likely, pessimistic).
+    """
+    return pd.DataFrame(
+        [{"Task": name, "Optimistic": float(o), "MostLikely": float(m),
+          "Pessimistic": float(p)} for name, o, m, p in estimates],
+        columns=["Task", "Optimistic", "MostLikely", "Pessimistic"],
+    )
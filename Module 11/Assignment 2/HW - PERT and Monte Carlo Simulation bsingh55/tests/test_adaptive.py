@@ -0,0 +1,80 @@
+"""
+Adaptive iteration count: percentile intervals and the stopping rule.
+"""
+
+import numpy as np
+import pytest
+
+import pert_mc_simulation as pert
+from conftest import tasks
+
+ESTIMATES = tasks(("A", 1, 2, 6), ("B", 2, 3, 5), ("C", 4, 4, 4), ("D", 0, 1, 3))
+
+
+def test_interval_covers_the_percentile_and_shrinks_with_n():
+    values = np.random.default_rng(8).normal(100, 10, size=40_000)
+    small, large = pert.QuantileSketch(40, 160, 4096), pert.QuantileSketch(40, 160, 4096)
+    small.add(values[:4_000])
+    large.add(values)
+
+    small_lower, small_upper = pert.percentile_interval(small, [70, 90])
+    large_lower, large_upper = pert.percentile_interval(large, [70, 90])
+
+    assert np.all(large_lower <= large.percentiles([70, 90]))
+    assert np.all(large.percentiles([70, 90]) <= large_upper)
+    # Ten times the iterations gives about a third of the width
+    np.testing.assert_allclose((large_upper - large_lower) / (small_upper - small_lower),
+                               np.sqrt(0.1), rtol=0.25)
+
+
+def test_run_stops_once_the_tolerance_is_reached():
+    summary, precision = pert.run_adaptive_monte_carlo(ESTIMATES, tolerance=0.01, seed=3)
+
+    assert precision["converged"]
+    assert precision["iterations"] == summary["durations"].count
+    relative = np.asarray(precision["half_widths"]) / np.asarray(precision["values"])
+    assert np.all(relative <= 0.01)
+    assert precision["targets"] == pert.CONFIDENCE_TARGETS
+
+
+def test_iteration_cap_is_respected():
+    _, precision = pert.run_adaptive_monte_carlo(ESTIMATES, tolerance=1e-6, seed=3,
+                                                 first_batch=1_000, max_iter=5_000)
+
+    assert not precision["converged"]
+    assert precision["iterations"] == 5_000
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_adaptive_runs_are_reproducible(workers):
+    first, _ = pert.run_adaptive_monte_carlo(ESTIMATES, tolerance=0.005, seed=12, workers=workers)
+    second, _ = pert.run_adaptive_monte_carlo(ESTIMATES, tolerance=0.005, seed=12, workers=workers)
+
+    np.testing.assert_array_equal(first["durations"].counts, second["durations"].counts)
+
+
+def test_reused_pool_gives_the_same_result_as_a_fresh_one():
+    pool = pert.start_worker_pool(ESTIMATES, None, 2)
+    try:
+        reused = [pert.run_parallel_monte_carlo(ESTIMATES, 5_000, seed=s, workers=2, pool=pool)
+                  for s in (1, 2)]
+    finally:
+        pool.shutdown()
+
+    for seed, summary in zip((1, 2), reused):
+        fresh = pert.run_parallel_monte_carlo(ESTIMATES, 5_000, seed=seed, workers=2)
+        np.testing.assert_array_equal(summary["durations"].counts, fresh["durations"].counts)
+
+
+def test_answers_show_half_widths(tmp_path):
+    summary, precision = pert.run_adaptive_monte_carlo(ESTIMATES, tolerance=0.01, seed=5)
+    curve = pert.build_confidence_curve(summary["durations"], str(tmp_path / "curve.csv"),
+                                        str(tmp_path / "curve.png"))
+    path = str(tmp_path / "answers.txt")
+
+    pert.write_confidence_answers(curve, path, precision=precision)
+
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert text.count("at 95% confidence") == 3
+    assert f"Adaptive run: {precision['iterations']} iterations" in text
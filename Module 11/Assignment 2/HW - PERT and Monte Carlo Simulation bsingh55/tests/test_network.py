@@ -0,0 +1,89 @@
+"""
+Network-aware Monte Carlo: load_network() and the vectorized forward pass.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import pert_mc_simulation as pert
+from conftest import SCRIPT_DIR, tasks
+
+# Precedence networks shipped with the Module 10 solver
+PROB1 = os.path.join(pert.NETWORK_SOLVER_DIR, "HW9-part1-prob1-1.csv")
+PROB2 = os.path.join(pert.NETWORK_SOLVER_DIR, "HW9-part1-prob2-1.csv")
+
+
+def write_network(path, rows):
+    path.write_text("SER416,1\nActivity/Task,duration,Predecessors\n"
+                    + "\n".join(",".join(row) for row in rows) + "\n")
+    return str(path)
+
+
+def test_levels_keep_file_order():
+    network = pert.load_network(PROB2, tasks())
+
+    assert network["tasks"]["Task"].tolist() == [
+        "start", "A", "B", "C", "D", "E", "F", "I", "G", "H", "J"
+    ]
+    assert [(start, stop) for start, stop, _ in network["levels"]] == [
+        (0, 1), (1, 2), (2, 4), (4, 8), (8, 10), (10, 11)
+    ]
+    assert network["terminal"].tolist() == [10]
+
+
+def test_level_order_does_not_depend_on_string_hashing():
+    code = ("import pert_mc_simulation as pert; from conftest import tasks; "
+            f"print(pert.load_network({PROB2!r}, tasks())['tasks']['Task'].tolist())")
+    outputs = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed,
+                   PYTHONPATH=os.pathsep.join([SCRIPT_DIR, os.path.dirname(__file__)]))
+        outputs.add(subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                                   capture_output=True, text=True).stdout)
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize("path, expected", [(PROB1, 16.3), (PROB2, 26.0)])
+def test_fixed_durations_give_the_critical_path_length(path, expected):
+    network = pert.load_network(path, tasks())
+    durations = network["tasks"]["MostLikely"].to_numpy()[np.newaxis, :]
+
+    assert pert.network_forward_pass(durations, network) == pytest.approx([expected])
+
+
+def test_estimates_replace_network_durations(capsys):
+    network = pert.load_network(PROB1, tasks(("A", 1, 1, 1), ("Z", 1, 2, 3)))
+
+    estimated = network["tasks"].set_index("Task")
+    assert estimated.loc["A", "MostLikely"] == 1.0
+    assert "Z" not in estimated.index
+    assert "'Z' is not in the network" in capsys.readouterr().err
+
+
+def test_serial_network_matches_summed_totals(tmp_path):
+    path = write_network(tmp_path / "serial.csv",
+                         [("T1", "1"), ("T2", "1", "T1"), ("T3", "1", "T2")])
+    estimates = tasks(("T1", 1, 2, 4), ("T2", 2, 3, 5), ("T3", 1, 1, 1))
+    network = pert.load_network(path, estimates)
+
+    mc_matrix, totals = pert.run_network_monte_carlo(network, n_iter=200,
+                                                     rng=np.random.default_rng(7))
+
+    assert mc_matrix.shape == (200, 3)
+    np.testing.assert_allclose(totals, mc_matrix.sum(axis=1))
+
+
+def test_parallel_branches_overlap(tmp_path):
+    path = write_network(tmp_path / "fork.csv",
+                         [("A", "1"), ("B", "1", "A"), ("C", "1", "A"), ("D", "1", "B", "C")])
+    network = pert.load_network(path, tasks(("A", 1, 2, 3), ("B", 2, 4, 6),
+                                            ("C", 2, 4, 6), ("D", 1, 1, 1)))
+
+    mc_matrix, totals = pert.run_network_monte_carlo(network, n_iter=500)
+
+    a, b, c, d = (mc_matrix[:, i] for i in range(4))
+    np.testing.assert_allclose(totals, a + np.maximum(b, c) + d)
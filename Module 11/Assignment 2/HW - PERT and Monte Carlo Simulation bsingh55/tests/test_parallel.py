@@ -0,0 +1,75 @@
+"""
+Seeded and parallel Monte Carlo runs.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import pert_mc_simulation as pert
+from conftest import SCRIPT_DIR, tasks
+
+ESTIMATES = tasks(("A", 1, 2, 6), ("B", 2, 3, 5), ("C", 4, 4, 4), ("D", 0, 1, 3))
+SCRIPT = os.path.join(SCRIPT_DIR, "pert_mc_simulation.py")
+PROB2 = os.path.join(pert.NETWORK_SOLVER_DIR, "HW9-part1-prob2-1.csv")
+
+
+def test_iterations_are_split_evenly_with_independent_seeds():
+    split = pert.split_iterations(10, seed=1, workers=3)
+
+    assert [share for share, _ in split] == [4, 3, 3]
+    first = [np.random.default_rng(seq).random() for _, seq in split]
+    again = [np.random.default_rng(seq).random() for _, seq in pert.split_iterations(10, 1, 3)]
+    assert first == again
+    assert len(set(first)) == 3
+
+
+def test_same_seed_and_workers_give_identical_sketches():
+    first = pert.run_parallel_monte_carlo(ESTIMATES, 20_000, seed=9, workers=2)
+    second = pert.run_parallel_monte_carlo(ESTIMATES, 20_000, seed=9, workers=2)
+    other = pert.run_parallel_monte_carlo(ESTIMATES, 20_000, seed=10, workers=2)
+
+    assert first["durations"].count == 20_000
+    np.testing.assert_array_equal(first["durations"].counts, second["durations"].counts)
+    assert not np.array_equal(first["durations"].counts, other["durations"].counts)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_small_runs_draw_the_streaming_samples(workers):
+    mc_matrix, totals = pert.run_seeded_monte_carlo(ESTIMATES, 3_000, seed=4, workers=workers)
+    summary = pert.run_parallel_monte_carlo(ESTIMATES, 3_000, seed=4, workers=workers)
+
+    np.testing.assert_allclose(totals, mc_matrix.sum(axis=1))
+    expected = pert.new_summary(ESTIMATES)
+    expected["durations"].add(totals)
+    np.testing.assert_array_equal(summary["durations"].counts, expected["durations"].counts)
+
+
+def run_script(cwd, hash_seed, answers):
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed, MPLBACKEND="Agg")
+    subprocess.run([sys.executable, SCRIPT], cwd=cwd, env=env, input="\n".join(answers) + "\n",
+                   check=True, capture_output=True, text=True)
+    with open(os.path.join(cwd, "monte_carlo_raw.csv"), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_seeded_network_run_does_not_depend_on_string_hashing(tmp_path):
+    estimates = tmp_path / "estimates.csv"
+    estimates.write_text(",A,B,C,D,E,F,G,H,I,J\n"
+                         "Pess,7,10,9,4,6,8,7,9,8,6\n"
+                         "ML,5,8,7,2,4,5,5,7,6,4\n"
+                         "Opt,4,6,5,1,3,4,4,5,5,3\n")
+    answers = [str(estimates), PROB2, "500", "2024", "1"]
+
+    outputs = []
+    for hash_seed in ("1", "2"):
+        run_dir = tmp_path / f"hash{hash_seed}"
+        run_dir.mkdir()
+        outputs.append(run_script(run_dir, hash_seed, answers))
+
+    first, second = (output.splitlines() for output in outputs)
+    assert first[0] == second[0] == "start,A,B,C,D,E,F,I,G,H,J,TotalDuration"
+    assert first == second
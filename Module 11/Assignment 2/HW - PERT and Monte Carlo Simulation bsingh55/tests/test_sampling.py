@@ -0,0 +1,55 @@
+"""
+Batched inverse-CDF sampling of triangular task durations.
+"""
+
+import numpy as np
+import pytest
+
+import pert_mc_simulation as pert
+from conftest import tasks
+
+
+def test_estimates_are_fixed_before_sampling():
+    low, mode, high = pert.triangular_parameters(tasks(
+        ("swapped", 9, 5, 3),
+        ("clamped", 2, 10, 6),
+        ("fixed", 4, 4, 4),
+    ))
+
+    np.testing.assert_allclose(low, [3, 2, 4])
+    np.testing.assert_allclose(mode, [5, 6, 4])
+    np.testing.assert_allclose(high, [9, 6, 4])
+
+
+def test_samples_stay_in_range_and_constants_stay_constant():
+    samples = pert.sample_task_durations(
+        tasks(("A", 1, 2, 6), ("B", 4, 4, 4), ("C", 3, 3, 7)),
+        n_iter=5000, rng=np.random.default_rng(1),
+    )
+
+    assert samples.shape == (5000, 3)
+    assert samples[:, 0].min() >= 1 and samples[:, 0].max() <= 6
+    assert np.all(samples[:, 1] == 4)
+    assert samples[:, 2].min() >= 3 and samples[:, 2].max() <= 7
+
+
+@pytest.mark.parametrize("o, m, p", [(1, 2, 6), (0, 0, 10), (2, 8, 8)])
+def test_samples_follow_the_triangular_distribution(o, m, p):
+    samples = pert.sample_task_durations(tasks(("A", o, m, p)), n_iter=200_000,
+                                         rng=np.random.default_rng(2))[:, 0]
+
+    mean = (o + m + p) / 3
+    variance = (o * o + m * m + p * p - o * m - o * p - m * p) / 18
+    assert samples.mean() == pytest.approx(mean, abs=0.02)
+    assert samples.var() == pytest.approx(variance, rel=0.02)
+    # Share of samples left of the mode is F(mode) = (m - o) / (p - o)
+    assert np.mean(samples < m) == pytest.approx((m - o) / (p - o), abs=0.005)
+
+
+def test_the_same_generator_seed_gives_the_same_samples():
+    estimates = tasks(("A", 1, 2, 6), ("B", 2, 3, 5))
+
+    first = pert.sample_task_durations(estimates, 100, np.random.default_rng(42))
+    second = pert.sample_task_durations(estimates, 100, np.random.default_rng(42))
+
+    np.testing.assert_array_equal(first, second)
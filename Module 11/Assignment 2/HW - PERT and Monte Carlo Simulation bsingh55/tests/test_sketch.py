@@ -0,0 +1,63 @@
+"""
+Streaming Monte Carlo: QuantileSketch and run_streaming_monte_carlo().
+"""
+
+import numpy as np
+import pytest
+
+import pert_mc_simulation as pert
+from conftest import tasks
+
+ESTIMATES = tasks(("A", 1, 2, 6), ("B", 2, 3, 5), ("C", 4, 4, 4))
+
+
+def test_percentiles_are_within_one_bin_width():
+    values = np.random.default_rng(3).triangular(10, 12, 20, size=50_000)
+    sketch = pert.QuantileSketch(10, 20, bins=1000)
+    sketch.add(values)
+
+    q = [5, 25, 50, 75, 95, 99]
+    np.testing.assert_allclose(sketch.percentiles(q), np.percentile(values, q), atol=0.01)
+    assert sketch.mean == pytest.approx(values.mean())
+    assert sketch.std == pytest.approx(values.std())
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+
+
+def test_merged_sketches_match_a_single_sketch():
+    values = np.random.default_rng(4).uniform(0, 5, size=9_000)
+    whole = pert.QuantileSketch(0, 5, bins=500)
+    whole.add(values)
+
+    merged = pert.QuantileSketch(0, 5, bins=500)
+    for part in np.array_split(values, 3)[::-1]:
+        piece = pert.QuantileSketch(0, 5, bins=500)
+        piece.add(part)
+        merged.merge(piece)
+
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_array_equal(merged.percentiles([10, 50, 90]), whole.percentiles([10, 50, 90]))
+    with pytest.raises(ValueError):
+        merged.merge(pert.QuantileSketch(0, 6, bins=500))
+
+
+def test_streaming_result_does_not_depend_on_the_chunk_size():
+    small = pert.run_streaming_monte_carlo(ESTIMATES, 10_000, rng=np.random.default_rng(5),
+                                           chunk_size=999)
+    large = pert.run_streaming_monte_carlo(ESTIMATES, 10_000, rng=np.random.default_rng(5),
+                                           chunk_size=10_000)
+
+    np.testing.assert_array_equal(small["durations"].counts, large["durations"].counts)
+    assert small["durations"].count == 10_000
+
+
+def test_streaming_matches_the_full_sample_run():
+    _, totals = pert.run_monte_carlo(ESTIMATES, 10_000, np.random.default_rng(6))
+    summary = pert.run_streaming_monte_carlo(ESTIMATES, 10_000, rng=np.random.default_rng(6))
+
+    width = (summary["durations"].high - summary["durations"].low) / pert.SKETCH_BINS
+    np.testing.assert_allclose(summary["durations"].percentiles([50, 80, 95]),
+                               np.percentile(totals, [50, 80, 95]), atol=2 * width)
+
+
+def test_duration_bounds_cover_every_schedule():
+    assert pert.duration_bounds(ESTIMATES) == (7.0, 15.0)
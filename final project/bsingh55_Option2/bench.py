@@ -0,0 +1,258 @@
+"""
+SER 416 – Software Enterprise Projects & Process
+Final Project – Option 2 (Developer Route)
+
+Author: Bhupinder Singh (bsingh55)
+
+File: bench.py
+Purpose:
+    Reproducible benchmark harness for the data layer (db.py and
+    io_csv.py). It provides:
+
+        • generate_households() / write_dataset() – Deterministic
+          synthetic household data (1k to 1M rows) matching the
+          households schema; the same seed always yields the same file.
+
+        • run_benchmark() – Times bulk import, single inserts, export,
+          lookup by id and page listing on a scratch database. The
+          real cert_records.db is never touched.
+
+        • save_results() / compare_results() – Writes results as JSON
+          and reports operations that slowed down against a baseline.
+
+    Used by `python3 main.py bench`.
+"""
+
+import csv
+import json
+import os
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from db import (
+    init_db, close_db, insert_household, get_household_by_id,
+    get_households_page
+)
+from io_csv import DEFAULT_BATCH_SIZE, bulk_import, stream_export
+from migrations import migrate
+from models import DATA_FIELDS
+
+# Seed used when none is given, so runs are comparable by default
+DEFAULT_SEED = 416
+
+# Operations timed by run_benchmark(), in run order
+BENCH_OPERATIONS = ("bulk_import", "insert", "export", "lookup", "listing")
+
+# A result is a regression when its rate drops by more than this
+# fraction compared with the baseline
+DEFAULT_TOLERANCE = 0.20
+
+
+# -----------------------------------------------------------
+# SYNTHETIC DATA
+# -----------------------------------------------------------
+STREETS = ("Main St", "Oak Ave", "Pine Rd", "Maple Blvd", "Cedar Ln",
+           "Birch Dr", "Elm St", "Willow Way", "Mesquite Trl", "Saguaro Dr")
+CITIES = (("Phoenix", "85001"), ("Mesa", "85212"), ("Tempe", "85281"),
+          ("Chandler", "85225"), ("Glendale", "85301"), ("Scottsdale", "85254"))
+SPECIAL_NEEDS = ("no", "no", "no", "no", "wheelchair user", "hearing impaired",
+                 "requires insulin", "oxygen", "mobility assistance")
+
+
+def _flag(rng, chance):
+    return 1 if rng.random() < chance else 0
+
+
+def _optional_flag(rng, chance):
+    return "" if rng.random() < 0.2 else _flag(rng, chance)
+
+
+def generate_households(rows, seed=DEFAULT_SEED):
+    """
+    Yields rows synthetic households as CSV value lists in DATA_FIELDS
+    order. Addresses and phone numbers are unique per row, so a
+    dataset imports without duplicates.
+    """
+    rng = random.Random(seed)
+
+    for i in range(rows):
+        city, zip_code = CITIES[i % len(CITIES)]
+        has_pets = _flag(rng, 0.6)
+        critical_meds = _flag(rng, 0.15)
+        phone = f"480{i:07d}" if rng.random() < 0.8 else ""
+
+        yield [
+            rng.randint(1, 5),                                  # adults
+            rng.choice((0, 0, 1, 2, 3, 4)),                     # children
+            has_pets,
+            _flag(rng, 0.5) if has_pets else "",                # has_dogs
+            critical_meds,
+            _flag(rng, 0.3) if critical_meds else "",           # meds_need_fridge
+            rng.choice(SPECIAL_NEEDS),
+            _flag(rng, 0.1),                                    # large_propane
+            _flag(rng, 0.5),                                    # natural_gas
+            f"{i + 1} {STREETS[i % len(STREETS)]}, {city}, AZ {zip_code}",
+            phone,
+            f"household{i + 1}@example.com" if rng.random() < 0.7 else "",
+            _optional_flag(rng, 0.2),                           # has_med_training
+            _optional_flag(rng, 0.6),                           # know_neighbors
+            _optional_flag(rng, 0.3),                           # has_neighbor_key
+            _optional_flag(rng, 0.4),                           # wants_newsletter
+            _optional_flag(rng, 0.5),                           # allow_non_disaster_contact
+        ]
+
+
+def write_dataset(path, rows, seed=DEFAULT_SEED):
+    """
+    Writes a synthetic household CSV with an import-ready header.
+    """
+    with open(path, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DATA_FIELDS)
+        writer.writerows(generate_households(rows, seed))
+
+
+# -----------------------------------------------------------
+# RUNNING THE BENCHMARK
+# -----------------------------------------------------------
+def _result(count, seconds):
+    return {
+        "count": count,
+        "seconds": round(seconds, 6),
+        "per_sec": round(count / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def run_benchmark(rows=10000, seed=DEFAULT_SEED, dataset=None,
+                  batch_size=DEFAULT_BATCH_SIZE, inserts=1000, lookups=10000):
+    """
+    Runs every benchmark operation on a scratch database.
+
+    Parameters:
+        rows (int): Synthetic dataset size (ignored when dataset is given).
+        seed (int): Seed for the synthetic data and the lookup ids.
+        dataset (str): Existing CSV to use instead of synthetic data.
+        batch_size (int): Rows per executemany() batch for the import.
+        inserts (int): Single-record inserts timed after the import.
+        lookups (int): Random lookups by id.
+
+    Returns:
+        dict: meta (run settings and environment) and results (count,
+              seconds and per_sec for each of BENCH_OPERATIONS).
+
+    Raises:
+        io_csv.CSVFormatError: If dataset is missing required headers.
+    """
+    results = {}
+    synthetic = dataset is None
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if synthetic:
+            dataset = os.path.join(scratch, "dataset.csv")
+            write_dataset(dataset, rows, seed)
+
+        init_db(os.path.join(scratch, "bench.db"))
+        try:
+            migrate()
+
+            summary = bulk_import(dataset, batch_size=batch_size,
+                                  reject_path=os.path.join(scratch, "rejects.csv"))
+            imported = summary["imported"]
+            results["bulk_import"] = _result(imported, summary["seconds"])
+
+            # Single inserts use their own addresses so they never
+            # collide with the imported rows
+            samples = []
+            for values in generate_households(inserts, seed + 1):
+                data = {f: (None if v == "" else v) for f, v in zip(DATA_FIELDS, values)}
+                data["address"] = "Unit B, " + data["address"]
+                samples.append(data)
+            start = time.perf_counter()
+            for data in samples:
+                insert_household(data)
+            results["insert"] = _result(len(samples), time.perf_counter() - start)
+
+            total = imported + len(samples)
+            start = time.perf_counter()
+            exported = stream_export(os.path.join(scratch, "export.csv"))
+            results["export"] = _result(exported, time.perf_counter() - start)
+
+            rng = random.Random(seed)
+            ids = [rng.randint(1, total) for _ in range(lookups if total else 0)]
+            start = time.perf_counter()
+            for record_id in ids:
+                get_household_by_id(record_id)
+            results["lookup"] = _result(len(ids), time.perf_counter() - start)
+
+            listed = 0
+            start = time.perf_counter()
+            page = get_households_page()
+            while page:
+                listed += len(page)
+                page = get_households_page(after_id=page[-1].id)
+            results["listing"] = _result(listed, time.perf_counter() - start)
+        finally:
+            close_db()
+
+    meta = {
+        "rows": imported,
+        "seed": seed,
+        "dataset": "synthetic" if synthetic else dataset,
+        "batch_size": batch_size,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+    return {"meta": meta, "results": results}
+
+
+# -----------------------------------------------------------
+# RESULTS AND BASELINES
+# -----------------------------------------------------------
+def save_results(report, path):
+    """
+    Writes a run_benchmark() report as indented JSON.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, mode="w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path):
+    """
+    Reads a report written by save_results().
+    """
+    with open(path, mode="r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares the per_sec rate of each operation with a baseline report.
+
+    Returns:
+        list: (operation, baseline per_sec, current per_sec, change)
+              for every operation present in both reports; change is
+              the relative difference (-0.25 means 25% slower).
+        list: The operations whose rate dropped by more than tolerance.
+    """
+    rows = []
+    regressions = []
+
+    for op in BENCH_OPERATIONS:
+        old = baseline.get("results", {}).get(op, {}).get("per_sec")
+        new = report["results"].get(op, {}).get("per_sec")
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        rows.append((op, old, new, change))
+        if change < -tolerance:
+            regressions.append(op)
+
+    return rows, regressions
@@ -0,0 +1,531 @@
+"""
+SER 416 – Software Enterprise Projects & Process
+Final Project – Option 2 (Developer Route)
+
+Author: Bhupinder Singh (bsingh55)
+
+File: cli.py
+Purpose:
+    Non-interactive command-line interface for the CERT Disaster
+    Preparedness Application. It exposes the same business logic as
+    the menu, without any input() prompts, so imports, exports and
+    measurements can run from scripts and nightly jobs:
+
+        • import  – Import a CSV file, directory, or glob pattern
+        • export  – Stream records to a CSV (optionally gzip), Parquet
+                    or Arrow file
+        • search  – Print matching records as CSV on stdout
+        • stats   – Print county-level readiness totals
+        • bulk-edit – Apply a CSV of field changes, or set fields on
+                    a list of ids, in one transaction
+        • gazetteer – Load an offline address -> coordinates CSV
+        • near    – Print households within a radius or bounding box
+        • history – Print a record's change journal, or the record as
+                    it was at a past time
+        • compact-journal – Fold old journal entries into net changes
+        • bench   – Measure import/insert/export/lookup/listing
+                    throughput on synthetic data (see bench.py)
+
+    Running main.py without arguments still starts the interactive menu.
+"""
+
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime, timedelta
+
+from db import (
+    DB_NAME, DEDUP_POLICIES, DEFAULT_FETCH_SIZE, init_db, close_db,
+    search_households, get_household_stats, rebuild_household_stats,
+    update_households_bulk,
+    get_households_near, get_households_in_box, get_household_history,
+    get_household_as_of, compact_journal
+)
+from jobs import Progress, format_progress
+from models import HOUSEHOLD_COLUMNS
+from migrations import migrate
+from records import print_household_stats
+from bench import (
+    BENCH_OPERATIONS, DEFAULT_SEED, DEFAULT_TOLERANCE, run_benchmark, save_results,
+    load_results, compare_results
+)
+from validation import HOUSEHOLD_SCHEMA, ValidationError, validate_value
+from io_csv import (
+    DEFAULT_BATCH_SIZE, DEFAULT_WATERMARK, CSVFormatError, bulk_import,
+    batch_import, is_batch_target, stream_export, incremental_export,
+    EXPORT_FORMATS, columnar_format, columnar_export, columnar_import,
+    bulk_edit, import_gazetteer, print_format_error, print_import_summary, print_batch_summary,
+    print_edit_summary
+)
+
+
+def _yes_no(value):
+    """
+    argparse type for yes/no filter values.
+    """
+    text = value.strip().lower()
+    if text in ("y", "yes", "1", "true"):
+        return True
+    if text in ("n", "no", "0", "false"):
+        return False
+    raise argparse.ArgumentTypeError("expected yes or no")
+
+
+def _column_list(value):
+    """
+    argparse type for a comma-separated list of column names.
+    """
+    return [c.strip() for c in value.split(",") if c.strip()]
+
+
+def _id_list(value):
+    """
+    argparse type for a comma-separated list of record ids.
+    """
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected comma-separated ids") from None
+
+
+def _assignment(value):
+    """
+    argparse type for FIELD=VALUE; the value is converted like an
+    imported CSV cell.
+    """
+    field, sep, text = value.partition("=")
+    field = field.strip()
+    if not sep or field not in HOUSEHOLD_SCHEMA:
+        raise argparse.ArgumentTypeError(f"expected FIELD=VALUE with an editable field, got {value!r}")
+    try:
+        return field, validate_value(field, text)
+    except ValidationError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _progress_printer(enabled, total=None):
+    """
+    Returns a progress(rows, total=None) callback that rewrites one
+    status line on stderr, or None when progress is not wanted. The
+    caller ends the line once the work is done.
+    """
+    if not enabled:
+        return None
+    tracker = Progress()
+
+    def report(rows, estimate=None):
+        tracker.update(rows, estimate if estimate is not None else total)
+        print("\r" + format_progress(tracker.snapshot()).ljust(60), end="",
+              file=sys.stderr, flush=True)
+
+    return report
+
+
+# -----------------------------------------------------------
+# COMMANDS
+# -----------------------------------------------------------
+def cmd_import(args):
+    """
+    Imports a CSV, Parquet or Arrow file, or every CSV matched by a
+    directory/glob.
+    """
+    if is_batch_target(args.path):
+        summary = batch_import(args.path, batch_size=args.batch_size, workers=args.workers,
+                               on_duplicate=args.on_duplicate,
+                               progress=_progress_printer(args.progress))
+        if args.progress:
+            print(file=sys.stderr)
+        if not summary["files"]:
+            print("File not found.", file=sys.stderr)
+            return 1
+        print_batch_summary(summary)
+        return 1 if any(r["error"] for r in summary["files"]) else 0
+
+    if not os.path.exists(args.path):
+        print("File not found.", file=sys.stderr)
+        return 1
+
+    engine = columnar_import if columnar_format(args.path) else bulk_import
+    try:
+        summary = engine(args.path, batch_size=args.batch_size,
+                         on_duplicate=args.on_duplicate,
+                         progress=_progress_printer(args.progress))
+    except CSVFormatError as e:
+        print_format_error(e)
+        return 1
+    except (RuntimeError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.progress:
+        print(file=sys.stderr)
+    print_import_summary(summary)
+    return 0
+
+
+def cmd_export(args):
+    """
+    Streams households to a CSV, Parquet or Arrow file.
+    """
+    path = args.output
+    file_format = args.format or (path and columnar_format(path)) or "csv"
+    if args.gzip and file_format != "csv":
+        print("--gzip applies to CSV exports only.", file=sys.stderr)
+        return 1
+
+    if path is None:
+        os.makedirs("output", exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        label = "Exported Changes" if args.incremental else "Exported Records"
+        path = f"output/{label} {timestamp}{EXPORT_FORMATS[file_format]}"
+        if args.gzip:
+            path += ".gz"
+
+    try:
+        if args.incremental:
+            result = incremental_export(path, name=args.watermark, columns=args.columns,
+                                        compress=args.gzip, chunk_size=args.chunk_size,
+                                        progress=_progress_printer(args.progress),
+                                        file_format=file_format)
+            count = result["count"]
+        else:
+            total = get_household_stats()["households"] if args.progress else None
+            progress = _progress_printer(args.progress, total)
+            if file_format == "csv":
+                count = stream_export(path, columns=args.columns, compress=args.gzip,
+                                      chunk_size=args.chunk_size, progress=progress)
+            else:
+                count = columnar_export(path, columns=args.columns, file_format=file_format,
+                                        chunk_size=args.chunk_size, progress=progress)
+    except (RuntimeError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.progress:
+        print(file=sys.stderr)
+    if args.incremental:
+        since = result["since"]
+        print("Changes since: " + ("beginning" if since is None else f"change #{since}"))
+        print(f"New watermark: change #{result['watermark']}")
+    print(f"{count} records exported to:\n{path}")
+    return 0
+
+
+def cmd_search(args):
+    """
+    Prints matching households as CSV on stdout.
+    """
+    rows = search_households(
+        address=args.address,
+        special_needs=args.special_needs,
+        has_special_needs=args.has_special_needs,
+        has_critical_meds=args.critical_meds,
+        meds_need_fridge=args.meds_need_fridge,
+        large_propane=args.large_propane,
+        natural_gas=args.natural_gas,
+        limit=args.limit,
+    )
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(HOUSEHOLD_COLUMNS)
+    writer.writerows(rows)
+    return 0
+
+
+def cmd_stats(args):
+    """
+    Prints county-level readiness totals (cached; --rebuild recounts
+    them from the households table first).
+    """
+    stats = rebuild_household_stats() if args.rebuild else get_household_stats()
+    print_household_stats(stats)
+    return 0
+
+
+def cmd_bulk_edit(args):
+    """
+    Applies a CSV of changes, or --set assignments to every --ids
+    record, in one transaction.
+    """
+    if args.path:
+        if not os.path.exists(args.path):
+            print("File not found.", file=sys.stderr)
+            return 1
+        try:
+            summary = bulk_edit(args.path)
+        except CSVFormatError as e:
+            print_format_error(e)
+            return 1
+        print_edit_summary(summary)
+        return 0
+
+    if not args.ids or not args.set:
+        print("Give a CSV path, or both --ids and --set.", file=sys.stderr)
+        return 1
+
+    data = dict(args.set)
+    changed = update_households_bulk((record_id, data) for record_id in args.ids)
+    print(f"Records changed: {changed}")
+    return 0
+
+
+def _box(value):
+    """
+    argparse type for MIN_LAT,MIN_LON,MAX_LAT,MAX_LON.
+    """
+    try:
+        box = [float(v) for v in value.split(",")]
+    except ValueError:
+        box = []
+    if len(box) != 4:
+        raise argparse.ArgumentTypeError("expected MIN_LAT,MIN_LON,MAX_LAT,MAX_LON")
+    return box
+
+
+def cmd_gazetteer(args):
+    """
+    Loads a gazetteer CSV and re-locates every household.
+    """
+    if not os.path.exists(args.path):
+        print("File not found.", file=sys.stderr)
+        return 1
+    try:
+        result = import_gazetteer(args.path)
+    except CSVFormatError as e:
+        print_format_error(e)
+        return 1
+
+    print(f"Gazetteer entries loaded: {result['entries']}")
+    print(f"Invalid rows skipped: {result['failed']}")
+    print(f"Households with coordinates: {result['located']}")
+    return 0
+
+
+def cmd_near(args):
+    """
+    Prints households inside a radius (nearest first) or a bounding
+    box as CSV on stdout, with their distance or coordinates first.
+    """
+    writer = csv.writer(sys.stdout)
+
+    if args.box:
+        writer.writerow(("latitude", "longitude") + HOUSEHOLD_COLUMNS)
+        for lat, lon, row in get_households_in_box(*args.box):
+            writer.writerow((lat, lon) + row)
+        return 0
+
+    if args.lat is None or args.lon is None:
+        print("Give --lat and --lon (with --radius-km), or --box.", file=sys.stderr)
+        return 1
+
+    writer.writerow(("distance_km",) + HOUSEHOLD_COLUMNS)
+    for distance, row in get_households_near(args.lat, args.lon, args.radius_km, limit=args.limit):
+        writer.writerow((f"{distance:.3f}",) + row)
+    return 0
+
+
+def cmd_history(args):
+    """
+    Prints a household's journal entries, or with --as-of the record
+    as it was at that time.
+    """
+    if args.as_of:
+        try:
+            record = get_household_as_of(args.id, args.as_of)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        if record is None:
+            print(f"Record {args.id} did not exist at {args.as_of}.", file=sys.stderr)
+            return 1
+        writer = csv.writer(sys.stdout)
+        writer.writerow(HOUSEHOLD_COLUMNS)
+        writer.writerow(record)
+        return 0
+
+    history = get_household_history(args.id)
+    if not history:
+        print(f"No journal entries for record {args.id}.", file=sys.stderr)
+        return 1
+
+    for changed_at, op, diff in history:
+        if op == "insert":
+            print(f"{changed_at}  created")
+            continue
+        changes = ", ".join(f"{field}: {old!r} -> {new!r}"
+                            for field, (old, new) in diff.items() if field != "updated_at")
+        print(f"{changed_at}  {changes}")
+    return 0
+
+
+def cmd_compact_journal(args):
+    """
+    Compacts journal entries older than --older-than-days.
+    """
+    before = datetime.now() - timedelta(days=args.older_than_days)
+    result = compact_journal(before)
+    print(f"Households compacted: {result['households']}")
+    print(f"Journal entries removed: {result['removed']}")
+    print(f"Exact history now starts at: {result['history_from']}")
+    return 0
+
+
+def cmd_bench(args):
+    """
+    Runs the benchmark suite (bench.py) on a scratch database, prints
+    the rates, optionally saves them as JSON and compares them with a
+    baseline. Returns 1 when an operation regressed beyond tolerance.
+    """
+    if args.path and not os.path.exists(args.path):
+        print("File not found.", file=sys.stderr)
+        return 1
+
+    try:
+        report = run_benchmark(rows=args.rows, seed=args.seed, dataset=args.path,
+                               batch_size=args.batch_size, inserts=args.inserts,
+                               lookups=args.lookups)
+    except CSVFormatError as e:
+        print_format_error(e)
+        return 1
+
+    for op in BENCH_OPERATIONS:
+        r = report["results"][op]
+        print(f"{op + ':':<13}{r['count']:>9} in {r['seconds']:.3f}s "
+              f"({r['per_sec']:,.0f}/second)")
+
+    if args.json:
+        save_results(report, args.json)
+        print(f"Results written to:\n{args.json}")
+
+    if not args.baseline:
+        return 0
+
+    rows, regressions = compare_results(report, load_results(args.baseline), args.tolerance)
+    print(f"\nCompared with {args.baseline}:")
+    for op, old, new, change in rows:
+        flag = "  REGRESSION" if op in regressions else ""
+        print(f"{op + ':':<13}{old:>12,.0f} -> {new:>12,.0f}/second ({change:+.1%}){flag}")
+    return 1 if regressions else 0
+
+
+# -----------------------------------------------------------
+# ARGUMENT PARSING
+# -----------------------------------------------------------
+def build_parser():
+    """
+    Builds the argparse parser with one sub-command per feature.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="CERT Disaster Preparedness App. Run without a "
+                    "command to start the interactive menu."
+    )
+    parser.add_argument("--db", default=DB_NAME, help=f"SQLite database file (default: {DB_NAME})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="import a CSV/Parquet/Arrow file, directory, or glob")
+    p.add_argument("path")
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    p.add_argument("--workers", type=int, default=None,
+                   help="process pool size for directory/glob imports")
+    p.add_argument("--on-duplicate", choices=DEDUP_POLICIES, default="skip",
+                   help="what to do with rows matching an existing household")
+    p.add_argument("--progress", action="store_true",
+                   help="show rows done, rows/s and ETA on stderr")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export records to CSV")
+    p.add_argument("--output", "-o", help="output file (default: timestamped file in output/)")
+    p.add_argument("--columns", type=_column_list, help="comma-separated columns to export")
+    p.add_argument("--gzip", action="store_true", help="gzip-compress the output")
+    p.add_argument("--format", choices=tuple(EXPORT_FORMATS),
+                   help="csv, parquet or arrow (default: from --output extension, else csv)")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_FETCH_SIZE)
+    p.add_argument("--incremental", action="store_true",
+                   help="export only rows changed since the last incremental export")
+    p.add_argument("--watermark", default=DEFAULT_WATERMARK,
+                   help=f"incremental export name (default: {DEFAULT_WATERMARK})")
+    p.add_argument("--progress", action="store_true",
+                   help="show rows done, rows/s and ETA on stderr")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("search", help="print matching records as CSV")
+    p.add_argument("--address")
+    p.add_argument("--special-needs")
+    p.add_argument("--has-special-needs", type=_yes_no)
+    p.add_argument("--critical-meds", type=_yes_no)
+    p.add_argument("--meds-need-fridge", type=_yes_no)
+    p.add_argument("--large-propane", type=_yes_no)
+    p.add_argument("--natural-gas", type=_yes_no)
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("stats", help="print readiness totals")
+    p.add_argument("--rebuild", action="store_true",
+                   help="recount the cached totals from the households table")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("bulk-edit", help="apply many field changes in one transaction")
+    p.add_argument("path", nargs="?", help="CSV with an id column plus the columns to change")
+    p.add_argument("--ids", type=_id_list, help="comma-separated record ids")
+    p.add_argument("--set", type=_assignment, action="append", metavar="FIELD=VALUE",
+                   help="value to set on every --ids record (repeatable)")
+    p.set_defaults(func=cmd_bulk_edit)
+
+    p = sub.add_parser("gazetteer", help="load an offline address -> coordinates CSV")
+    p.add_argument("path", help="CSV with address, latitude and longitude columns")
+    p.set_defaults(func=cmd_gazetteer)
+
+    p = sub.add_parser("near", help="print households near a point or inside a box")
+    p.add_argument("--lat", type=float)
+    p.add_argument("--lon", type=float)
+    p.add_argument("--radius-km", type=float, default=1.0)
+    p.add_argument("--box", type=_box, metavar="MIN_LAT,MIN_LON,MAX_LAT,MAX_LON")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_near)
+
+    p = sub.add_parser("history", help="print a record's change journal")
+    p.add_argument("id", type=int)
+    p.add_argument("--as-of", metavar="TIME",
+                   help="print the record as it was at this ISO time (e.g. 2025-12-01T09:00)")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("compact-journal", help="fold old journal entries into net changes")
+    p.add_argument("--older-than-days", type=int, default=90)
+    p.set_defaults(func=cmd_compact_journal)
+
+    p = sub.add_parser("bench", help="measure data-layer throughput on a scratch database")
+    p.add_argument("path", nargs="?", help="CSV dataset (default: synthetic data)")
+    p.add_argument("--rows", type=int, default=10000,
+                   help="synthetic dataset size, e.g. 1000 to 1000000 (default: 10000)")
+    p.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    p.add_argument("--inserts", type=int, default=1000, help="single-record inserts to time")
+    p.add_argument("--lookups", type=int, default=10000)
+    p.add_argument("--json", metavar="FILE", help="write results as JSON")
+    p.add_argument("--baseline", metavar="FILE", help="JSON results to compare against")
+    p.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                   help="allowed slowdown before a regression is reported (default: 0.2)")
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def run(argv):
+    """
+    Parses argv, runs the selected command against the database and
+    returns the process exit code.
+    """
+    args = build_parser().parse_args(argv)
+
+    # bench manages its own scratch database
+    if args.command == "bench":
+        return args.func(args)
+
+    init_db(args.db)
+    try:
+        migrate()
+        return args.func(args)
+    finally:
+        close_db()
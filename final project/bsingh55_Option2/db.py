@@ -9,9 +9,20 @@ File: db.py
 Purpose:
     This module handles all interactions with the SQLite database used
     by the CERT Disaster Preparedness Application. It provides:
-        • Database initialization and table creation
+        • Pooled, tuned connection management (WAL, thread-local)
+        • Database initialization and table creation (applied in
+          order by migrations.py)
         • Insert operations for new household records
         • Query functions for retrieving household data
+        • Indexed search (partial indexes + FTS5 trigram index)
+        • Incident-response priority index (precomputed risk scores)
+        • Duplicate detection through a hashed address/contact index
+        • Change-number watermarks for incremental exports
+        • Cached readiness totals maintained on every insert/update
+        • Geospatial (R*Tree) index of household coordinates taken
+          from an offline gazetteer
+        • Append-only change journal (JSON diffs written by triggers)
+          with point-in-time reconstruction and compaction
         • Update functionality for editing existing records
 
     All persistent storage required by the application flows through
@@ -25,22 +36,153 @@ Database:
     timestamp metadata.
 """
 
+import hashlib
+import json
+import math
+import re
 import sqlite3
+import threading
 from datetime import datetime
 
+from models import (
+    Household, HOUSEHOLD_COLUMNS, INSERT_FIELDS, DATA_FIELDS, household_row
+)
+
 # Name of the SQLite database file
 DB_NAME = "cert_records.db"
 
+# Milliseconds a connection waits for another connection's lock
+BUSY_TIMEOUT_MS = 60000
+
+# Connection tuning applied to every pooled connection.
+#   journal_mode=WAL   – readers no longer block the writer
+#   synchronous=NORMAL – fsync at checkpoints instead of every commit
+#   cache_size         – negative value is in KiB (here ~20 MB page cache)
+#   busy_timeout       – a writer waits up to this many ms for the write
+#                        lock (e.g. held by an import job) instead of
+#                        failing with "database is locked"
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -20000;",
+    "PRAGMA temp_store = MEMORY;",
+)
+
+# Number of prepared statements sqlite3 keeps compiled per connection
+STATEMENT_CACHE_SIZE = 256
+
 
 # -----------------------------------------------------------
 # CONNECTION MANAGEMENT
 # -----------------------------------------------------------
+class ConnectionManager:
+    """
+    Owns the SQLite connections used by the application.
+
+    One connection is opened per thread (thread-local pool) and reused
+    for every call made from that thread, so repeated reads and writes
+    no longer pay the connect/teardown cost. Each connection is tuned
+    with the PRAGMAS above and keeps a cache of prepared statements.
+    """
+
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def connection(self):
+        """
+        Returns the calling thread's connection, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_name,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+            )
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            conn.create_function("dedup_key", 3, dedup_key, deterministic=True)
+            conn.create_function("normalize_address", 1, normalize_address,
+                                 deterministic=True)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def release(self):
+        """
+        Closes the calling thread's connection, if it has one. Worker
+        threads call this before they exit.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+        self._local.conn = None
+
+    def close_all(self):
+        """
+        Closes every connection opened by this manager.
+        """
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+# Shared manager created once by init_db() during program startup
+_manager = None
+
+
+def init_db(db_name=DB_NAME):
+    """
+    Creates the shared connection manager used by all modules.
+    Calling it again replaces (and closes) the previous manager.
+    """
+    global _manager
+    if _manager is not None:
+        _manager.close_all()
+    _manager = ConnectionManager(db_name)
+    return _manager
+
+
+def close_db():
+    """
+    Closes all pooled connections. Invoked when the program exits.
+    """
+    global _manager
+    if _manager is not None:
+        _manager.close_all()
+        _manager = None
+
+
+def close_thread_connection():
+    """
+    Closes the current thread's pooled connection (used by background
+    job threads when they finish).
+    """
+    if _manager is not None:
+        _manager.release()
+
+
 def get_connection():
     """
-    Creates and returns a SQLite connection object.
-    All other database functions use this helper.
+    Returns the pooled SQLite connection for the current thread.
+    All other database functions use this helper; connections stay
+    open and are closed only by close_db().
     """
-    return sqlite3.connect(DB_NAME)
+    if _manager is None:
+        init_db()
+    return _manager.connection()
 
 
 # -----------------------------------------------------------
@@ -50,53 +192,1000 @@ def create_tables():
     """
     Creates the households table if it does not already exist.
 
-    This function is invoked during program startup to ensure the
-    database schema is available before any read/write operations.
+    This is the first schema migration (see migrations.py); the side
+    tables and indexes built on households are added by later
+    migrations, which run at program startup.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS households (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+                adults INTEGER NOT NULL,
+                children INTEGER NOT NULL,
+
+                has_pets INTEGER NOT NULL,
+                has_dogs INTEGER,
+
+                has_critical_meds INTEGER NOT NULL,
+                meds_need_fridge INTEGER,
+
+                special_needs TEXT NOT NULL,
+
+                large_propane INTEGER NOT NULL,
+                natural_gas INTEGER NOT NULL,
+
+                address TEXT NOT NULL,
+
+                phone TEXT,
+                email TEXT,
+
+                has_med_training INTEGER,
+                know_neighbors INTEGER,
+                has_neighbor_key INTEGER,
+                wants_newsletter INTEGER,
+                allow_non_disaster_contact INTEGER,
+
+                created_at TEXT,
+                updated_at TEXT
+            );
+            """)
+
+
+# Households per transaction when a derived table is backfilled
+BACKFILL_BATCH_SIZE = 20000
+
+
+def backfill(refresh, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Runs refresh(conn, where, params) over all households in id ranges
+    of batch_size, committing after each range. Large tables are filled
+    in short transactions, so readers are never blocked for long.
+    """
+    conn = get_connection()
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM households;").fetchone()[0]
+
+    for low in range(0, max_id, batch_size):
+        with conn:
+            refresh(conn, "id > ? AND id <= ?", (low, low + batch_size))
+
+
+# -----------------------------------------------------------
+# SEARCH INDEXES
+# -----------------------------------------------------------
+# special_needs values that mean "no special needs". The same SQL
+# expression is used by the partial index and by search queries so
+# SQLite can match the index.
+HAS_SPECIAL_NEEDS_SQL = (
+    "lower(trim(special_needs)) NOT IN ('', 'no', 'none', 'n/a')"
+)
+
+# Partial indexes: each covers only the "yes" rows that incident
+# searches look for, so they stay small on large tables.
+SEARCH_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_households_critical_meds "
+    "ON households(meds_need_fridge) WHERE has_critical_meds = 1;",
+    "CREATE INDEX IF NOT EXISTS idx_households_large_propane "
+    "ON households(id) WHERE large_propane = 1;",
+    "CREATE INDEX IF NOT EXISTS idx_households_natural_gas "
+    "ON households(id) WHERE natural_gas = 1;",
+    "CREATE INDEX IF NOT EXISTS idx_households_special_needs "
+    f"ON households(id) WHERE {HAS_SPECIAL_NEEDS_SQL};",
+)
+
+# Full-text (trigram) index over address and special_needs, kept in
+# sync with the households table by triggers.
+FTS_TABLE_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS households_fts USING fts5(
+        address, special_needs,
+        content='households', content_rowid='id',
+        tokenize='trigram'
+    );
+"""
+
+FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS households_fts_insert
+    AFTER INSERT ON households BEGIN
+        INSERT INTO households_fts(rowid, address, special_needs)
+        VALUES (new.id, new.address, new.special_needs);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS households_fts_delete
+    AFTER DELETE ON households BEGIN
+        INSERT INTO households_fts(households_fts, rowid, address, special_needs)
+        VALUES ('delete', old.id, old.address, old.special_needs);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS households_fts_update
+    AFTER UPDATE OF address, special_needs ON households BEGIN
+        INSERT INTO households_fts(households_fts, rowid, address, special_needs)
+        VALUES ('delete', old.id, old.address, old.special_needs);
+        INSERT INTO households_fts(rowid, address, special_needs)
+        VALUES (new.id, new.address, new.special_needs);
+    END;
+    """,
+)
+
+# Trigram full-text matching needs at least this many characters
+FTS_MIN_TERM_LENGTH = 3
+
+
+def create_search_indexes():
+    """
+    Creates the search indexes, the FTS5 table used by
+    search_households() and the triggers that keep it in sync.
+    """
+    conn = get_connection()
+
+    with conn:
+        for sql in SEARCH_INDEXES:
+            conn.execute(sql)
+
+        conn.execute(FTS_TABLE_SQL)
+
+        for sql in FTS_TRIGGERS:
+            conn.execute(sql)
+
+
+def rebuild_search_index(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Refills the FTS table from the households rows, in batches.
     """
     conn = get_connection()
-    cur = conn.cursor()
 
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS households (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+    with conn:
+        conn.execute("INSERT INTO households_fts(households_fts) VALUES ('delete-all');")
 
-            adults INTEGER NOT NULL,
-            children INTEGER NOT NULL,
+    backfill(lambda conn, where, params: conn.execute(
+        "INSERT INTO households_fts(rowid, address, special_needs) "
+        f"SELECT id, address, special_needs FROM households WHERE {where};",
+        params
+    ), batch_size)
 
-            has_pets INTEGER NOT NULL,
-            has_dogs INTEGER,
 
-            has_critical_meds INTEGER NOT NULL,
-            meds_need_fridge INTEGER,
+# -----------------------------------------------------------
+# INCIDENT-RESPONSE PRIORITY INDEX
+# -----------------------------------------------------------
+# Risk score for one household, evaluated by SQLite. Higher is more
+# urgent:
+#   critical meds needing refrigeration 40 (critical meds only 20)
+#   special needs                       30
+#   large propane tank                  20
+#   children                            5 each, up to 25
+#   no neighbor key (no / unknown)      10
+RISK_SCORE_SQL = f"""(
+    CASE WHEN has_critical_meds = 1 AND meds_need_fridge = 1 THEN 40
+         WHEN has_critical_meds = 1 THEN 20
+         ELSE 0 END
+    + CASE WHEN {HAS_SPECIAL_NEEDS_SQL} THEN 30 ELSE 0 END
+    + CASE WHEN large_propane = 1 THEN 20 ELSE 0 END
+    + 5 * MIN(children, 5)
+    + CASE WHEN COALESCE(has_neighbor_key, 0) = 0 THEN 10 ELSE 0 END
+)"""
+
+# Recomputes the stored score for every household matching a WHERE clause
+REFRESH_RISK_SQL = f"""
+    INSERT OR REPLACE INTO household_risk (household_id, score)
+    SELECT id, {RISK_SCORE_SQL} FROM households WHERE {{where}};
+"""
+
+
+def create_risk_index():
+    """
+    Creates the household_risk side table, which stores a precomputed
+    risk score per household, and its (score DESC) index.
+    """
+    conn = get_connection()
 
-            special_needs TEXT NOT NULL,
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS household_risk (
+                household_id INTEGER PRIMARY KEY,
+                score INTEGER NOT NULL
+            );
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_household_risk_score
+            ON household_risk(score DESC, household_id);
+        """)
 
-            large_propane INTEGER NOT NULL,
-            natural_gas INTEGER NOT NULL,
 
-            address TEXT NOT NULL,
+def _refresh_risk(conn, where, params=()):
+    """
+    Recomputes risk scores for the households matching where. Callers
+    run this inside their own transaction.
+    """
+    conn.execute(REFRESH_RISK_SQL.format(where=where), params)
 
-            phone TEXT,
-            email TEXT,
 
-            has_med_training INTEGER,
-            know_neighbors INTEGER,
-            has_neighbor_key INTEGER,
-            wants_newsletter INTEGER,
-            allow_non_disaster_contact INTEGER,
+def rebuild_risk_scores(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Recomputes the risk score of every household, in batches.
+    """
+    backfill(_refresh_risk, batch_size)
+
 
-            created_at TEXT,
-            updated_at TEXT
-        );
-    """)
+def get_top_risk_households(limit=10):
+    """
+    Returns the highest-risk households, most urgent first. The query
+    walks the score index, so it only reads limit rows.
 
-    conn.commit()
-    conn.close()
+    Returns:
+        list: (score, Household) pairs; ties are ordered by household id.
+    """
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT r.score, h.*
+        FROM household_risk AS r
+        JOIN households AS h ON h.id = r.household_id
+        ORDER BY r.score DESC, r.household_id
+        LIMIT ?;
+    """, (limit,)).fetchall()
+    return [(row[0], Household._make(row[1:])) for row in rows]
+
+
+# -----------------------------------------------------------
+# DUPLICATE DETECTION
+# -----------------------------------------------------------
+# What an import does with a row that matches an existing household:
+#   skip   – leave the existing household unchanged
+#   merge  – fill only the existing household's empty (NULL) fields
+#   upsert – overwrite the existing household with the row's values
+DEDUP_POLICIES = ("skip", "merge", "upsert")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Recomputes the dedup key for every household matching a WHERE clause.
+# The lowest id wins when several existing households share a key.
+REFRESH_KEYS_SQL = """
+    INSERT OR IGNORE INTO household_keys (dedup_key, household_id)
+    SELECT dedup_key(address, phone, email), id FROM households
+    WHERE {where} ORDER BY id;
+"""
+
+# Maximum number of keys looked up per query (SQLite parameter limit)
+KEY_LOOKUP_CHUNK = 500
+
+
+def normalize_address(address):
+    """
+    Returns the address in lowercase with punctuation and extra spaces
+    removed, so formatting differences do not matter when matching.
+    """
+    return _NON_ALNUM.sub(" ", (address or "").lower()).strip()
+
+
+def dedup_key(address, phone, email):
+    """
+    Returns the hashed duplicate-detection key for a household.
+
+    The key combines the normalized address with the phone number's
+    last 10 digits, or the lowercase email when there is no phone.
+    """
+    addr = normalize_address(address)
+    digits = "".join(ch for ch in (phone or "") if ch.isdigit())
+    contact = digits[-10:] if digits else (email or "").strip().lower()
+    return hashlib.blake2b(f"{addr}|{contact}".encode("utf-8"), digest_size=12).hexdigest()
+
+
+def create_dedup_index():
+    """
+    Creates the household_keys table, a hash index from dedup key to
+    household id used to detect duplicates in O(1) per row.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS household_keys (
+                dedup_key TEXT PRIMARY KEY,
+                household_id INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_household_keys_household
+            ON household_keys(household_id);
+        """)
+
+
+def rebuild_dedup_keys(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Recomputes every dedup key, in batches. Batches run in id order, so
+    the lowest id still wins when households share a key.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.execute("DELETE FROM household_keys;")
+
+    backfill(lambda conn, where, params: conn.execute(
+        REFRESH_KEYS_SQL.format(where=where), params
+    ), batch_size)
+
+
+def _refresh_keys(conn, where, params=()):
+    """
+    Recomputes dedup keys for the households matching where. Callers
+    run this inside their own transaction.
+    """
+    conn.execute(
+        f"DELETE FROM household_keys WHERE household_id IN "
+        f"(SELECT id FROM households WHERE {where});",
+        params
+    )
+    conn.execute(REFRESH_KEYS_SQL.format(where=where), params)
+
+
+def _lookup_keys(conn, keys):
+    """
+    Returns {dedup_key: household_id} for the keys already stored.
+    """
+    found = {}
+    keys = list(keys)
+    for start in range(0, len(keys), KEY_LOOKUP_CHUNK):
+        chunk = keys[start:start + KEY_LOOKUP_CHUNK]
+        found.update(conn.execute(
+            "SELECT dedup_key, household_id FROM household_keys "
+            f"WHERE dedup_key IN ({','.join('?' for _ in chunk)});",
+            chunk
+        ))
+    return found
+
+
+def _id_chunks(ids):
+    """
+    Yields (where, params) pairs selecting the given household ids,
+    KEY_LOOKUP_CHUNK ids at a time.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), KEY_LOOKUP_CHUNK):
+        chunk = ids[start:start + KEY_LOOKUP_CHUNK]
+        yield f"id IN ({','.join('?' for _ in chunk)})", chunk
+
+
+def _refresh_derived(conn, where, params=()):
+    """
+    Refreshes every table derived from households (risk scores, dedup
+    keys and coordinates) for the matching rows.
+    """
+    _refresh_risk(conn, where, params)
+    _refresh_keys(conn, where, params)
+    _refresh_geo(conn, where, params)
+
+
+# -----------------------------------------------------------
+# GEOSPATIAL INDEX
+# -----------------------------------------------------------
+# Mean Earth radius used for distances
+EARTH_RADIUS_KM = 6371.0088
+
+# Places a household at its gazetteer coordinates, for every household
+# matching a WHERE clause whose normalized address is in the gazetteer.
+# Each point is stored as a zero-size box; the exact coordinates are
+# kept in the auxiliary columns because R*Tree boxes use 32-bit floats.
+REFRESH_GEO_SQL = """
+    INSERT INTO household_geo
+        (id, min_lat, max_lat, min_lon, max_lon, latitude, longitude)
+    SELECT h.id, g.latitude, g.latitude, g.longitude, g.longitude,
+           g.latitude, g.longitude
+    FROM households AS h
+    JOIN gazetteer AS g ON g.address_key = normalize_address(h.address)
+    WHERE {where};
+"""
+
+
+def create_geo_index():
+    """
+    Creates the gazetteer table (normalized address -> coordinates)
+    and the household_geo R*Tree spatial index.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS gazetteer (
+                address_key TEXT PRIMARY KEY,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS household_geo USING rtree(
+                id, min_lat, max_lat, min_lon, max_lon,
+                +latitude, +longitude
+            );
+        """)
+
+
+def _refresh_geo(conn, where, params=()):
+    """
+    Recomputes the coordinates of the households matching where.
+    Callers run this inside their own transaction.
+    """
+    conn.execute(
+        f"DELETE FROM household_geo WHERE id IN "
+        f"(SELECT id FROM households WHERE {where});",
+        params
+    )
+    conn.execute(REFRESH_GEO_SQL.format(where=where), params)
+
+
+def rebuild_locations(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Re-locates every household against the gazetteer, in batches.
+    """
+    backfill(_refresh_geo, batch_size)
+
+
+def load_gazetteer(entries):
+    """
+    Adds (or replaces) gazetteer entries, then re-locates every
+    household against the updated gazetteer in the same transaction.
+
+    Parameters:
+        entries (iterable): (address, latitude, longitude) tuples.
+
+    Returns:
+        dict: entries (rows loaded) and located (households that now
+              have coordinates).
+    """
+    conn = get_connection()
+
+    with conn:
+        cur = conn.executemany(
+            "INSERT OR REPLACE INTO gazetteer (address_key, latitude, longitude) "
+            "VALUES (?, ?, ?);",
+            ((normalize_address(address), lat, lon) for address, lat, lon in entries)
+        )
+        loaded = cur.rowcount
+
+        conn.execute("DELETE FROM household_geo;")
+        conn.execute(REFRESH_GEO_SQL.format(where="1"))
+        located = conn.execute("SELECT COUNT(*) FROM household_geo;").fetchone()[0]
+
+    return {"entries": loaded, "located": located}
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle (haversine) distance between two points in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def get_households_in_box(min_lat, min_lon, max_lat, max_lon):
+    """
+    Returns the located households inside a latitude/longitude box.
+    The R*Tree finds the candidates without scanning households.
+
+    Returns:
+        list: (latitude, longitude, Household) tuples ordered by id.
+    """
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT g.latitude, g.longitude, h.*
+        FROM household_geo AS g
+        JOIN households AS h ON h.id = g.id
+        WHERE g.max_lat >= ? AND g.min_lat <= ?
+          AND g.max_lon >= ? AND g.min_lon <= ?
+          AND g.latitude BETWEEN ? AND ?
+          AND g.longitude BETWEEN ? AND ?
+        ORDER BY h.id;
+    """, (min_lat, max_lat, min_lon, max_lon,
+          min_lat, max_lat, min_lon, max_lon)).fetchall()
+    return [(row[0], row[1], Household._make(row[2:])) for row in rows]
+
+
+def get_households_near(latitude, longitude, radius_km, limit=None):
+    """
+    Returns the located households within radius_km of a point,
+    nearest first.
+
+    The R*Tree is queried with the circle's bounding box; only those
+    candidates have their exact distance computed.
+
+    Returns:
+        list: (distance_km, Household) pairs.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    dlon = 180.0 if cos_lat < 1e-9 else min(180.0, dlat / cos_lat)
+
+    found = []
+    for lat, lon, household in get_households_in_box(
+            latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon):
+        distance = distance_km(latitude, longitude, lat, lon)
+        if distance <= radius_km:
+            found.append((distance, household))
+
+    found.sort(key=lambda pair: (pair[0], pair[1].id))
+    return found[:limit] if limit is not None else found
+
+
+# -----------------------------------------------------------
+# READINESS STATISTICS
+# -----------------------------------------------------------
+# County-level totals, in household_stats column order
+STATS_FIELDS = (
+    "households", "adults", "children", "with_pets", "with_dogs",
+    "critical_meds", "meds_need_fridge", "special_needs",
+    "large_propane", "natural_gas",
+)
+
+# Each total's contribution from the households matching a WHERE clause
+STATS_SELECT_SQL = f"""
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(adults), 0),
+        COALESCE(SUM(children), 0),
+        COALESCE(SUM(has_pets = 1), 0),
+        COALESCE(SUM(has_dogs = 1), 0),
+        COALESCE(SUM(has_critical_meds = 1), 0),
+        COALESCE(SUM(meds_need_fridge = 1), 0),
+        COALESCE(SUM({HAS_SPECIAL_NEEDS_SQL}), 0),
+        COALESCE(SUM(large_propane = 1), 0),
+        COALESCE(SUM(natural_gas = 1), 0)
+    FROM households
+    WHERE {{where}};
+"""
+
+APPLY_STATS_SQL = f"""
+    UPDATE household_stats
+    SET {", ".join(f"{f} = {f} + ?" for f in STATS_FIELDS)}
+    WHERE id = 1;
+"""
+
+
+def create_stats_table():
+    """
+    Creates the single-row household_stats summary table.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS household_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                {", ".join(f"{f} INTEGER NOT NULL DEFAULT 0" for f in STATS_FIELDS)}
+            );
+        """)
+
+        conn.execute("INSERT OR IGNORE INTO household_stats (id) VALUES (1);")
+
+
+def _apply_stats(conn, where, params=(), sign=1):
+    """
+    Adds (sign=1) or removes (sign=-1) the contribution of the
+    households matching where to the cached totals. Callers run this
+    inside their own transaction, removing a row's old contribution
+    before an update and adding the new one after it.
+    """
+    delta = conn.execute(STATS_SELECT_SQL.format(where=where), params).fetchone()
+    conn.execute(APPLY_STATS_SQL, [sign * value for value in delta])
+
+
+def _apply_stats_for_ids(conn, ids, sign):
+    """
+    _apply_stats() for an explicit list of household ids.
+    """
+    for where, params in _id_chunks(ids):
+        _apply_stats(conn, where, params, sign)
+
+
+def get_household_stats():
+    """
+    Returns the cached county-level totals. This reads one row, so it
+    costs the same however large the households table is.
+
+    Returns:
+        dict: households, adults, children, with_pets, with_dogs,
+              critical_meds, meds_need_fridge, special_needs,
+              large_propane, natural_gas.
+    """
+    conn = get_connection()
+    row = conn.execute(
+        f"SELECT {', '.join(STATS_FIELDS)} FROM household_stats WHERE id = 1;"
+    ).fetchone()
+    return dict(zip(STATS_FIELDS, row))
+
+
+def rebuild_household_stats(batch_size=None):
+    """
+    Recomputes the cached totals from scratch with SQL aggregates (for
+    example after the database was edited outside the application).
+
+    Parameters:
+        batch_size (int): When given, households are counted in id
+                          batches of this size, one transaction each
+                          (used by migrations on large tables).
+                          Otherwise one transaction is used.
+
+    Returns:
+        dict: The rebuilt totals (see get_household_stats()).
+    """
+    conn = get_connection()
+    reset_sql = (f"UPDATE household_stats SET {', '.join(f'{f} = 0' for f in STATS_FIELDS)} "
+                 "WHERE id = 1;")
+
+    if batch_size is None:
+        with conn:
+            conn.execute(reset_sql)
+            _apply_stats(conn, "1")
+    else:
+        with conn:
+            conn.execute(reset_sql)
+        backfill(_apply_stats, batch_size)
+
+    return get_household_stats()
+
+
+# -----------------------------------------------------------
+# INCREMENTAL EXPORT WATERMARKS
+# -----------------------------------------------------------
+def create_watermark_table():
+    """
+    Creates the household_changes table and the export_watermarks
+    table used by incremental exports.
+
+    household_changes holds one row per household with the change
+    number of its latest insert or update. Triggers assign the number
+    inside the writing transaction, and SQLite has a single writer, so
+    change numbers follow commit order: once an export has read up to
+    change N, every later commit gets a number above N. updated_at
+    cannot serve as the watermark, because it is stamped before the
+    write lock is taken and only has one-second resolution.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS household_changes (
+                change_seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                household_id INTEGER NOT NULL UNIQUE
+            );
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS export_watermarks (
+                name TEXT PRIMARY KEY,
+                change_seq INTEGER NOT NULL,
+                exported_at TEXT NOT NULL
+            );
+        """)
+
+        # Replacing the household's row gives it the next change number
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS households_changes_ai AFTER INSERT ON households BEGIN
+                INSERT OR REPLACE INTO household_changes (household_id) VALUES (new.id);
+            END;
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS households_changes_au AFTER UPDATE ON households BEGIN
+                INSERT OR REPLACE INTO household_changes (household_id) VALUES (new.id);
+            END;
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS households_changes_ad AFTER DELETE ON households BEGIN
+                DELETE FROM household_changes WHERE household_id = old.id;
+            END;
+        """)
+
+
+def backfill_change_numbers(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Gives a change number to every household that does not have one
+    yet (households written before household_changes existed), in
+    batches, numbering each batch in updated_at order. Households
+    written since then already have a number and keep it.
+    """
+    backfill(lambda conn, where, params: conn.execute(f"""
+        INSERT OR IGNORE INTO household_changes (household_id)
+        SELECT id FROM households WHERE {where}
+        ORDER BY updated_at, id;
+    """, params), batch_size)
+
+
+def get_export_watermark(name):
+    """
+    Returns the change number saved for an incremental export, or None
+    if that export has never run.
+    """
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT change_seq FROM export_watermarks WHERE name = ?;", (name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_export_watermark(name, change_seq):
+    """
+    Saves the change number reached by an incremental export.
+    """
+    conn = get_connection()
+    now = datetime.now().isoformat(timespec="seconds")
+
+    with conn:
+        conn.execute("""
+            INSERT INTO export_watermarks (name, change_seq, exported_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE
+            SET change_seq = excluded.change_seq, exported_at = excluded.exported_at;
+        """, (name, change_seq, now))
+
+
+def get_latest_change():
+    """
+    Returns the newest committed change number, or 0 when no household
+    has been written yet.
+    """
+    conn = get_connection()
+    return conn.execute(
+        "SELECT COALESCE(MAX(change_seq), 0) FROM household_changes;"
+    ).fetchone()[0]
+
+
+# -----------------------------------------------------------
+# CHANGE JOURNAL
+# -----------------------------------------------------------
+# JSON object holding [old, new] for updated_at and for every data
+# field whose value changed, e.g. {"updated_at":[...],"adults":[2,3]}.
+# Built by string concatenation so each row costs one expression.
+_JOURNAL_DIFF_SQL = "('{\"updated_at\":' || json_array(old.updated_at, new.updated_at)\n" + "\n".join(
+    f"    || CASE WHEN old.{f} IS NOT new.{f} "
+    f"THEN ',\"{f}\":' || json_array(old.{f}, new.{f}) ELSE '' END"
+    for f in DATA_FIELDS
+) + "\n    || '}')"
+
+# Triggers append a journal entry in the same transaction as every
+# insert and every update that changes household data
+JOURNAL_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS households_journal_insert
+    AFTER INSERT ON households BEGIN
+        INSERT INTO household_journal (household_id, changed_at, op)
+        VALUES (new.id, new.created_at, 'insert');
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS households_journal_update
+    AFTER UPDATE ON households
+    WHEN {" OR ".join(f"old.{f} IS NOT new.{f}" for f in DATA_FIELDS)}
+    BEGIN
+        INSERT INTO household_journal (household_id, changed_at, op, diff)
+        VALUES (new.id, new.updated_at, 'update', {_JOURNAL_DIFF_SQL});
+    END;
+    """,
+)
+
+
+def create_journal():
+    """
+    Creates the append-only household_journal table, its triggers and
+    the journal_state row recording the earliest time from which
+    records can be reconstructed exactly (when the journal was
+    created, later moved forward by compaction).
+    """
+    conn = get_connection()
+    now = datetime.now().isoformat(timespec="seconds")
+
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS household_journal (
+                seq INTEGER PRIMARY KEY,
+                household_id INTEGER NOT NULL,
+                changed_at TEXT NOT NULL,
+                op TEXT NOT NULL,
+                diff TEXT
+            );
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_household_journal_household
+            ON household_journal(household_id, changed_at);
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                history_from TEXT NOT NULL
+            );
+        """)
+        conn.execute(
+            "INSERT OR IGNORE INTO journal_state (id, history_from) VALUES (1, ?);", (now,)
+        )
+
+        for sql in JOURNAL_TRIGGERS:
+            conn.execute(sql)
+
+
+def _timestamp(when):
+    """
+    Returns a datetime or ISO string as a seconds-precision ISO string.
+    """
+    if isinstance(when, datetime):
+        return when.isoformat(timespec="seconds")
+    return datetime.fromisoformat(when).isoformat(timespec="seconds")
+
+
+def get_journal_start():
+    """
+    Returns the earliest time (ISO string) for which
+    get_household_as_of() can reconstruct records exactly.
+    """
+    conn = get_connection()
+    return conn.execute("SELECT history_from FROM journal_state WHERE id = 1;").fetchone()[0]
+
+
+def get_household_history(record_id):
+    """
+    Returns the journal entries of one household, oldest first.
+
+    Returns:
+        list: (changed_at, op, diff) tuples; diff maps each changed
+              field to [old, new] (None for 'insert' entries).
+    """
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT changed_at, op, diff FROM household_journal
+        WHERE household_id = ?
+        ORDER BY seq;
+    """, (record_id,)).fetchall()
+    return [(at, op, json.loads(diff) if diff else None) for at, op, diff in rows]
+
+
+def get_household_as_of(record_id, when):
+    """
+    Reconstructs a household as it was at a past time by undoing,
+    newest first, the journal entries recorded after that time.
+
+    Parameters:
+        record_id (int): Household id.
+        when (datetime | str): Point in time (ISO string accepted).
+
+    Returns:
+        Household | None: The record at that time, or None if it did
+        not exist yet.
+
+    Raises:
+        ValueError: If when is earlier than get_journal_start().
+    """
+    when = _timestamp(when)
+    start = get_journal_start()
+    if when < start:
+        raise ValueError(f"History is only available from {start}")
+
+    current = get_household_by_id(record_id)
+    if current is None:
+        return None
+
+    conn = get_connection()
+    values = current._asdict()
+    entries = conn.execute("""
+        SELECT op, diff FROM household_journal
+        WHERE household_id = ? AND changed_at > ?
+        ORDER BY seq DESC;
+    """, (record_id, when))
+
+    for op, diff in entries:
+        if op == "insert":
+            return None
+        for field, (old, _new) in json.loads(diff).items():
+            values[field] = old
+
+    return Household(**values)
+
+
+def compact_journal(before):
+    """
+    Compacts journal entries older than before: each household's
+    update entries in that period are folded into a single entry that
+    holds the net change ([first old, last new] per field). Records
+    can then only be reconstructed exactly from before onwards.
+
+    Parameters:
+        before (datetime | str): Entries changed earlier are compacted.
+
+    Returns:
+        dict: households (households compacted), removed (journal rows
+              removed) and history_from (the time exact history now
+              starts at; an earlier cutoff never moves it back).
+    """
+    before = _timestamp(before)
+    conn = get_connection()
+    compacted = 0
+    removed = 0
+
+    def flush(household_id, group):
+        nonlocal compacted, removed
+        if len(group) < 2:
+            return
+        merged = {}
+        for _seq, _at, diff in group:
+            for field, (old, new) in json.loads(diff).items():
+                merged[field] = [merged[field][0] if field in merged else old, new]
+        merged = {f: pair for f, pair in merged.items()
+                  if f == "updated_at" or pair[0] != pair[1]}
+
+        conn.executemany(
+            "DELETE FROM household_journal WHERE seq = ?;", [(seq,) for seq, _at, _d in group]
+        )
+        conn.execute(
+            "INSERT INTO household_journal (seq, household_id, changed_at, op, diff) "
+            "VALUES (?, ?, ?, 'update', ?);",
+            (group[-1][0], household_id, group[-1][1],
+             json.dumps(merged, separators=(",", ":")))
+        )
+        compacted += 1
+        removed += len(group) - 1
+
+    with conn:
+        rows = conn.execute("""
+            SELECT household_id, seq, changed_at, diff FROM household_journal
+            WHERE op = 'update' AND changed_at < ?
+            ORDER BY household_id, seq;
+        """, (before,)).fetchall()
+
+        current, group = None, []
+        for household_id, seq, changed_at, diff in rows:
+            if household_id != current:
+                flush(current, group)
+                current, group = household_id, []
+            group.append((seq, changed_at, diff))
+        flush(current, group)
+
+        conn.execute(
+            "UPDATE journal_state SET history_from = MAX(history_from, ?) WHERE id = 1;",
+            (before,)
+        )
+
+    return {"households": compacted, "removed": removed, "history_from": get_journal_start()}
 
 
 # -----------------------------------------------------------
 # INSERTING NEW RECORDS
 # -----------------------------------------------------------
+# Insert statement built once so its text is identical on every call and
+# is served from the connection's prepared-statement cache.
+INSERT_SQL = f"""
+    INSERT INTO households ({",".join(INSERT_FIELDS)})
+    VALUES ({",".join("?" for _ in INSERT_FIELDS)});
+"""
+
+# Positions of the dedup key fields within an import value tuple
+_KEY_POSITIONS = tuple(INSERT_FIELDS.index(f) for f in ("address", "phone", "email"))
+
+# Updates applied to an existing household when an import row matches it
+UPSERT_SQL = f"""
+    UPDATE households
+    SET {", ".join(f"{f} = ?" for f in DATA_FIELDS)}, updated_at = ?
+    WHERE id = ?;
+"""
+
+MERGE_SQL = f"""
+    UPDATE households
+    SET {", ".join(f"{f} = COALESCE({f}, ?)" for f in DATA_FIELDS)}, updated_at = ?
+    WHERE id = ?;
+"""
+
+# Finds whether applying the update above (parameters: id, then the
+# values) would change the stored household
+UPSERT_CHANGES_SQL = f"""
+    SELECT 1 FROM households
+    WHERE id = ? AND ({" OR ".join(f"{f} IS NOT ?" for f in DATA_FIELDS)});
+"""
+
+MERGE_CHANGES_SQL = f"""
+    SELECT 1 FROM households
+    WHERE id = ? AND ({" OR ".join(f"COALESCE({f}, ?) IS NOT {f}" for f in DATA_FIELDS)});
+"""
+
+
 def insert_household(data):
     """
     Inserts a new household record into the database.
@@ -110,48 +1199,321 @@ def insert_household(data):
         updated_at – timestamp when the record was last modified
     """
     conn = get_connection()
-    cur = conn.cursor()
-
-    fields = (
-        "adults", "children", "has_pets", "has_dogs",
-        "has_critical_meds", "meds_need_fridge", "special_needs",
-        "large_propane", "natural_gas", "address",
-        "phone", "email", "has_med_training", "know_neighbors",
-        "has_neighbor_key", "wants_newsletter",
-        "allow_non_disaster_contact", "created_at", "updated_at"
-    )
 
     # Timestamp values added automatically
     now = datetime.now().isoformat(timespec="seconds")
 
     # Build values list in exact field order (excluding timestamps)
-    values = [data.get(f) for f in fields[:-2]] + [now, now]
+    values = [data.get(f) for f in DATA_FIELDS] + [now, now]
+
+    with conn:
+        cur = conn.execute(INSERT_SQL, values)
+        _refresh_derived(conn, "id = ?", (cur.lastrowid,))
+        _apply_stats(conn, "id = ?", (cur.lastrowid,))
 
-    cur.execute(f"""
-        INSERT INTO households ({",".join(fields)})
-        VALUES ({",".join("?" for _ in fields)});
-    """, values)
 
-    conn.commit()
-    conn.close()
+def _merge_values(old, new):
+    """
+    Fills the None entries of old with the matching entries of new.
+    """
+    return tuple(n if o is None else o for o, n in zip(old, new))
+
+
+def _changed_updates(conn, updates, changes_sql):
+    """
+    Keeps only the {household id: values} updates that would change the
+    stored household, so re-importing a file rewrites nothing.
+    """
+    return {hid: values for hid, values in updates.items()
+            if conn.execute(changes_sql, (hid,) + values).fetchone()}
+
+
+def insert_households_bulk(batches, on_duplicate="skip"):
+    """
+    Inserts many household records inside a single transaction,
+    detecting duplicates through the household_keys hash index.
+
+    Parameters:
+        batches (iterable): Yields lists of value tuples, each tuple in
+                            DATA_FIELDS order (no id or timestamps). Batches may be produced
+                            lazily (e.g. while streaming a CSV file).
+        on_duplicate (str): One of DEDUP_POLICIES; applied to rows that
+                            match an existing household or an earlier
+                            row of the same import.
+
+    New rows of each batch are written with one executemany() call.
+    Each row costs a single key lookup, so re-imports stay linear in
+    the size of the file. If any batch fails, the whole import is
+    rolled back.
+
+    Returns:
+        dict: inserted (new households) and duplicates (rows that
+              matched an existing household and were skipped, merged
+              or upserted).
+    """
+    if on_duplicate not in DEDUP_POLICIES:
+        raise ValueError(f"Unknown duplicate policy: {on_duplicate}")
+
+    conn = get_connection()
+
+    now = datetime.now().isoformat(timespec="seconds")
+    stamps = (now, now)
+    inserted = 0
+    duplicates = 0
+    a, p, e = _KEY_POSITIONS
+
+    with conn:
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM households;").fetchone()[0]
+
+        for batch in batches:
+            keys = [dedup_key(v[a], v[p], v[e]) for v in batch]
+            existing = _lookup_keys(conn, set(keys))
+
+            new_rows = {}      # key -> values for rows not yet stored
+            updates = {}       # household id -> values to write
+            for key, values in zip(keys, batch):
+                values = tuple(values)
+                if key in existing:
+                    duplicates += 1
+                    target = existing[key]
+                    if on_duplicate == "upsert":
+                        updates[target] = values
+                    elif on_duplicate == "merge":
+                        updates[target] = _merge_values(updates.get(target, values), values)
+                elif key in new_rows:
+                    duplicates += 1
+                    if on_duplicate == "upsert":
+                        new_rows[key] = values
+                    elif on_duplicate == "merge":
+                        new_rows[key] = _merge_values(new_rows[key], values)
+                else:
+                    new_rows[key] = values
+
+            conn.executemany(INSERT_SQL, [values + stamps for values in new_rows.values()])
+            inserted += len(new_rows)
+
+            if updates:
+                if on_duplicate == "upsert":
+                    sql, changes_sql = UPSERT_SQL, UPSERT_CHANGES_SQL
+                else:
+                    sql, changes_sql = MERGE_SQL, MERGE_CHANGES_SQL
+                updates = _changed_updates(conn, updates, changes_sql)
+
+            if updates:
+                _apply_stats_for_ids(conn, updates, -1)
+                conn.executemany(sql, [values + (now, hid) for hid, values in updates.items()])
+                _apply_stats_for_ids(conn, updates, 1)
+                # An upsert may change the address or phone, so keys are
+                # refreshed along with the risk score
+                for where, params in _id_chunks(updates):
+                    _refresh_derived(conn, where, params)
+
+            # Score, key and count the rows added by this batch so later
+            # batches see them as existing households
+            _refresh_derived(conn, "id > ?", (last_id,))
+            _apply_stats(conn, "id > ?", (last_id,))
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM households;").fetchone()[0]
+
+    return {"inserted": inserted, "duplicates": duplicates}
 
 
 # -----------------------------------------------------------
 # RETRIEVING RECORDS
 # -----------------------------------------------------------
+def _query_households(sql, params=()):
+    """
+    Runs a SELECT * query on households and returns its cursor, with
+    rows built as Household records by the household_row factory.
+    """
+    cur = get_connection().cursor()
+    cur.row_factory = household_row
+    return cur.execute(sql, params)
+
+
+# Rows pulled from the cursor per fetchmany() call when streaming
+DEFAULT_FETCH_SIZE = 2000
+
+
 def get_all_households():
     """
-    Returns a list of all household records in the database.
-    Results are sorted by the primary key (id).
+    Returns a list of all household records (Household) in the
+    database. Results are sorted by the primary key (id).
+    """
+    return _query_households("SELECT * FROM households ORDER BY id;").fetchall()
+
+
+def iter_households(columns=None, chunk_size=DEFAULT_FETCH_SIZE,
+                    changed_since=None, changed_until=None):
+    """
+    Streams household records in id order without loading the table
+    into memory. Rows are pulled from the cursor with fetchmany().
+
+    Parameters:
+        columns (list): Column names to select (default: all columns).
+        chunk_size (int): Rows fetched per round trip.
+        changed_since (int): Only rows whose latest change number is
+                             greater than this value.
+        changed_until (int): Only rows whose latest change number is at
+                             most this value.
+
+    When either bound is given, rows are read through household_changes
+    in change-number order, so the cost depends on the number of
+    changed rows rather than the table size.
+
+    Returns:
+        iterator: Rows as tuples, in the requested column order.
+
+    Raises:
+        ValueError: If an unknown column name is requested.
     """
+    columns = list(columns or HOUSEHOLD_COLUMNS)
+    unknown = [c for c in columns if c not in HOUSEHOLD_COLUMNS]
+    if unknown:
+        raise ValueError("Unknown column(s): " + ", ".join(unknown))
+
     conn = get_connection()
-    cur = conn.cursor()
 
-    cur.execute("SELECT * FROM households ORDER BY id;")
-    rows = cur.fetchall()
+    if changed_since is None and changed_until is None:
+        cur = conn.execute(f"SELECT {', '.join(columns)} FROM households ORDER BY id;")
+        return _stream_cursor(cur, chunk_size)
+
+    clauses = []
+    params = []
+    if changed_since is not None:
+        clauses.append("c.change_seq > ?")
+        params.append(changed_since)
+    if changed_until is not None:
+        clauses.append("c.change_seq <= ?")
+        params.append(changed_until)
+
+    cur = conn.execute(f"""
+        SELECT {', '.join(f"h.{c}" for c in columns)}
+        FROM household_changes AS c
+        JOIN households AS h ON h.id = c.household_id
+        WHERE {" AND ".join(clauses)}
+        ORDER BY c.change_seq;
+    """, params)
+    return _stream_cursor(cur, chunk_size)
+
+
+def _stream_cursor(cur, chunk_size):
+    """
+    Yields rows from an open cursor, fetchmany() chunk by chunk.
+    """
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield from rows
+
 
-    conn.close()
-    return rows
+# Number of records shown per page when browsing
+PAGE_SIZE = 20
+
+
+def get_households_page(after_id=None, before_id=None, limit=PAGE_SIZE):
+    """
+    Returns one page of household records using keyset pagination on
+    the primary key, so only the requested page is read.
+
+    Parameters:
+        after_id (int): Return the first records with id > after_id.
+        before_id (int): Return the last records with id < before_id
+                         (used for the previous page).
+        limit (int): Page size.
+
+    Returns:
+        list: Up to limit Household records, sorted by id.
+    """
+    if before_id is not None:
+        rows = _query_households(
+            "SELECT * FROM households WHERE id < ? ORDER BY id DESC LIMIT ?;",
+            (before_id, limit)
+        ).fetchall()
+        rows.reverse()
+        return rows
+
+    return _query_households(
+        "SELECT * FROM households WHERE id > ? ORDER BY id LIMIT ?;",
+        (after_id or 0, limit)
+    ).fetchall()
+
+
+def _fts_phrase(column, term):
+    """
+    Builds an FTS5 query that matches term as a substring of column.
+    """
+    return f'{column} : "{term.replace(chr(34), chr(34) * 2)}"'
+
+
+def search_households(address=None, special_needs=None,
+                      has_critical_meds=None, meds_need_fridge=None,
+                      large_propane=None, natural_gas=None,
+                      has_special_needs=None, limit=None):
+    """
+    Finds household records matching all of the given filters.
+    Filters left as None are ignored.
+
+    Parameters:
+        address (str): Case-insensitive substring of the address.
+        special_needs (str): Case-insensitive substring of special_needs.
+        has_critical_meds (bool), meds_need_fridge (bool),
+        large_propane (bool), natural_gas (bool): Exact yes/no matches.
+        has_special_needs (bool): True for households whose special
+                                  needs answer is not "no"/"none".
+        limit (int): Maximum number of rows returned.
+
+    Text filters use the trigram FTS5 index; terms shorter than three
+    characters fall back to a LIKE scan. Yes/no filters are served by
+    the partial indexes created in create_search_indexes().
+
+    Returns:
+        list: Matching Household records sorted by id.
+    """
+    clauses = []
+    params = []
+
+    for column, term in (("address", address), ("special_needs", special_needs)):
+        if not term:
+            continue
+        if len(term) >= FTS_MIN_TERM_LENGTH:
+            clauses.append(
+                "id IN (SELECT rowid FROM households_fts WHERE households_fts MATCH ?)"
+            )
+            params.append(_fts_phrase(column, term))
+        else:
+            clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+
+    for column, flag in (
+        ("has_critical_meds", has_critical_meds),
+        ("meds_need_fridge", meds_need_fridge),
+        ("large_propane", large_propane),
+        ("natural_gas", natural_gas),
+    ):
+        if flag is not None:
+            clauses.append(f"{column} = ?")
+            params.append(1 if flag else 0)
+
+    # meds_need_fridge is only recorded for households with critical meds,
+    # so pin has_critical_meds to let SQLite use the partial index.
+    if meds_need_fridge is not None and has_critical_meds is None:
+        clauses.append("has_critical_meds = 1")
+
+    if has_special_needs is not None:
+        clauses.append(HAS_SPECIAL_NEEDS_SQL if has_special_needs
+                       else f"NOT ({HAS_SPECIAL_NEEDS_SQL})")
+
+    sql = "SELECT * FROM households"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    return _query_households(sql + ";", params).fetchall()
 
 
 def get_household_by_id(record_id):
@@ -162,25 +1524,35 @@ def get_household_by_id(record_id):
         record_id (int): The primary key of the desired household.
 
     Returns:
-        tuple | None: The record row if found, else None.
+        Household | None: The record if found, else None.
     """
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT * FROM households WHERE id = ?;", (record_id,))
-    row = cur.fetchone()
-
-    conn.close()
-    return row
+    return _query_households(
+        "SELECT * FROM households WHERE id = ?;", (record_id,)
+    ).fetchone()
 
 
 # -----------------------------------------------------------
 # UPDATING EXISTING RECORDS
 # -----------------------------------------------------------
+def _would_change(conn, record_id, data):
+    """
+    True when writing data ({column: value}) to the household would
+    change at least one stored value.
+    """
+    return conn.execute(f"""
+        SELECT 1 FROM households
+        WHERE id = ? AND ({" OR ".join(f"{field} IS NOT ?" for field in data)});
+    """, (record_id,) + tuple(data.values())).fetchone() is not None
+
+
 def update_household(record_id, data):
     """
     Updates specific fields in an existing household record.
 
+    Like update_households_bulk(), the row is only written when a value
+    actually changes, so saving an unchanged record leaves updated_at
+    and the change journal alone. data itself is not modified.
+
     Parameters:
         record_id (int): ID of the record to update.
         data (dict): A dictionary containing only the fields that
@@ -188,22 +1560,89 @@ def update_household(record_id, data):
 
     Automatically updates:
         updated_at – timestamp for modification tracking
+
+    Returns:
+        bool: True if the record changed.
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    if not data:
+        return False
 
-    # Always update timestamp
-    data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    conn = get_connection()
+    now = datetime.now().isoformat(timespec="seconds")
 
     # Build update clause dynamically based on provided fields
-    update_fields = ", ".join(f"{field} = ?" for field in data.keys())
-    values = list(data.values()) + [record_id]
+    update_fields = ", ".join(f"{field} = ?" for field in data)
+    values = list(data.values()) + [now, record_id]
+
+    with conn:
+        if not _would_change(conn, record_id, data):
+            return False
+
+        _apply_stats(conn, "id = ?", (record_id,), sign=-1)
+        conn.execute(f"""
+            UPDATE households
+            SET {update_fields}, updated_at = ?
+            WHERE id = ?;
+        """, values)
+        _refresh_derived(conn, "id = ?", (record_id,))
+        _apply_stats(conn, "id = ?", (record_id,))
+
+    return True
+
+
+def update_households_bulk(changes):
+    """
+    Applies many field changes in a single transaction.
+
+    Changes that set the same columns share one executemany() call.
+    A row is only written (and its updated_at only moves) when at
+    least one value actually differs from what is stored, so
+    re-applying the same survey is a no-op for incremental exports.
+
+    Parameters:
+        changes (iterable): (record_id, data) pairs, where data maps
+                            column names to their new values, e.g.
+                            (12, {"has_neighbor_key": 1}).
+
+    Returns:
+        int: Number of household rows that changed. Unknown ids and
+             rows that already held the new values are not counted.
+
+    Raises:
+        ValueError: If a change names a column that cannot be edited.
+    """
+    # Collapse the changes per household; later changes win
+    merged = {}
+    for record_id, data in changes:
+        unknown = set(data) - set(DATA_FIELDS)
+        if unknown:
+            raise ValueError("Unknown column(s): " + ", ".join(sorted(unknown)))
+        if data:
+            merged.setdefault(record_id, {}).update(data)
+
+    now = datetime.now().isoformat(timespec="seconds")
+    conn = get_connection()
+    changed = []
+
+    with conn:
+        # Keep only the households whose stored values would change
+        groups = {}
+        for record_id, data in merged.items():
+            if _would_change(conn, record_id, data):
+                groups.setdefault(tuple(data), []).append(tuple(data.values()) + (now, record_id))
+                changed.append(record_id)
+
+        _apply_stats_for_ids(conn, changed, -1)
+
+        for fields, rows in groups.items():
+            conn.executemany(f"""
+                UPDATE households
+                SET {", ".join(f"{field} = ?" for field in fields)}, updated_at = ?
+                WHERE id = ?;
+            """, rows)
 
-    cur.execute(f"""
-        UPDATE households
-        SET {update_fields}
-        WHERE id = ?;
-    """, values)
+        for where, params in _id_chunks(changed):
+            _refresh_derived(conn, where, params)
+            _apply_stats(conn, where, params)
 
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    return len(changed)
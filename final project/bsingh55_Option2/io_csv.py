@@ -10,80 +10,1238 @@ Purpose:
     This module provides CSV import and export functionality for the
     CERT Disaster Preparedness Application. It includes:
 
-        • export_records() – Writes the full households table
-          to a timestamped CSV file inside the /output directory.
+        • export_records() – Writes the households table (optionally
+          a subset of columns, optionally gzip-compressed) to a
+          timestamped CSV file inside the /output directory. The
+          export runs as a background job (start_export_job()).
+
+        • stream_export() – Constant-memory export engine used by
+          export_records(); rows are streamed from the database in
+          fetchmany() chunks through a buffered writer.
+
+        • incremental_export() – Exports only rows changed since the
+          change number saved by the previous run.
 
         • import_records() – Reads household data from a CSV file,
           validates required headers, and safely inserts records
-          into the database.
+          into the database as a background job (start_import_job()).
+
+        • bulk_import() – Streaming, batched import engine used by
+          import_records(). Rows are validated column by column
+          (validation.validate_batch) and written with executemany()
+          in one transaction; rejected rows are saved with a reason
+          to a reject CSV file. Rows that
+          match an existing household are skipped, merged or upserted.
+
+        • batch_import() – Imports every CSV in a directory or glob.
+          Files are parsed and validated in a process pool and streamed
+          back in bounded chunks; a single writer (this process)
+          inserts them file by file in path order.
+
+        • bulk_edit() / bulk_edit_records() – Applies field changes
+          listed in a CSV (an id column plus the columns to change)
+          to existing records in one transaction.
+
+        • columnar_export() / columnar_import() – Parquet and Arrow
+          IPC files with typed columns (integers, nullable booleans,
+          timestamps) for dataframe tools. Needs the optional pyarrow
+          package; CSV works without it.
+
+        • import_gazetteer() – Loads an offline gazetteer CSV (address,
+          latitude, longitude) used to place households on the map.
 
     The module ensures clean separation between user interaction,
     file I/O operations, and database logic.
 """
 
 import csv
+import glob
+import gzip
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from db import get_all_households, insert_household
+from itertools import islice
+from multiprocessing import Manager
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow support is optional
+    pa = pc = pq = None
+
+from db import (
+    DEDUP_POLICIES, DEFAULT_FETCH_SIZE, get_household_stats,
+    insert_households_bulk, update_households_bulk, iter_households,
+    get_export_watermark, set_export_watermark, get_latest_change, load_gazetteer
+)
+from jobs import start_job
+from models import HOUSEHOLD_COLUMNS, DATA_FIELDS
 from utils import print_divider, press_enter_to_continue
+from validation import (
+    HOUSEHOLD_SCHEMA, REQUIRED, VALUE_KINDS, ValidationError, ask_int, ask_yes_no, ask_choice,
+    format_errors, validate_batch, validate_value
+)
 
 
 # -----------------------------------------------------------
 # EXPORTING RECORDS TO CSV
 # -----------------------------------------------------------
+# Write buffer used for export files (bytes)
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Watermark name used by incremental exports unless another is given
+DEFAULT_WATERMARK = "county_eoc"
+
+
+def _open_export_file(path, compress):
+    """
+    Opens an export file for buffered text writing, optionally gzip
+    compressed.
+    """
+    if compress:
+        return gzip.open(path, mode="wt", newline="", encoding="utf-8")
+    return open(path, mode="w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE)
+
+
+def stream_export(path, columns=None, compress=False, chunk_size=DEFAULT_FETCH_SIZE,
+                  changed_since=None, changed_until=None, progress=None):
+    """
+    Writes household records to a CSV file in constant memory.
+
+    Rows are streamed from the database in fetchmany() chunks and
+    written straight through a buffered (or gzip) writer, so memory
+    use does not grow with the size of the table.
+
+    Parameters:
+        path (str): Output file path.
+        columns (list): Columns to export (default: all columns).
+        compress (bool): Write gzip-compressed output.
+        chunk_size (int): Rows fetched from SQLite per round trip.
+        changed_since, changed_until (int): Optional change-number
+                                            bounds (see db.iter_households).
+        progress (callable): Optional progress(rows_done) called after
+                             every chunk; it may raise to abort.
+
+    Returns:
+        int: Number of records written.
+    """
+    columns = list(columns or HOUSEHOLD_COLUMNS)
+    rows = iter_households(columns, chunk_size=chunk_size,
+                           changed_since=changed_since, changed_until=changed_until)
+    count = 0
+
+    with _open_export_file(path, compress) as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if progress is not None and count % chunk_size == 0:
+                progress(count)
+
+    if progress is not None:
+        progress(count)
+
+    return count
+
+
+def incremental_export(path, name=DEFAULT_WATERMARK, columns=None, compress=False,
+                       chunk_size=DEFAULT_FETCH_SIZE, progress=None, file_format="csv"):
+    """
+    Exports only the households changed since the previous incremental
+    export with the same name, then advances that export's watermark.
+
+    The watermark is a change number (see db.create_watermark_table),
+    not a timestamp. The upper bound is the newest change at the start
+    of the run, so rows edited while the export runs are picked up next
+    time, and every change is delivered exactly once per export name.
+    file_format 'parquet' or 'arrow' writes the changes with
+    columnar_export() instead of CSV (compress is then ignored).
+
+    Returns:
+        dict: count, since (previous change number, or None for a first
+              full export) and watermark (the newly saved change number).
+    """
+    since = get_export_watermark(name)
+    until = get_latest_change()
+
+    if file_format == "csv":
+        count = stream_export(path, columns=columns, compress=compress, chunk_size=chunk_size,
+                              changed_since=since or 0, changed_until=until, progress=progress)
+    else:
+        count = columnar_export(path, columns=columns, file_format=file_format,
+                                chunk_size=chunk_size, changed_since=since or 0,
+                                changed_until=until, progress=progress)
+
+    set_export_watermark(name, until)
+
+    return {"count": count, "since": since, "watermark": until}
+
+
 def export_records():
     """
-    Exports all household records from the database into a timestamped
+    Exports household records from the database into a timestamped
     CSV file stored inside the 'output/' directory.
 
-    The exported CSV includes all database fields, including id,
-    timestamps, and optional values.
+    By default the exported CSV includes all database fields, including
+    id, timestamps, and optional values. The user may choose a subset
+    of columns and gzip compression, or a typed Parquet / Arrow file
+    instead of CSV.
     """
     print_divider()
     print("EXPORTING RECORDS TO CSV...")
     print_divider()
 
-    rows = get_all_households()
+    columns_text = input(
+        "Columns to export, comma-separated (press Enter for all): "
+    ).strip()
+    columns = [c.strip() for c in columns_text.split(",") if c.strip()] or None
 
-    if not rows:
-        print("No records to export.")
+    file_format = ask_choice(
+        "File format (csv/parquet/arrow, press Enter for csv): ",
+        tuple(EXPORT_FORMATS),
+        default="csv"
+    )
+    if file_format != "csv" and pa is None:
+        print("Parquet and Arrow export need the optional pyarrow package (pip install pyarrow).")
         press_enter_to_continue()
         return
 
+    compress = file_format == "csv" and ask_yes_no(
+        "Compress the file with gzip?", allow_blank=True, default=False
+    )
+
+    incremental = ask_yes_no(
+        "Export only records changed since the last incremental export?",
+        allow_blank=True,
+        default=False
+    )
+
     # Ensure output directory exists
     os.makedirs("output", exist_ok=True)
 
     # Generate filename with timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"output/Exported Records {timestamp}.csv"
-
-    # Column headers (must match database schema)
-    headers = [
-        "id", "adults", "children", "has_pets", "has_dogs",
-        "has_critical_meds", "meds_need_fridge", "special_needs",
-        "large_propane", "natural_gas", "address",
-        "phone", "email", "has_med_training", "know_neighbors",
-        "has_neighbor_key", "wants_newsletter",
-        "allow_non_disaster_contact", "created_at", "updated_at"
-    ]
-
-    # Write CSV
-    with open(filename, mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow(row)
+    label = "Exported Changes" if incremental else "Exported Records"
+    filename = f"output/{label} {timestamp}{EXPORT_FORMATS[file_format]}"
+    if compress:
+        filename += ".gz"
+
+    unknown = [c for c in columns or () if c not in HOUSEHOLD_COLUMNS]
+    if unknown:
+        print("Unknown column(s): " + ", ".join(unknown))
+        press_enter_to_continue()
+        return
 
-    print(f"Records successfully exported to:\n{filename}")
+    job = start_export_job(filename, columns=columns, compress=compress,
+                           incremental=incremental, file_format=file_format)
+    print(f"Export started in the background (job #{job.id}):\n{filename}")
+    print("Progress is shown above the menu; see Background Jobs to cancel it.")
     press_enter_to_continue()
 
 
+def start_export_job(path, columns=None, compress=False, incremental=False,
+                     file_format="csv"):
+    """
+    Starts stream_export() / columnar_export() / incremental_export()
+    as a background job (see jobs.py). A cancelled, failed or empty
+    export removes its file.
+
+    Returns:
+        jobs.Job: The running job; its result is a dict with count and
+                  path (None when nothing was exported).
+    """
+    # The cached household count gives full exports an exact total
+    total = None if incremental else get_household_stats()["households"]
+
+    def work(report):
+        def progress(rows):
+            report(rows, total)
+
+        try:
+            if incremental:
+                count = incremental_export(path, columns=columns, compress=compress,
+                                           progress=progress,
+                                           file_format=file_format)["count"]
+            elif file_format == "csv":
+                count = stream_export(path, columns=columns, compress=compress,
+                                      progress=progress)
+            else:
+                count = columnar_export(path, columns=columns, file_format=file_format,
+                                        progress=progress)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+        if count == 0:
+            os.remove(path)
+            return {"count": 0, "path": None}
+        return {"count": count, "path": path}
+
+    def summarize(result):
+        if result["path"] is None:
+            return "no changed records to export" if incremental else "no records to export"
+        return f"{result['count']} records exported to {result['path']}"
+
+    return start_job("export", path, work, summarize)
+
+
 # -----------------------------------------------------------
 # IMPORTING RECORDS FROM CSV
 # -----------------------------------------------------------
+# Number of rows written per executemany() call during import
+DEFAULT_BATCH_SIZE = 5000
+
+# Data fields read from an import file, in database insert order
+IMPORT_FIELDS = DATA_FIELDS
+
+
+class CSVFormatError(ValueError):
+    """
+    Raised when an import file is missing required headers.
+    """
+
+    def __init__(self, missing):
+        self.missing = sorted(missing)
+        super().__init__("Missing required headers: " + ", ".join(self.missing))
+
+
+def header_positions(headers):
+    """
+    Maps each import field to its column position in the CSV header.
+    Header names are stripped of whitespace; extra columns are ignored.
+
+    Raises:
+        CSVFormatError: If any required header is missing.
+    """
+    positions = {}
+    for pos, name in enumerate(headers):
+        positions.setdefault(name.strip(), pos)
+
+    missing = set(IMPORT_FIELDS) - set(positions)
+    if missing:
+        raise CSVFormatError(missing)
+
+    return positions
+
+
+class RejectWriter:
+    """
+    Collects rows that could not be imported into a CSV reject file.
+
+    The file is only created when the first reject is recorded. Each
+    line holds the source line number, the reason, and the raw values.
+    """
+
+    def __init__(self, path, headers):
+        self.path = path
+        self.headers = headers
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, line_number, reason, raw_row):
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, mode="w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", "reason"] + list(self.headers))
+        self._writer.writerow([line_number, reason] + list(raw_row))
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _converted_batches(reader, positions, batch_size, rejects):
+    """
+    Streams the CSV reader in batches of raw rows, validates them and
+    yields the valid value tuples. Invalid rows go to the reject file.
+    """
+    while True:
+        raw_rows = []
+        line_numbers = []
+        for row in reader:
+            # Skip completely blank lines
+            if not any(cell.strip() for cell in row):
+                continue
+            raw_rows.append(row)
+            line_numbers.append(reader.line_num)
+            if len(raw_rows) >= batch_size:
+                break
+
+        if not raw_rows:
+            return
+
+        values, errors = validate_batch(raw_rows, positions, IMPORT_FIELDS)
+        for i, field_errors in sorted(errors.items()):
+            rejects.write(line_numbers[i], format_errors(field_errors), raw_rows[i])
+
+        if values:
+            yield values
+
+
+def _report_batches(batches, progress, rejects, raw_file, size):
+    """
+    Passes batches through, calling progress(rows_done, estimated_total)
+    before each one is written. The total is estimated from how much of
+    the file has been read so far.
+    """
+    done = 0
+    for values in batches:
+        done += len(values)
+        rows = done + rejects.count
+        position = raw_file.tell()
+        total = round(rows * size / position) if position and size else None
+        progress(rows, total)
+        yield values
+
+
+def bulk_import(path, batch_size=DEFAULT_BATCH_SIZE, reject_path=None,
+                on_duplicate="skip", progress=None):
+    """
+    Imports a household CSV file using the bulk insert path.
+
+    The file is parsed as a stream, validated in column batches and
+    written with executemany() inside one transaction. Rows that fail
+    validation are written, with a reason, to a reject CSV file.
+
+    Parameters:
+        path (str): CSV file to import.
+        batch_size (int): Rows per executemany() batch.
+        reject_path (str): Reject file location. Defaults to a
+                           timestamped file inside 'output/'.
+        on_duplicate (str): skip, merge or upsert (see db.DEDUP_POLICIES).
+        progress (callable): Optional progress(rows_done, estimated_total)
+                             called per batch; if it raises, the whole
+                             import is rolled back.
+
+    Returns:
+        dict: imported, duplicates, failed, seconds, rows_per_sec and
+              reject_file (None when no rows were rejected).
+
+    Raises:
+        CSVFormatError: If required headers are missing.
+    """
+    if reject_path is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        reject_path = f"output/Import Rejects {timestamp}.csv"
+
+    start = time.perf_counter()
+
+    # Open with utf-8-sig to automatically strip BOM if present
+    with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        positions = header_positions(headers)
+
+        with RejectWriter(reject_path, headers) as rejects:
+            batches = _converted_batches(reader, positions, max(1, batch_size), rejects)
+            if progress is not None:
+                batches = _report_batches(batches, progress, rejects, f.buffer,
+                                          os.path.getsize(path))
+            written = insert_households_bulk(batches, on_duplicate=on_duplicate)
+
+    seconds = time.perf_counter() - start
+    total = written["inserted"] + written["duplicates"] + rejects.count
+
+    return {
+        "imported": written["inserted"],
+        "duplicates": written["duplicates"],
+        "failed": rejects.count,
+        "seconds": seconds,
+        "rows_per_sec": total / seconds if seconds > 0 else 0.0,
+        "reject_file": reject_path if rejects.count else None,
+    }
+
+
+# -----------------------------------------------------------
+# PARALLEL MULTI-FILE IMPORT
+# -----------------------------------------------------------
+def is_batch_target(target):
+    """
+    True when an import target names several files: a directory or a
+    glob pattern such as 'rosters/*.csv'.
+    """
+    return os.path.isdir(target) or any(ch in target for ch in "*?[")
+
+
+def resolve_import_paths(target):
+    """
+    Expands a directory (all *.csv files inside it) or a glob pattern
+    into a sorted list of CSV file paths.
+    """
+    if os.path.isdir(target):
+        target = os.path.join(target, "*.csv")
+    return sorted(p for p in glob.glob(target) if os.path.isfile(p))
+
+
+# Validated batches a worker may queue for one file before it waits
+# for the writer, which bounds memory to about workers x depth batches
+IMPORT_QUEUE_DEPTH = 4
+
+
+class ImportFileError(Exception):
+    """
+    Raised inside a file's write transaction when its worker stopped
+    part way, so the rows already written for that file roll back.
+    """
+
+
+def _parse_import_file(path, batch_size, reject_path, queue):
+    """
+    Worker run in a separate process: parses and validates one CSV
+    file and streams its converted batches through a bounded queue.
+    Rejected rows are written to the file's own reject CSV. The last
+    item put on the queue is always the file's summary dict. The
+    worker never touches SQLite.
+    """
+    result = {
+        "path": path,
+        "failed": 0,
+        "reject_file": None,
+        "error": None,
+    }
+
+    try:
+        with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            headers = next(reader, [])
+            positions = header_positions(headers)
+
+            with RejectWriter(reject_path, headers) as rejects:
+                for values in _converted_batches(reader, positions, batch_size, rejects):
+                    queue.put(values)
+
+        result["failed"] = rejects.count
+        if rejects.count:
+            result["reject_file"] = reject_path
+    except (OSError, UnicodeDecodeError, csv.Error, CSVFormatError) as e:
+        result["error"] = str(e)
+    finally:
+        queue.put(result)
+
+
+def _queued_batches(queue, future, result):
+    """
+    Yields the batches a worker streams for one file and copies the
+    worker's summary into result.
+
+    Raises:
+        ImportFileError: If the worker reported an error.
+    """
+    while True:
+        item = queue.get()
+        if isinstance(item, dict):
+            break
+        yield item
+
+    future.result()     # re-raises anything the worker did not handle
+    result.update(item)
+    if item["error"]:
+        raise ImportFileError(item["error"])
+
+
+def batch_import(target, batch_size=DEFAULT_BATCH_SIZE, workers=None,
+                 on_duplicate="skip", progress=None):
+    """
+    Imports every CSV file matched by a directory or glob pattern.
+
+    Files are parsed and validated in parallel by a process pool. Each
+    worker streams its validated batches back through a bounded queue,
+    so memory stays flat however large the files are. This process is
+    the single writer that owns the SQLite connection: it inserts the
+    files in path order, each in its own transaction, so the resulting
+    ids do not depend on which worker finishes first. A file whose
+    worker fails part way is rolled back and reported.
+
+    Parameters:
+        target (str): Directory or glob pattern.
+        batch_size (int): Rows per executemany() batch.
+        workers (int): Process pool size (default: CPU count).
+        on_duplicate (str): skip, merge or upsert (see db.DEDUP_POLICIES).
+        progress (callable): Optional progress(rows_done, estimated_total)
+                             called after each file is written; if it
+                             raises, files not yet written are skipped.
+
+    Returns:
+        dict: files (one summary per file, sorted by path), imported,
+              duplicates, failed, seconds and rows_per_sec for the
+              whole run.
+    """
+    paths = resolve_import_paths(target)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    start = time.perf_counter()
+    files = []
+
+    total_bytes = sum(os.path.getsize(p) for p in paths)
+    done_bytes = 0
+    done_rows = 0
+
+    # The manager is shut down first on the way out, which releases any
+    # worker still blocked on a full queue if the writer stops early
+    with ProcessPoolExecutor(max_workers=workers) as pool, Manager() as manager:
+        jobs = []
+        for index, path in enumerate(paths, start=1):
+            stem = os.path.splitext(os.path.basename(path))[0]
+            reject_path = f"output/Import Rejects {timestamp} {index:03d} {stem}.csv"
+            queue = manager.Queue(maxsize=IMPORT_QUEUE_DEPTH)
+            future = pool.submit(_parse_import_file, path, max(1, batch_size),
+                                 reject_path, queue)
+            jobs.append((path, queue, future))
+
+        try:
+            for path, queue, future in jobs:
+                result = {"path": path}
+                file_start = time.perf_counter()
+                try:
+                    written = insert_households_bulk(
+                        _queued_batches(queue, future, result), on_duplicate=on_duplicate
+                    )
+                except ImportFileError:
+                    written = {"inserted": 0, "duplicates": 0}
+                result["imported"] = written["inserted"]
+                result["duplicates"] = written["duplicates"]
+                result["seconds"] = time.perf_counter() - file_start
+
+                rows = result["imported"] + result["duplicates"] + result["failed"]
+                result["rows_per_sec"] = rows / result["seconds"] if result["seconds"] > 0 else 0.0
+                files.append(result)
+
+                if progress is not None:
+                    done_bytes += os.path.getsize(path)
+                    done_rows += rows
+                    progress(done_rows, round(done_rows * total_bytes / done_bytes)
+                             if done_bytes else None)
+        except BaseException:
+            # Stop workers that have not started yet
+            for _, _, future in jobs:
+                future.cancel()
+            raise
+
+    seconds = time.perf_counter() - start
+    imported = sum(r["imported"] for r in files)
+    duplicates = sum(r["duplicates"] for r in files)
+    failed = sum(r["failed"] for r in files)
+    total = imported + duplicates + failed
+
+    return {
+        "files": files,
+        "imported": imported,
+        "duplicates": duplicates,
+        "failed": failed,
+        "seconds": seconds,
+        "rows_per_sec": total / seconds if seconds > 0 else 0.0,
+    }
+
+
+# -----------------------------------------------------------
+# PARQUET / ARROW IPC EXPORT AND IMPORT
+# -----------------------------------------------------------
+# Columnar file formats, chosen by file extension
+COLUMNAR_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+# Formats offered by export_records(), with their file extensions
+EXPORT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+# Rows per Arrow record batch (and Parquet row group) when exporting
+COLUMNAR_BATCH_SIZE = 65536
+
+# Household columns stored as timestamps in columnar files
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+
+def columnar_format(path):
+    """
+    Returns 'parquet' or 'arrow' for a columnar file path, or None for
+    anything else (CSV).
+    """
+    return COLUMNAR_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet/Arrow files need the optional pyarrow package "
+                           "(pip install pyarrow).")
+
+
+def household_arrow_schema(columns=HOUSEHOLD_COLUMNS):
+    """
+    Builds the Arrow schema for the given household columns from
+    HOUSEHOLD_SCHEMA: counts are int32, yes/no flags are booleans
+    (nullable where the field is optional), id is int64 and the
+    created/updated stamps are second-precision timestamps.
+    """
+    _require_pyarrow()
+    kinds = {"count": pa.int32(), "flag": pa.bool_(), "text": pa.string(),
+             "phone": pa.string(), "email": pa.string()}
+
+    fields = []
+    for column in columns:
+        if column == "id":
+            fields.append(pa.field(column, pa.int64(), nullable=False))
+        elif column in TIMESTAMP_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp("s")))
+        else:
+            rule = HOUSEHOLD_SCHEMA[column]
+            fields.append(pa.field(column, kinds[rule["kind"]], nullable=rule["blank"] is None))
+    return pa.schema(fields)
+
+
+def _arrow_column(values, field):
+    """
+    Converts one column of SQLite values to an Arrow array. Flags are
+    stored as 0/1 integers and timestamps as ISO text in SQLite.
+    """
+    if pa.types.is_boolean(field.type):
+        return pa.array(values, pa.int8()).cast(field.type)
+    if pa.types.is_timestamp(field.type):
+        return pa.array(values, pa.string()).cast(field.type)
+    return pa.array(values, field.type)
+
+
+def columnar_export(path, columns=None, file_format=None, chunk_size=DEFAULT_FETCH_SIZE,
+                    changed_since=None, changed_until=None, progress=None):
+    """
+    Writes household records to a Parquet or Arrow IPC file with typed
+    columns (see household_arrow_schema()), so readers load them without
+    parsing any text.
+
+    Rows are streamed from the database and written as record batches
+    of COLUMNAR_BATCH_SIZE rows (one Parquet row group each), so memory
+    use stays bounded regardless of the size of the table.
+
+    Parameters:
+        path (str): Output file path.
+        columns (list): Columns to export (default: all columns).
+        file_format (str): 'parquet' or 'arrow' (default: from the
+                           file extension, else parquet).
+        chunk_size (int): Rows fetched from SQLite per round trip.
+        changed_since, changed_until (int): Optional change-number bounds
+                                            (see db.iter_households).
+        progress (callable): Optional progress(rows_done) called after
+                             every record batch; it may raise to abort.
+
+    Returns:
+        int: Number of records written.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+        ValueError: If an unknown column or format is requested.
+    """
+    _require_pyarrow()
+    file_format = file_format or columnar_format(path) or "parquet"
+    if file_format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown columnar format: {file_format}")
+
+    columns = list(columns or HOUSEHOLD_COLUMNS)
+    rows = iter_households(columns, chunk_size=chunk_size,
+                           changed_since=changed_since, changed_until=changed_until)
+    chunk = list(islice(rows, COLUMNAR_BATCH_SIZE))  # also checks the column names
+    schema = household_arrow_schema(columns)
+    count = 0
+
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    with writer:
+        while chunk:
+            arrays = [_arrow_column(list(values), field)
+                      for values, field in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            count += len(chunk)
+            if progress is not None:
+                progress(count)
+            chunk = list(islice(rows, COLUMNAR_BATCH_SIZE))
+
+    if progress is not None:
+        progress(count)
+
+    return count
+
+
+def columnar_column_names(path):
+    """
+    Returns the column names stored in a Parquet or Arrow IPC file.
+    """
+    _require_pyarrow()
+    if columnar_format(path) == "arrow":
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema.names
+    return pq.ParquetFile(path).schema_arrow.names
+
+
+def _columnar_batches(path, batch_size):
+    """
+    Yields record batches of at most batch_size rows holding only the
+    import fields. Parquet files are read row group by row group and
+    Arrow IPC files are memory-mapped, so neither is loaded whole.
+    """
+    fields = list(IMPORT_FIELDS)
+
+    if columnar_format(path) == "arrow":
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i).select(fields)
+                for offset in range(0, batch.num_rows, batch_size):
+                    yield batch.slice(offset, batch_size)
+        return
+
+    yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=fields)
+
+
+def _columnar_row_count(path):
+    if columnar_format(path) == "arrow":
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).count_rows()
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def _validate_columnar_batch(batch, schema, first_row, rejects):
+    """
+    Validates one record batch against HOUSEHOLD_SCHEMA with Arrow
+    compute kernels (one pass per column, no text parsing) and returns
+    the valid rows as value tuples in IMPORT_FIELDS order. Invalid rows
+    go to the reject file; their 'line' is the 1-based row number.
+
+    Raises:
+        ValueError: If a column's type cannot hold the field's values
+                    (e.g. text in a count column).
+    """
+    columns = []
+    failures = {}
+
+    for field in schema:
+        rule = HOUSEHOLD_SCHEMA[field.name]
+        kind = VALUE_KINDS[rule["kind"]]
+        blank = rule["blank"]
+        column = batch.column(field.name)
+
+        bad = None
+        if rule["kind"] == "flag" and (pa.types.is_integer(column.type)
+                                       or pa.types.is_floating(column.type)):
+            # Casting to bool would turn any non-zero number into True,
+            # so numeric flags other than 0/1 are rejected first
+            in_range = pc.is_in(column, value_set=pa.array([0, 1], column.type))
+            bad = pc.and_(pc.is_valid(column), pc.invert(in_range))
+
+        try:
+            column = column.cast(field.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Column {field.name} cannot be read as {field.type}: {e}") from None
+
+        if pa.types.is_string(field.type):
+            column = pc.utf8_trim_whitespace(column)
+            empty = pc.fill_null(pc.equal(column, ""), True)
+            if blank is REQUIRED:
+                bad = empty
+            elif blank is None:
+                column = pc.if_else(empty, pa.scalar(None, pa.string()), column)
+            else:
+                column = pc.if_else(empty, blank, column)
+            if kind["pattern"] is not None:
+                matches = pc.match_substring_regex(column, f"^(?:{kind['pattern']})$")
+                bad = pc.invert(pc.fill_null(matches, True))
+        elif rule["kind"] == "count":
+            column = column.fill_null(blank)
+            bad = pc.fill_null(pc.less(column, 0), False)
+        else:
+            if blank is not None:
+                column = column.fill_null(bool(blank))
+            column = column.cast(pa.int8())
+
+        if bad is not None and pc.any(bad).as_py():
+            failures[field.name] = (bad, "is required" if blank is REQUIRED else kind["message"])
+        columns.append(column)
+
+    if failures:
+        invalid = None
+        for bad, _ in failures.values():
+            invalid = bad if invalid is None else pc.or_(invalid, bad)
+
+        for i in pc.indices_nonzero(invalid).to_pylist():
+            errors = {}
+            for name, (bad, message) in failures.items():
+                if bad[i].as_py():
+                    value = batch.column(name)[i].as_py()
+                    required = HOUSEHOLD_SCHEMA[name]["blank"] is REQUIRED
+                    errors[name] = message if required else f"{message} (got {value!r})"
+            raw_row = [batch.column(name)[i].as_py() for name in IMPORT_FIELDS]
+            rejects.write(first_row + i + 1, format_errors(errors), raw_row)
+
+        keep = pc.invert(invalid)
+        columns = [column.filter(keep) for column in columns]
+
+    return list(zip(*(column.to_pylist() for column in columns)))
+
+
+def columnar_import(path, batch_size=DEFAULT_BATCH_SIZE, reject_path=None,
+                    on_duplicate="skip", progress=None):
+    """
+    Imports a Parquet or Arrow IPC household file using the bulk insert
+    path. Columns are read already typed and validated with Arrow
+    compute kernels, then written with executemany() inside one
+    transaction, exactly like bulk_import(). Extra columns (id,
+    created_at, updated_at, ...) are ignored.
+
+    Parameters:
+        path (str): .parquet / .arrow (see COLUMNAR_FORMATS) file.
+        batch_size (int): Rows per executemany() batch.
+        reject_path (str): Reject file location. Defaults to a
+                           timestamped file inside 'output/'.
+        on_duplicate (str): skip, merge or upsert (see db.DEDUP_POLICIES).
+        progress (callable): Optional progress(rows_done, total_rows)
+                             called per batch; if it raises, the whole
+                             import is rolled back.
+
+    Returns:
+        dict: The same summary as bulk_import().
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+        CSVFormatError: If required columns are missing.
+        ValueError: If a column has a type that cannot be converted.
+    """
+    _require_pyarrow()
+    if reject_path is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        reject_path = f"output/Import Rejects {timestamp}.csv"
+
+    start = time.perf_counter()
+    header_positions(columnar_column_names(path))
+    total_rows = _columnar_row_count(path)
+    schema = household_arrow_schema(IMPORT_FIELDS)
+
+    with RejectWriter(reject_path, IMPORT_FIELDS) as rejects:
+        def batches():
+            done = 0
+            for batch in _columnar_batches(path, max(1, batch_size)):
+                values = _validate_columnar_batch(batch, schema, done, rejects)
+                done += batch.num_rows
+                if progress is not None:
+                    progress(done, total_rows)
+                if values:
+                    yield values
+
+        written = insert_households_bulk(batches(), on_duplicate=on_duplicate)
+
+    seconds = time.perf_counter() - start
+    total = written["inserted"] + written["duplicates"] + rejects.count
+
+    return {
+        "imported": written["inserted"],
+        "duplicates": written["duplicates"],
+        "failed": rejects.count,
+        "seconds": seconds,
+        "rows_per_sec": total / seconds if seconds > 0 else 0.0,
+        "reject_file": reject_path if rejects.count else None,
+    }
+
+
+def start_import_job(path, batch_size=DEFAULT_BATCH_SIZE, on_duplicate="skip"):
+    """
+    Starts bulk_import() (one CSV file), columnar_import() (a Parquet or
+    Arrow file) or batch_import() (a directory or glob pattern) as a
+    background job (see jobs.py). Cancelling a single-file import rolls
+    it back; cancelling a batch import keeps the files already written.
+
+    Returns:
+        jobs.Job: The running job; its result is the import summary.
+    """
+    batch_mode = is_batch_target(path)
+
+    def work(report):
+        if batch_mode:
+            return batch_import(path, batch_size=batch_size, on_duplicate=on_duplicate,
+                                progress=report)
+        if columnar_format(path):
+            return columnar_import(path, batch_size=batch_size, on_duplicate=on_duplicate,
+                                   progress=report)
+        return bulk_import(path, batch_size=batch_size, on_duplicate=on_duplicate,
+                           progress=report)
+
+    def summarize(summary):
+        text = (f"imported {summary['imported']}, duplicates {summary['duplicates']}, "
+                f"failed {summary['failed']} ({summary['rows_per_sec']:,.0f} rows/second)")
+        if batch_mode:
+            errors = sum(1 for r in summary["files"] if r["error"])
+            text = f"{len(summary['files'])} files, " + text
+            if errors:
+                text += f", {errors} file(s) could not be read"
+        elif summary["reject_file"]:
+            text += f", rejects in {summary['reject_file']}"
+        return text
+
+    return start_job("import", path, work, summarize)
+
+
+def print_format_error(error):
+    """
+    Prints the missing headers reported by a CSVFormatError.
+    """
+    print("CSV file format is invalid.")
+    print("Missing required headers:")
+    for h in error.missing:
+        print(f" - {h}")
+
+
+def print_import_summary(summary):
+    """
+    Prints the summary returned by bulk_import().
+    """
+    print("\nImport complete.")
+    print(f"Successfully imported: {summary['imported']}")
+    print(f"Duplicates: {summary['duplicates']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Time: {summary['seconds']:.2f}s ({summary['rows_per_sec']:,.0f} rows/second)")
+    if summary["reject_file"]:
+        print(f"Rejected rows written to:\n{summary['reject_file']}")
+
+
+def print_batch_summary(summary):
+    """
+    Prints the consolidated per-file summary returned by batch_import().
+    """
+    print("\nBatch import complete.")
+    print_divider()
+    for r in summary["files"]:
+        if r["error"]:
+            print(f"{r['path']}: FAILED – {r['error']}")
+            continue
+        print(f"{r['path']}: imported {r['imported']}, duplicates {r['duplicates']}, "
+              f"failed {r['failed']}, "
+              f"{r['rows_per_sec']:,.0f} rows/second")
+        if r["reject_file"]:
+            print(f"    Rejected rows: {r['reject_file']}")
+    print_divider()
+    print(f"Files: {len(summary['files'])}")
+    print(f"Successfully imported: {summary['imported']}")
+    print(f"Duplicates: {summary['duplicates']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Time: {summary['seconds']:.2f}s ({summary['rows_per_sec']:,.0f} rows/second)")
+
+
+# -----------------------------------------------------------
+# BULK EDIT FROM CSV
+# -----------------------------------------------------------
+def parse_edit_row(row, positions):
+    """
+    Converts one bulk-edit CSV row into (record_id, data). Blank cells
+    are left out of data, so they keep the stored value.
+
+    Raises:
+        ValidationError: If the id or any changed value is invalid; its
+                         errors list every failing field.
+    """
+    errors = {}
+    cell = row[positions["id"]].strip() if positions["id"] < len(row) else ""
+    record_id = int(cell) if cell.isascii() and cell.isdigit() else None
+    if record_id is None:
+        errors["id"] = f"must be a record id (got {cell!r})"
+
+    data = {}
+    for field, pos in positions.items():
+        if field == "id" or pos >= len(row) or not row[pos].strip():
+            continue
+        try:
+            data[field] = validate_value(field, row[pos])
+        except ValidationError as e:
+            errors.update(e.errors)
+
+    if errors:
+        raise ValidationError(errors)
+    return record_id, data
+
+
+def bulk_edit(path, reject_path=None):
+    """
+    Applies the changes listed in a bulk-edit CSV file.
+
+    The file needs an id column plus any household columns to change
+    (e.g. 'id,has_neighbor_key'); other columns such as created_at are
+    ignored. Every valid row is applied in a single transaction through
+    update_households_bulk(); invalid rows go to a reject CSV file.
+
+    Parameters:
+        path (str): CSV file listing the changes.
+        reject_path (str): Reject file location. Defaults to a
+                           timestamped file inside 'output/'.
+
+    Returns:
+        dict: rows (valid change rows read), changed (households whose
+              values changed), failed, seconds and reject_file.
+
+    Raises:
+        CSVFormatError: If the id header is missing.
+    """
+    if reject_path is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        reject_path = f"output/Edit Rejects {timestamp}.csv"
+
+    start = time.perf_counter()
+    changes = []
+
+    with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+
+        positions = {}
+        for pos, name in enumerate(headers):
+            name = name.strip()
+            if name == "id" or name in HOUSEHOLD_SCHEMA:
+                positions.setdefault(name, pos)
+        if "id" not in positions:
+            raise CSVFormatError({"id"})
+
+        with RejectWriter(reject_path, headers) as rejects:
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                try:
+                    changes.append(parse_edit_row(row, positions))
+                except ValidationError as e:
+                    rejects.write(reader.line_num, format_errors(e.errors), row)
+
+    changed = update_households_bulk(changes)
+
+    return {
+        "rows": len(changes),
+        "changed": changed,
+        "failed": rejects.count,
+        "seconds": time.perf_counter() - start,
+        "reject_file": reject_path if rejects.count else None,
+    }
+
+
+def print_edit_summary(summary):
+    """
+    Prints the summary returned by bulk_edit().
+    """
+    print("\nBulk edit complete.")
+    print(f"Change rows read: {summary['rows']}")
+    print(f"Records changed: {summary['changed']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Time: {summary['seconds']:.2f}s")
+    if summary["reject_file"]:
+        print(f"Rejected rows written to:\n{summary['reject_file']}")
+
+
+def bulk_edit_records():
+    """
+    Interactive bulk edit: asks for a change CSV and applies it.
+    """
+    print_divider()
+    print("BULK EDIT RECORDS FROM CSV")
+    print_divider()
+
+    print("NOTE:")
+    print(" - The file needs an 'id' column plus the columns to change,")
+    print("   e.g.  id,has_neighbor_key")
+    print(" - Blank cells keep the current value.\n")
+
+    path = input("Enter the path to the CSV file: ").strip()
+
+    if not path or not os.path.exists(path):
+        print("File not found.")
+        press_enter_to_continue()
+        return
+
+    try:
+        summary = bulk_edit(path)
+    except CSVFormatError as e:
+        print_format_error(e)
+        press_enter_to_continue()
+        return
+
+    print_edit_summary(summary)
+    press_enter_to_continue()
+
+
+# -----------------------------------------------------------
+# GAZETTEER IMPORT
+# -----------------------------------------------------------
+# Headers required in a gazetteer CSV
+GAZETTEER_FIELDS = ("address", "latitude", "longitude")
+
+
+def _gazetteer_entries(reader, positions, counts):
+    """
+    Yields (address, latitude, longitude) for each valid gazetteer row
+    and counts the rows that are skipped as invalid.
+    """
+    for row in reader:
+        try:
+            address, lat, lon = (row[positions[f]].strip() for f in GAZETTEER_FIELDS)
+            lat, lon = float(lat), float(lon)
+        except (IndexError, ValueError):
+            counts["failed"] += 1
+            continue
+
+        if not address or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            counts["failed"] += 1
+            continue
+
+        yield address, lat, lon
+
+
+def import_gazetteer(path):
+    """
+    Loads an offline gazetteer CSV (address, latitude, longitude) and
+    re-locates every household against it.
+
+    Returns:
+        dict: entries (rows loaded), located (households with
+              coordinates) and failed (invalid rows skipped).
+
+    Raises:
+        CSVFormatError: If a required header is missing.
+    """
+    counts = {"failed": 0}
+
+    with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        positions = {}
+        for pos, name in enumerate(next(reader, [])):
+            positions.setdefault(name.strip().lower(), pos)
+
+        missing = set(GAZETTEER_FIELDS) - set(positions)
+        if missing:
+            raise CSVFormatError(missing)
+
+        result = load_gazetteer(_gazetteer_entries(reader, positions, counts))
+
+    result["failed"] = counts["failed"]
+    return result
+
+
+# -----------------------------------------------------------
+# INTERACTIVE IMPORT
+# -----------------------------------------------------------
 def import_records():
     """
-    Imports household records from a user-provided CSV file.
+    Imports household records from a user-provided CSV file, or from
+    every CSV file in a directory / matching a glob pattern. A
+    .parquet or .arrow file is read with columnar_import().
 
     The CSV must contain at least the required fields. Extra fields
     (like id, created_at, updated_at) are ignored. This allows import
@@ -95,92 +1253,55 @@ def import_records():
 
     print("NOTE:")
     print(" - Place your CSV file inside the 'output' folder before importing.")
-    print(" - Example file path:  output/test_import.csv\n")
+    print(" - Example file path:  output/test_import.csv")
+    print(" - A folder or pattern (e.g. output/*.csv) imports many files at once.")
+    print(" - Parquet (.parquet) and Arrow (.arrow) files are also accepted.\n")
 
     path = input("Enter the path to the CSV file: ").strip()
 
-    # Validate path
-    if not path:
-        print("File not found.")        
-        press_enter_to_continue()
-        return
+    batch_mode = bool(path) and is_batch_target(path)
 
-    if not os.path.exists(path):
+    # Validate path
+    if not path or (batch_mode and not resolve_import_paths(path)) \
+            or (not batch_mode and not os.path.exists(path)):
         print("File not found.")
         press_enter_to_continue()
         return
 
-    imported = 0
-    failed = 0
+    batch_size = ask_int(
+        f"Batch size (press Enter for {DEFAULT_BATCH_SIZE}): ",
+        allow_blank=True,
+        min_value=1,
+        default=DEFAULT_BATCH_SIZE
+    )
 
-    # Open with utf-8-sig to automatically strip BOM if present
-    with open(path, mode="r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-
-        # Required import fields (data fields only)
-        required_headers = {
-            "adults", "children", "has_pets", "has_dogs",
-            "has_critical_meds", "meds_need_fridge", "special_needs",
-            "large_propane", "natural_gas", "address",
-            "phone", "email", "has_med_training", "know_neighbors",
-            "has_neighbor_key", "wants_newsletter",
-            "allow_non_disaster_contact"
-        }
-
-        # Clean header names once: strip whitespace
-        raw_headers = reader.fieldnames or []
-        clean_headers = [h.strip() for h in raw_headers]
-        header_map = dict(zip(raw_headers, clean_headers))
-
-        # Check for missing required headers
-        missing = required_headers - set(clean_headers)
-        if missing:
-            print("CSV file format is invalid.")
-            print("Missing required headers:")
-            for h in sorted(missing):
-                print(f" - {h}")
+    on_duplicate = ask_choice(
+        "If a household already exists (skip/merge/upsert, press Enter for skip): ",
+        DEDUP_POLICIES,
+        default="skip"
+    )
+
+    # Report a bad header now rather than as a failed background job
+    if not batch_mode:
+        try:
+            if columnar_format(path):
+                headers = columnar_column_names(path)
+            else:
+                with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+                    headers = next(csv.reader(f), [])
+            header_positions(headers)
+        except CSVFormatError as e:
+            print_format_error(e)
+            press_enter_to_continue()
+            return
+        except (RuntimeError, OSError, ValueError) as e:
+            # Missing pyarrow, or a file that is not valid Parquet/Arrow
+            print(e)
             press_enter_to_continue()
             return
 
-        # Process each row
-        for row in reader:
-            try:
-                # Build a "clean_row" with sanitized keys
-                clean_row = {}
-                for original_key, value in row.items():
-                    if original_key is None:
-                        continue
-                    key = header_map.get(original_key, original_key).strip()
-                    clean_row[key] = (value.strip() if isinstance(value, str) else value)
-
-                data = {
-                    "adults": int(clean_row.get("adults") or 0),
-                    "children": int(clean_row.get("children") or 0),
-                    "has_pets": int(clean_row.get("has_pets") or 0),
-                    "has_dogs": int(clean_row.get("has_dogs")) if clean_row.get("has_dogs") not in (None, "",) else None,
-                    "has_critical_meds": int(clean_row.get("has_critical_meds") or 0),
-                    "meds_need_fridge": int(clean_row.get("meds_need_fridge")) if clean_row.get("meds_need_fridge") not in (None, "",) else None,
-                    "special_needs": clean_row.get("special_needs", ""),
-                    "large_propane": int(clean_row.get("large_propane") or 0),
-                    "natural_gas": int(clean_row.get("natural_gas") or 0),
-                    "address": clean_row.get("address", ""),
-
-                    "phone": clean_row.get("phone") or None,
-                    "email": clean_row.get("email") or None,
-                    "has_med_training": int(clean_row.get("has_med_training")) if clean_row.get("has_med_training") not in (None, "",) else None,
-                    "know_neighbors": int(clean_row.get("know_neighbors")) if clean_row.get("know_neighbors") not in (None, "",) else None,
-                    "has_neighbor_key": int(clean_row.get("has_neighbor_key")) if clean_row.get("has_neighbor_key") not in (None, "",) else None,
-                    "wants_newsletter": int(clean_row.get("wants_newsletter")) if clean_row.get("wants_newsletter") not in (None, "",) else None,
-                    "allow_non_disaster_contact": int(clean_row.get("allow_non_disaster_contact")) if clean_row.get("allow_non_disaster_contact") not in (None, "",) else None,
-                }
-
-                insert_household(data)
-                imported += 1
-
-            except Exception:
-                failed += 1
-
-    print("\nImport complete.")
-    print(f"Successfully imported: {imported}")
-    print(f"Failed: {failed}")
-    press_enter_to_continue()
\ No newline at end of file
+    job = start_import_job(path, batch_size=batch_size, on_duplicate=on_duplicate)
+    print(f"Import started in the background (job #{job.id}).")
+    print("You can keep viewing and searching records while it runs;")
+    print("progress is shown above the menu.")
+    press_enter_to_continue()
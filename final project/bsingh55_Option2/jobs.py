@@ -0,0 +1,224 @@
+"""
+SER 416 – Software Enterprise Projects & Process
+Final Project – Option 2 (Developer Route)
+
+Author: Bhupinder Singh (bsingh55)
+
+File: jobs.py
+Purpose:
+    Runs CSV imports and exports as background jobs so the menu stays
+    usable while a large file is processed.
+
+        • start_job() – Runs a unit of work on a worker thread and
+          returns a Job immediately (io_csv.start_import_job() and
+          start_export_job() are built on it).
+        • Job – Tracks status, progress (rows done, rows/second, ETA)
+          and the final result; cancel() stops it at the next batch.
+        • list_jobs(), writer_busy(), cancel_all() – Used by the menu.
+        • Progress / format_progress() – Rate and ETA bookkeeping,
+          also used by the CLI --progress option.
+
+    Each worker thread gets its own pooled SQLite connection. The
+    database runs in WAL mode, so read-only screens (view, search,
+    dashboard) keep working while an import job holds the write lock.
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from db import close_thread_connection
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job's worker thread once the job is cancelled.
+    """
+
+
+# -----------------------------------------------------------
+# PROGRESS
+# -----------------------------------------------------------
+class Progress:
+    """
+    Thread-safe row counter that derives rows/second and an ETA.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._total = None
+
+    def update(self, rows, total=None):
+        """
+        Records rows done so far and, when known, the expected total.
+        """
+        with self._lock:
+            self._rows = rows
+            if total is not None:
+                self._total = max(total, rows)
+
+    def snapshot(self):
+        """
+        Returns a dict with rows, total, elapsed, rate and eta (seconds;
+        None when the total is unknown or nothing is done yet).
+        """
+        with self._lock:
+            rows, total = self._rows, self._total
+        elapsed = time.perf_counter() - self.started
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        eta = (total - rows) / rate if total is not None and rate > 0 else None
+        return {"rows": rows, "total": total, "elapsed": elapsed, "rate": rate, "eta": eta}
+
+
+def format_progress(snapshot):
+    """
+    Formats a Progress snapshot, e.g.
+    '45,000 / ~120,000 rows | 11,250 rows/s | ETA 0:00:07'.
+    """
+    text = f"{snapshot['rows']:,}"
+    if snapshot["total"] is not None:
+        text += f" / ~{snapshot['total']:,}"
+    text += f" rows | {snapshot['rate']:,.0f} rows/s"
+    if snapshot["eta"] is not None:
+        text += f" | ETA {timedelta(seconds=round(snapshot['eta']))}"
+    return text
+
+
+# -----------------------------------------------------------
+# JOBS
+# -----------------------------------------------------------
+class Job:
+    """
+    One import or export running on its own worker thread.
+
+    status is 'running', 'done', 'failed' or 'cancelled'. When done,
+    result holds the value returned by the work and summary a one-line
+    description of it; when failed, error holds the message.
+    """
+
+    def __init__(self, job_id, kind, description, work, summarize):
+        self.id = job_id
+        self.kind = kind
+        self.description = description
+        self.status = "running"
+        self.result = None
+        self.summary = None
+        self.error = None
+        self.progress = Progress()
+        self._work = work
+        self._summarize = summarize
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-{job_id}", daemon=True)
+
+    @property
+    def running(self):
+        return self.status == "running"
+
+    def report(self, rows, total=None):
+        """
+        Progress callback handed to the import/export engines. Raises
+        JobCancelled once cancel() has been called, which aborts the
+        engine (an import is rolled back).
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.progress.update(rows, total)
+
+    def cancel(self):
+        """
+        Asks the job to stop at its next progress report.
+        """
+        self._cancel.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.result = self._work(self.report)
+            self.summary = self._summarize(self.result)
+            self.status = "done"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            close_thread_connection()
+
+    def describe(self):
+        """
+        One-line status shown by the menu.
+        """
+        line = f"#{self.id} {self.kind} {self.description}: "
+        if self.running:
+            return line + "running – " + format_progress(self.progress.snapshot())
+        if self.status == "done":
+            return line + "done – " + self.summary
+        if self.status == "failed":
+            return line + "FAILED – " + self.error
+        return line + "cancelled"
+
+
+_jobs = []
+_jobs_lock = threading.Lock()
+
+
+def start_job(kind, description, work, summarize):
+    """
+    Starts work on a new daemon worker thread.
+
+    Parameters:
+        kind (str): 'import' or 'export' (imports block other writes).
+        description (str): Shown in the job list, usually the file path.
+        work (callable): work(report) does the job and returns its
+                         result; it passes report as the progress
+                         callback of the engine it runs.
+        summarize (callable): Turns the result into a one-line summary.
+
+    Returns:
+        Job: The running job.
+    """
+    with _jobs_lock:
+        job = Job(len(_jobs) + 1, kind, description, work, summarize)
+        _jobs.append(job)
+    job._thread.start()
+    return job
+
+
+def list_jobs():
+    """
+    Returns every job started in this session, oldest first.
+    """
+    with _jobs_lock:
+        return list(_jobs)
+
+
+def get_job(job_id):
+    """
+    Returns the job with the given number, or None.
+    """
+    with _jobs_lock:
+        return next((job for job in _jobs if job.id == job_id), None)
+
+
+def writer_busy():
+    """
+    True while an import job is running. SQLite allows one writer at a
+    time, so the menu keeps other writes until the import finishes.
+    """
+    return any(job.running and job.kind == "import" for job in list_jobs())
+
+
+def cancel_all(wait=True):
+    """
+    Cancels every running job and, by default, waits for them to stop.
+    """
+    running = [job for job in list_jobs() if job.running]
+    for job in running:
+        job.cancel()
+    if wait:
+        for job in running:
+            job.join()
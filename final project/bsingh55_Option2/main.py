@@ -15,17 +15,82 @@ Purpose:
         • Adding new household records
         • Importing records from CSV files
         • Exporting records to CSV files
+        • Searching records by address, special needs, and hazards
+        • Listing the top at-risk households for dispatch
+        • Showing the county readiness dashboard
+        • Bulk-editing records from a CSV of changes
+        • Listing households near a location
+        • Watching and cancelling background import/export jobs
 
-    The main program loop runs until the user selects Quit. This file
+    The main program loop runs until the user selects Quit. When
+    command-line arguments are given, the non-interactive CLI in
+    cli.py runs instead (see `python3 main.py --help`). This file
     contains no business logic; it merely orchestrates feature calls
     implemented in other modules, keeping the program organized and
     maintainable.
 """
 
-from db import create_tables
-from records import add_record, view_records
-from io_csv import import_records, export_records
-from utils import print_divider
+import sys
+
+from db import init_db, close_db
+from migrations import migrate
+from records import (
+    add_record, view_records, search_records, view_priority_list, view_dashboard,
+    view_nearby, writes_blocked
+)
+from io_csv import import_records, export_records, bulk_edit_records
+from jobs import list_jobs, get_job, cancel_all
+from utils import print_divider, press_enter_to_continue
+from cli import run
+
+
+# -----------------------------------------------------------
+# BACKGROUND JOBS
+# -----------------------------------------------------------
+def print_running_jobs():
+    """
+    Prints one progress line per running background job.
+    """
+    for job in list_jobs():
+        if job.running:
+            print(job.describe())
+
+
+def view_jobs():
+    """
+    Lists every background job started this session and lets the user
+    cancel a running one.
+    """
+    print_divider()
+    print("BACKGROUND JOBS")
+    print_divider()
+
+    jobs = list_jobs()
+    if not jobs:
+        print("No background jobs have been started.")
+        press_enter_to_continue()
+        return
+
+    for job in jobs:
+        print(job.describe())
+
+    if not any(job.running for job in jobs):
+        press_enter_to_continue()
+        return
+
+    text = input("\nJob number to cancel (press Enter to go back): ").strip()
+    if not text:
+        return
+
+    job = get_job(int(text)) if text.isdigit() else None
+    if job is None or not job.running:
+        print("No running job with that number.")
+    else:
+        job.cancel()
+        print(f"Cancelling job #{job.id}...")
+        job.join()
+        print(job.describe())
+    press_enter_to_continue()
 
 
 # -----------------------------------------------------------
@@ -40,25 +105,52 @@ def main_menu():
         print_divider()
         print("CERT DISASTER PREPAREDNESS APP")
         print_divider()
+        print_running_jobs()
         print("1) View Records")
         print("2) Add New Record")
         print("3) Import Records from CSV")
         print("4) Export Records to CSV")
         print("5) Quit")
+        # Options added after the original menu are appended, so the
+        # numbers 1-5 keep working for existing scripts and piped input
+        print("6) Search Records")
+        print("7) Top At-Risk Households")
+        print("8) Readiness Dashboard")
+        print("9) Bulk Edit from CSV")
+        print("10) Households Near a Location")
+        print("11) Background Jobs")
 
         choice = input("\nEnter your choice: ").strip()
 
         if choice == "1":
             view_records()
         elif choice == "2":
-            add_record()
+            if not writes_blocked():
+                add_record()
         elif choice == "3":
-            import_records()
+            if not writes_blocked():
+                import_records()
         elif choice == "4":
             export_records()
         elif choice == "5":
+            if any(job.running for job in list_jobs()):
+                print("Cancelling background jobs...")
+                cancel_all()
             print("Goodbye!")
             break
+        elif choice == "6":
+            search_records()
+        elif choice == "7":
+            view_priority_list()
+        elif choice == "8":
+            view_dashboard()
+        elif choice == "9":
+            if not writes_blocked():
+                bulk_edit_records()
+        elif choice == "10":
+            view_nearby()
+        elif choice == "11":
+            view_jobs()
         else:
             print("Invalid choice. Try again.")
 
@@ -66,13 +158,26 @@ def main_menu():
 # -----------------------------------------------------------
 # APPLICATION ENTRY POINT
 # -----------------------------------------------------------
-def main():
+def main(argv=None):
     """
-    Initializes the database tables and starts the main menu loop.
+    Opens the shared database connection manager, upgrades the
+    database schema to the latest version and starts the main menu
+    loop.
+
+    When command-line arguments are given (e.g. `main.py export`),
+    the non-interactive CLI in cli.py runs instead of the menu.
     """
-    create_tables()
-    main_menu()
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run(argv)
+
+    init_db()
+    try:
+        migrate()
+        main_menu()
+    finally:
+        close_db()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
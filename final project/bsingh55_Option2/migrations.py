@@ -0,0 +1,134 @@
+"""
+SER 416 – Software Enterprise Projects & Process
+Final Project – Option 2 (Developer Route)
+
+Author: Bhupinder Singh (bsingh55)
+
+File: migrations.py
+Purpose:
+    Versioned schema upgrades for cert_records.db.
+
+    The schema version is stored in the database header
+    (PRAGMA user_version). At startup, migrate() applies every
+    migration newer than that version, in order, and records each
+    version once its step has finished. A new table, column or index
+    therefore ships as a new entry at the end of MIGRATIONS; deployed
+    databases pick it up the next time the application starts.
+
+    Steps are idempotent: a database created before versioning existed
+    (user_version 0) runs every step once, and a step interrupted
+    part-way simply runs again. Backfills of large tables run in id
+    batches with one transaction per batch (db.backfill), so upgrades
+    never hold the write lock for long.
+"""
+
+from db import (
+    get_connection, create_tables, create_search_indexes, rebuild_search_index,
+    create_risk_index, rebuild_risk_scores, create_dedup_index, rebuild_dedup_keys,
+    create_watermark_table, backfill_change_numbers, create_stats_table,
+    rebuild_household_stats, create_geo_index, rebuild_locations, create_journal,
+    BACKFILL_BATCH_SIZE
+)
+
+
+# -----------------------------------------------------------
+# MIGRATION STEPS
+# -----------------------------------------------------------
+def _search_indexes():
+    create_search_indexes()
+    rebuild_search_index()
+
+
+def _risk_index():
+    create_risk_index()
+    rebuild_risk_scores()
+
+
+def _dedup_index():
+    create_dedup_index()
+    rebuild_dedup_keys()
+
+
+def _watermark_table():
+    create_watermark_table()
+    backfill_change_numbers()
+
+
+def _stats_table():
+    create_stats_table()
+    rebuild_household_stats(batch_size=BACKFILL_BATCH_SIZE)
+
+
+def _geo_index():
+    create_geo_index()
+    rebuild_locations()
+
+
+# Ordered (version, description, step) entries. Never edit or reorder
+# a released entry; append a new one instead.
+MIGRATIONS = (
+    (1, "households table", create_tables),
+    (2, "search indexes and FTS5 table", _search_indexes),
+    (3, "risk score index", _risk_index),
+    (4, "duplicate-detection keys", _dedup_index),
+    (5, "incremental export watermarks", _watermark_table),
+    (6, "cached readiness statistics", _stats_table),
+    (7, "gazetteer and spatial index", _geo_index),
+    (8, "change journal", create_journal),
+)
+
+# Schema version of a fully migrated database
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# -----------------------------------------------------------
+# RUNNING MIGRATIONS
+# -----------------------------------------------------------
+def get_schema_version():
+    """
+    Returns the schema version stored in the database header.
+    """
+    return get_connection().execute("PRAGMA user_version;").fetchone()[0]
+
+
+def _set_schema_version(version):
+    conn = get_connection()
+    with conn:
+        conn.execute(f"PRAGMA user_version = {int(version)};")
+
+
+def migrate(target=LATEST_VERSION, progress=None):
+    """
+    Applies every pending migration up to target, oldest first.
+
+    Parameters:
+        target (int): Version to upgrade to (default: latest).
+        progress (callable): Optional progress(version, description)
+                             called before each step runs.
+
+    Returns:
+        list: The (version, description) pairs that were applied.
+
+    Raises:
+        RuntimeError: If the database was written by a newer version
+                      of the application.
+    """
+    current = get_schema_version()
+    if current > LATEST_VERSION:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than this "
+            f"application supports ({LATEST_VERSION})."
+        )
+
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        if progress is not None:
+            progress(version, description)
+        step()
+        _set_schema_version(version)
+        applied.append((version, description))
+
+    return applied
+
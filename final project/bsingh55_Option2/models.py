@@ -0,0 +1,71 @@
+"""
+SER 416 – Software Enterprise Projects & Process
+Final Project – Option 2 (Developer Route)
+
+Author: Bhupinder Singh (bsingh55)
+
+File: models.py
+Purpose:
+    Defines the Household record type shared by db.py, records.py and
+    io_csv.py, and the single authoritative list of household columns.
+
+    Household is a NamedTuple: rows keep tuple behavior (CSV writers,
+    unpacking) but fields are read by name (row.address instead of
+    row[10]). NamedTuples use __slots__, so a large listing costs no
+    per-row dictionary.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class Household(NamedTuple):
+    """
+    One row of the households table, in table column order.
+    """
+    id: int
+
+    adults: int
+    children: int
+
+    has_pets: int
+    has_dogs: Optional[int]
+
+    has_critical_meds: int
+    meds_need_fridge: Optional[int]
+
+    special_needs: str
+
+    large_propane: int
+    natural_gas: int
+
+    address: str
+
+    phone: Optional[str]
+    email: Optional[str]
+
+    has_med_training: Optional[int]
+    know_neighbors: Optional[int]
+    has_neighbor_key: Optional[int]
+    wants_newsletter: Optional[int]
+    allow_non_disaster_contact: Optional[int]
+
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+# All households columns in table order
+HOUSEHOLD_COLUMNS = Household._fields
+
+# Columns written by inserts (everything except the id)
+INSERT_FIELDS = HOUSEHOLD_COLUMNS[1:]
+
+# Household data entered by users or imported (no id, no timestamps)
+DATA_FIELDS = INSERT_FIELDS[:-2]
+
+
+def household_row(cursor, row):
+    """
+    sqlite3 row factory that builds Household records. Set it on
+    cursors whose query selects every households column (SELECT *).
+    """
+    return Household(*row)
@@ -12,7 +12,11 @@ Purpose:
 
     Features Included:
         • Add new household records
-        • View all records in summary form
+        • Browse records in pages (keyset pagination) in summary form
+        • Search records by address, special needs, and hazard flags
+        • List the top at-risk households for incident response
+        • Show the county readiness dashboard (cached totals)
+        • List households near a location (geospatial index)
         • Edit an existing record
         • Helper to convert boolean database fields into yes/no text
 
@@ -20,11 +24,14 @@ Purpose:
 """
 
 from validation import (
-    ask_int, ask_yes_no, ask_text, ask_phone, ask_email
+    ask_int, ask_float, ask_yes_no, ask_text, ask_phone, ask_email
 )
 from db import (
-    insert_household, get_all_households, get_household_by_id, update_household
+    insert_household, get_households_page, get_household_by_id, update_household,
+    search_households, get_top_risk_households, get_household_stats,
+    get_households_near, PAGE_SIZE
 )
+from jobs import writer_busy
 from utils import print_divider, press_enter_to_continue
 
 
@@ -130,153 +137,359 @@ def add_record():
 # -------------------------------------------------------
 def view_records():
     """
-    Displays all household records in a summary list.
-    Allows the user to select a record to edit.
+    Displays household records one page at a time in a summary list.
+    Only the current page is loaded from the database. The user can
+    move to the next/previous page, jump to a record ID, or select a
+    record on the page to edit.
     """
-    print_divider()
-    print("HOUSEHOLD RECORDS")
-    print_divider()
+    page = get_households_page(limit=PAGE_SIZE)
+
+    if not page:
+        print_divider()
+        print("HOUSEHOLD RECORDS")
+        print_divider()
+        print("No records found.")
+        press_enter_to_continue()
+        return
+
+    while True:
+        print_divider()
+        print(f"HOUSEHOLD RECORDS (IDs {page[0].id}–{page[-1].id})")
+        print_divider()
+
+        # Display summary for the current page
+        for i, row in enumerate(page, start=1):
+            print(f"{i}) ID {row.id} | {row.address} | "
+                  f"Adults: {row.adults}, Children: {row.children}")
+
+        print("\n[N] Next page  [P] Previous page  [J] Jump to ID")
+        print("Press Enter to return to the main menu.")
+        choice = input("Enter a number to edit that record: ").strip().lower()
+
+        if choice == "":
+            return
+
+        if choice == "n":
+            next_page = get_households_page(after_id=page[-1].id, limit=PAGE_SIZE)
+            if next_page:
+                page = next_page
+            else:
+                print("Already on the last page.")
+            continue
+
+        if choice == "p":
+            prev_page = get_households_page(before_id=page[0].id, limit=PAGE_SIZE)
+            if prev_page:
+                page = prev_page
+            else:
+                print("Already on the first page.")
+            continue
+
+        if choice == "j":
+            target = ask_int("Jump to record ID: ", min_value=1)
+            jump_page = get_households_page(after_id=target - 1, limit=PAGE_SIZE)
+            if jump_page:
+                page = jump_page
+            else:
+                print("No records at or after that ID.")
+            continue
+
+        if not choice.isdigit() or not (1 <= int(choice) <= len(page)):
+            print("Invalid selection.")
+            continue
+
+        record_id = page[int(choice) - 1].id
+        edit_record(record_id)
+        return
+
+
+# -------------------------------------------------------
+# SEARCH RECORDS
+# -------------------------------------------------------
+# Maximum number of search results shown at once
+SEARCH_LIMIT = 100
 
-    rows = get_all_households()
 
+def search_records():
+    """
+    Interactive search over household records. Every filter is
+    optional; blank answers are ignored. Matching records are listed
+    in summary form and one may be opened for editing by its ID.
+    """
+    print_divider()
+    print("SEARCH HOUSEHOLD RECORDS")
+    print_divider()
+    print("Press Enter to skip any filter.\n")
+
+    filters = {
+        "address": ask_text("Address contains: ", allow_blank=True),
+        "special_needs": ask_text("Special needs contains: ", allow_blank=True),
+        "has_special_needs": ask_yes_no(
+            "Has special needs?", allow_blank=True, default=None
+        ),
+        "has_critical_meds": ask_yes_no(
+            "Has critical medications?", allow_blank=True, default=None
+        ),
+        "meds_need_fridge": ask_yes_no(
+            "Medications require refrigeration?", allow_blank=True, default=None
+        ),
+        "large_propane": ask_yes_no(
+            "Large propane tank?", allow_blank=True, default=None
+        ),
+        "natural_gas": ask_yes_no(
+            "Natural gas connection?", allow_blank=True, default=None
+        ),
+    }
+
+    rows = search_households(limit=SEARCH_LIMIT + 1, **filters)
+
+    print()
     if not rows:
-        print("No records found.")
+        print("No matching records found.")
         press_enter_to_continue()
         return
 
-    # Display summary
-    for i, row in enumerate(rows, start=1):
-        record_id = row[0]
-        address = row[10]
-        adults = row[1]
-        children = row[2]
-        print(f"{i}) ID {record_id} | {address} | Adults: {adults}, Children: {children}")
+    for row in rows[:SEARCH_LIMIT]:
+        print(f"ID {row.id} | {row.address} | Adults: {row.adults}, Children: {row.children}")
+
+    if len(rows) > SEARCH_LIMIT:
+        print(f"\nShowing the first {SEARCH_LIMIT} matches. Narrow the filters to see more.")
 
     print("\nPress Enter to return to the main menu.")
-    choice = input("Enter a number to edit that record: ").strip()
+    record_id = ask_int("Enter a record ID to edit that record: ", allow_blank=True)
+
+    if record_id is not None:
+        edit_record(record_id)
+
 
-    if choice == "":
+# -------------------------------------------------------
+# PRIORITY LIST
+# -------------------------------------------------------
+def view_priority_list():
+    """
+    Shows the top N at-risk households (highest risk score first) so
+    CERT dispatch knows which homes to check first during an event.
+    """
+    print_divider()
+    print("TOP AT-RISK HOUSEHOLDS")
+    print_divider()
+
+    limit = ask_int(
+        "How many households to list? (press Enter for 10): ",
+        allow_blank=True,
+        min_value=1,
+        default=10
+    )
+
+    ranked = get_top_risk_households(limit)
+
+    if not ranked:
+        print("No records found.")
+        press_enter_to_continue()
         return
 
-    if not choice.isdigit() or not (1 <= int(choice) <= len(rows)):
-        print("Invalid selection.")
+    for rank, (score, row) in enumerate(ranked, start=1):
+        print(f"{rank}) Score {score} | ID {row.id} | {row.address} | "
+              f"Adults: {row.adults}, Children: {row.children}")
+
+    press_enter_to_continue()
+
+
+# -------------------------------------------------------
+# HOUSEHOLDS NEAR A LOCATION
+# -------------------------------------------------------
+def view_nearby():
+    """
+    Lists the households within a radius of a point (for example a gas
+    leak), nearest first. Only households whose address was found in
+    the gazetteer have coordinates.
+    """
+    print_divider()
+    print("HOUSEHOLDS NEAR A LOCATION")
+    print_divider()
+
+    latitude = ask_float("Latitude (e.g. 33.4484): ", min_value=-90, max_value=90)
+    longitude = ask_float("Longitude (e.g. -112.0740): ", min_value=-180, max_value=180)
+    radius = ask_float(
+        "Radius in km (press Enter for 1): ",
+        allow_blank=True,
+        min_value=0,
+        default=1.0
+    )
+
+    nearby = get_households_near(latitude, longitude, radius, limit=SEARCH_LIMIT)
+
+    if not nearby:
+        print("No located households in that area.")
         press_enter_to_continue()
         return
 
-    index = int(choice) - 1
-    record_id = rows[index][0]
+    for distance, row in nearby:
+        print(f"{distance:6.2f} km | ID {row.id} | {row.address} | "
+              f"Adults: {row.adults}, Children: {row.children}, "
+              f"Special needs: {row.special_needs}")
+
+    if len(nearby) == SEARCH_LIMIT:
+        print(f"\nShowing the nearest {SEARCH_LIMIT}; use a smaller radius to narrow it down.")
+
+    press_enter_to_continue()
+
+
+# -------------------------------------------------------
+# READINESS DASHBOARD
+# -------------------------------------------------------
+# Labels used when printing get_household_stats()
+STATS_LABELS = (
+    ("households", "Households"),
+    ("adults", "Adults"),
+    ("children", "Children"),
+    ("with_pets", "Homes with pets"),
+    ("with_dogs", "Homes with dogs"),
+    ("critical_meds", "Critical medications"),
+    ("meds_need_fridge", "Meds needing refrigeration"),
+    ("special_needs", "Special needs"),
+    ("large_propane", "Large propane tanks"),
+    ("natural_gas", "Natural gas connections"),
+)
+
+
+def print_household_stats(stats):
+    """
+    Prints readiness totals as an aligned label/value table.
+    """
+    width = max(len(label) for _, label in STATS_LABELS)
+    for key, label in STATS_LABELS:
+        print(f"{label:<{width}}  {stats[key]}")
+
+
+def view_dashboard():
+    """
+    Shows county-level readiness totals. The totals are kept up to
+    date by every insert and edit, so this screen loads instantly
+    regardless of how many households are stored.
+    """
+    print_divider()
+    print("READINESS DASHBOARD")
+    print_divider()
 
-    edit_record(record_id)
+    print_household_stats(get_household_stats())
+
+    press_enter_to_continue()
 
 
 # -------------------------------------------------------
 # EDIT RECORD
 # -------------------------------------------------------
+def writes_blocked():
+    """
+    Returns True (after telling the user) while an import job is
+    writing, since SQLite allows only one writer at a time.
+    """
+    if writer_busy():
+        print("An import is running in the background. Viewing, searching and")
+        print("exporting still work; changes must wait until it finishes.")
+        press_enter_to_continue()
+        return True
+    return False
+
+
 def edit_record(record_id):
     """
     Loads an existing record by ID, shows current values, and allows
     the user to update any field. Blank entries preserve old values.
     """
+    if writes_blocked():
+        return
+
     print_divider()
     print(f"EDITING RECORD ID {record_id}")
     print_divider()
 
-    row = get_household_by_id(record_id)
+    record = get_household_by_id(record_id)
 
-    if not row:
+    if not record:
         print("Record not found.")
         press_enter_to_continue()
         return
 
-    # Map database row to named fields
-    fields = [
-        "id", "adults", "children", "has_pets", "has_dogs",
-        "has_critical_meds", "meds_need_fridge", "special_needs",
-        "large_propane", "natural_gas", "address",
-        "phone", "email", "has_med_training", "know_neighbors",
-        "has_neighbor_key", "wants_newsletter",
-        "allow_non_disaster_contact", "created_at", "updated_at"
-    ]
-
-    record = {fields[i]: row[i] for i in range(len(fields))}
     updated = {}
 
     print("Press Enter to keep the current value.\n")
 
     # Required fields
     updated["adults"] = ask_int(
-        f"Adults [{record['adults']}]: ",
+        f"Adults [{record.adults}]: ",
         allow_blank=True,
-        default=record["adults"]
+        default=record.adults
     )
     updated["children"] = ask_int(
-        f"Children [{record['children']}]: ",
+        f"Children [{record.children}]: ",
         allow_blank=True,
-        default=record["children"]
+        default=record.children
     )
 
     # Pets
     updated["has_pets"] = ask_yes_no(
-        f"Has pets? [{yesno(record['has_pets'])}]",
+        f"Has pets? [{yesno(record.has_pets)}]",
         allow_blank=True,
-        default=record["has_pets"]
+        default=record.has_pets
     )
     if updated["has_pets"]:
         updated["has_dogs"] = ask_yes_no(
-            f"Has dogs? [{yesno(record['has_dogs'])}]",
+            f"Has dogs? [{yesno(record.has_dogs)}]",
             allow_blank=True,
-            default=record["has_dogs"]
+            default=record.has_dogs
         )
     else:
         updated["has_dogs"] = None
 
     # Medications
     updated["has_critical_meds"] = ask_yes_no(
-        f"Critical medications? [{yesno(record['has_critical_meds'])}]",
+        f"Critical medications? [{yesno(record.has_critical_meds)}]",
         allow_blank=True,
-        default=record["has_critical_meds"]
+        default=record.has_critical_meds
     )
     if updated["has_critical_meds"]:
         updated["meds_need_fridge"] = ask_yes_no(
-            f"Requires refrigeration? [{yesno(record['meds_need_fridge'])}]",
+            f"Requires refrigeration? [{yesno(record.meds_need_fridge)}]",
             allow_blank=True,
-            default=record["meds_need_fridge"]
+            default=record.meds_need_fridge
         )
     else:
         updated["meds_need_fridge"] = None
 
     # Other required fields
     updated["special_needs"] = ask_text(
-        f"Special needs [{record['special_needs']}]: ",
+        f"Special needs [{record.special_needs}]: ",
         allow_blank=True,
-        default=record["special_needs"]
+        default=record.special_needs
     )
     updated["large_propane"] = ask_yes_no(
-        f"Large propane tank? [{yesno(record['large_propane'])}]",
+        f"Large propane tank? [{yesno(record.large_propane)}]",
         allow_blank=True,
-        default=record["large_propane"]
+        default=record.large_propane
     )
     updated["natural_gas"] = ask_yes_no(
-        f"Natural gas connection? [{yesno(record['natural_gas'])}]",
+        f"Natural gas connection? [{yesno(record.natural_gas)}]",
         allow_blank=True,
-        default=record["natural_gas"]
+        default=record.natural_gas
     )
     updated["address"] = ask_text(
-        f"Address [{record['address']}]: ",
+        f"Address [{record.address}]: ",
         allow_blank=True,
-        default=record["address"]
+        default=record.address
     )
 
     # Optional contact info
     updated["phone"] = ask_phone(
-        f"Phone [{record['phone']}]: ",
+        f"Phone [{record.phone}]: ",
         allow_blank=True,
-        default=record["phone"]
+        default=record.phone
     )
     updated["email"] = ask_email(
-        f"Email [{record['email']}]: ",
+        f"Email [{record.email}]: ",
         allow_blank=True,
-        default=record["email"]
+        default=record.email
     )
 
     # Optional yes/no fields
@@ -287,7 +500,7 @@ def edit_record(record_id):
         "wants_newsletter",
         "allow_non_disaster_contact",
     ]:
-        old_value = record[field]
+        old_value = getattr(record, field)
         updated[field] = ask_yes_no(
             f"{field.replace('_', ' ').title()} [{yesno(old_value)}]: ",
             allow_blank=True,
@@ -295,7 +508,8 @@ def edit_record(record_id):
         )
 
     # Save final updates
-    update_household(record_id, updated)
-
-    print("\nRecord updated successfully.")
+    if update_household(record_id, updated):
+        print("\nRecord updated successfully.")
+    else:
+        print("\nNo changes to save.")
     press_enter_to_continue()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Shared fixtures for the CERT app tests.
+
+Every test gets a fresh database in a temporary directory, which is
+also the working directory, so nothing is written next to the real
+cert_records.db or into output/.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import init_db, close_db, get_connection  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+# Household data columns in table order (no id or timestamps)
+FIELDS = (
+    "adults", "children", "has_pets", "has_dogs", "has_critical_meds",
+    "meds_need_fridge", "special_needs", "large_propane", "natural_gas",
+    "address", "phone", "email", "has_med_training", "know_neighbors",
+    "has_neighbor_key", "wants_newsletter", "allow_non_disaster_contact",
+)
+
+# Timestamp far enough in the past that no test runs in the same second
+PAST = "2020-01-01T00:00:00"
+
+STREETS = ("Main St", "Oak Ave", "Pine Rd", "Maple Blvd", "Cedar Ln")
+CITIES = (("Phoenix", "85001"), ("Mesa", "85212"), ("Tempe", "85281"))
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    init_db(str(tmp_path / "test.db"))
+    migrate()
+    yield get_connection()
+    close_db()
+
+
+def household(i):
+    """
+    Deterministic household number i as a dict of FIELDS. Addresses and
+    phone numbers are unique per i; every third household has no phone.
+    """
+    city, zip_code = CITIES[i % len(CITIES)]
+    has_pets = i % 2
+    critical_meds = int(i % 5 == 0)
+    return {
+        "adults": 1 + i % 4,
+        "children": i % 3,
+        "has_pets": has_pets,
+        "has_dogs": (i // 2) % 2 if has_pets else None,
+        "has_critical_meds": critical_meds,
+        "meds_need_fridge": (i // 5) % 2 if critical_meds else None,
+        "special_needs": "wheelchair user" if i % 7 == 0 else "no",
+        "large_propane": int(i % 6 == 0),
+        "natural_gas": (i + 1) % 2,
+        "address": f"{i + 1} {STREETS[i % len(STREETS)]}, {city}, AZ {zip_code}",
+        "phone": None if i % 3 == 2 else f"480{i:07d}",
+        "email": f"household{i + 1}@example.com",
+        "has_med_training": i % 2,
+        "know_neighbors": (i + 1) % 2,
+        "has_neighbor_key": int(i % 4 == 0),
+        "wants_newsletter": i % 2,
+        "allow_non_disaster_contact": (i // 3) % 2,
+    }
+
+
+def household_rows(count, start=0):
+    """
+    count households (numbered from start) as value tuples in FIELDS order.
+    """
+    return [tuple(household(i)[f] for f in FIELDS) for i in range(start, start + count)]
+
+
+def backdate(conn, when=PAST):
+    """
+    Stamps every household (and its journal entries) with an old time.
+    """
+    with conn:
+        conn.execute("UPDATE households SET updated_at = ?, created_at = ?;", (when, when))
+        conn.execute("UPDATE household_journal SET changed_at = ?;", (when,))
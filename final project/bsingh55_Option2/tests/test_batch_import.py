@@ -0,0 +1,55 @@
+"""
+Parallel import of many CSV files.
+"""
+
+import csv
+
+from db import get_all_households
+from io_csv import batch_import
+from conftest import FIELDS, household_rows
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for row in rows:
+            writer.writerow("" if v is None else v for v in row)
+
+
+def addresses():
+    return [h[10] for h in get_all_households()]
+
+
+def test_files_are_written_in_path_order(database, tmp_path):
+    folder = tmp_path / "rosters"
+    folder.mkdir()
+    # The largest file sorts first, so it finishes parsing last
+    write_csv(folder / "a.csv", household_rows(300))
+    write_csv(folder / "b.csv", household_rows(3, start=300))
+    write_csv(folder / "c.csv", household_rows(2, start=303))
+
+    summary = batch_import(str(folder), batch_size=7, workers=3)
+
+    assert summary["imported"] == 305
+    assert [r["imported"] for r in summary["files"]] == [300, 3, 2]
+    assert addresses() == [row[9] for row in household_rows(305)]
+
+
+def test_file_failing_part_way_is_rolled_back(database, tmp_path):
+    folder = tmp_path / "rosters"
+    folder.mkdir()
+    write_csv(folder / "a.csv", household_rows(2))
+    write_csv(folder / "b.csv", household_rows(400, start=2))
+    with open(folder / "b.csv", "ab") as f:
+        f.write(b"1,0,0,,0,,no,0,0,\xff bad bytes,,,,,,,\n")
+    write_csv(folder / "c.csv", household_rows(2, start=402))
+
+    summary = batch_import(str(folder / "*.csv"), batch_size=5, workers=2)
+
+    bad = summary["files"][1]
+    assert "utf-8" in bad["error"]
+    assert bad["imported"] == 0
+    assert summary["imported"] == 4
+    assert addresses() == [row[9] for row in household_rows(2)] + \
+        [row[9] for row in household_rows(2, start=402)]
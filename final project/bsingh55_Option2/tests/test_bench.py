@@ -0,0 +1,59 @@
+"""
+The benchmark harness in bench.py.
+"""
+
+import main
+from bench import (
+    BENCH_OPERATIONS, compare_results, generate_households, load_results,
+    run_benchmark, save_results, write_dataset
+)
+from io_csv import bulk_import
+
+
+def test_datasets_are_deterministic_and_import_cleanly(database, tmp_path):
+    assert list(generate_households(50, seed=7)) == list(generate_households(50, seed=7))
+    assert list(generate_households(50, seed=7)) != list(generate_households(50, seed=8))
+
+    path = str(tmp_path / "dataset.csv")
+    write_dataset(path, 200)
+    summary = bulk_import(path, reject_path=str(tmp_path / "rejects.csv"))
+    assert (summary["imported"], summary["failed"]) == (200, 0)
+
+
+def test_run_times_every_operation(tmp_path):
+    report = run_benchmark(rows=300, inserts=20, lookups=50)
+
+    assert report["meta"]["rows"] == 300
+    assert set(report["results"]) == set(BENCH_OPERATIONS)
+    assert report["results"]["export"]["count"] == 320
+    assert report["results"]["listing"]["count"] == 320
+    assert report["results"]["lookup"]["count"] == 50
+
+    path = str(tmp_path / "out" / "run.json")
+    save_results(report, path)
+    assert load_results(path) == report
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"results": {"insert": {"per_sec": 1000.0}, "lookup": {"per_sec": 1000.0},
+                            "export": {"per_sec": 0.0}}}
+    report = {"results": {"insert": {"per_sec": 850.0}, "lookup": {"per_sec": 700.0},
+                          "export": {"per_sec": 10.0}}}
+
+    rows, regressions = compare_results(report, baseline, tolerance=0.2)
+
+    assert [(op, round(change, 2)) for op, _, _, change in rows] == \
+        [("insert", -0.15), ("lookup", -0.3)]
+    assert regressions == ["lookup"]
+
+
+def test_cli_exits_non_zero_on_regression(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    baseline = {"results": {op: {"per_sec": 1e12} for op in BENCH_OPERATIONS}}
+    save_results(baseline, "baseline.json")
+
+    argv = ["bench", "--rows", "100", "--inserts", "5", "--lookups", "5"]
+    assert main.main(argv + ["--json", "run.json"]) == 0
+    assert main.main(argv + ["--baseline", "run.json", "--tolerance", "1"]) == 0
+    assert main.main(argv + ["--baseline", "baseline.json"]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+"""
+Bulk updates: update_households_bulk(), bulk_edit() and the CLI.
+"""
+
+import pytest
+
+import main
+from db import (
+    init_db, close_db, get_household_by_id, get_household_stats, insert_households_bulk,
+    rebuild_household_stats, update_households_bulk
+)
+from io_csv import bulk_edit
+from migrations import migrate
+from conftest import PAST, backdate, household, household_rows
+
+
+def moved_ids(conn):
+    return [r[0] for r in conn.execute(
+        "SELECT id FROM households WHERE updated_at <> ? ORDER BY id;", (PAST,))]
+
+
+def test_only_real_changes_are_written(database):
+    insert_households_bulk([household_rows(6)])
+    backdate(database)
+
+    changed = update_households_bulk([
+        (1, {"has_neighbor_key": 1}),                     # already 1
+        (2, {"has_neighbor_key": 1}),
+        (3, {"adults": household(2)["adults"], "children": 4}),
+        (3, {"children": household(2)["children"]}),      # later change wins: no-op
+        (99, {"adults": 2}),                              # unknown id
+    ])
+
+    assert changed == 1
+    assert moved_ids(database) == [2]
+    assert get_household_by_id(2).has_neighbor_key == 1
+    assert get_household_stats() == rebuild_household_stats()
+
+
+def test_unknown_column_is_rejected(database):
+    with pytest.raises(ValueError):
+        update_households_bulk([(1, {"created_at": PAST})])
+
+
+def test_csv_edit_with_blanks_and_rejects(database, tmp_path):
+    insert_households_bulk([household_rows(4)])
+    path = tmp_path / "changes.csv"
+    path.write_text(
+        "id,adults,email,created_at\n"
+        "1,5,,2001-01-01\n"          # blank email keeps the stored value
+        "2,,new@example.com,\n"
+        "x,1,,\n"                    # bad id
+        "3,two,,\n",                 # bad value
+        encoding="utf-8"
+    )
+
+    summary = bulk_edit(str(path), reject_path=str(tmp_path / "rejects.csv"))
+
+    assert (summary["rows"], summary["changed"], summary["failed"]) == (2, 2, 2)
+    first, second = get_household_by_id(1), get_household_by_id(2)
+    assert (first.adults, first.email) == (5, household(0)["email"])
+    assert first.created_at != "2001-01-01"
+    assert second.email == "new@example.com"
+
+
+def test_cli_sets_fields_on_ids(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    init_db("cli.db")
+    migrate()
+    insert_households_bulk([household_rows(3)])
+    close_db()
+
+    argv = ["--db", "cli.db", "bulk-edit", "--ids", "1,2,3", "--set", "large_propane=1"]
+    assert main.main(argv) == 0
+    assert "Records changed: 2" in capsys.readouterr().out    # household 1 already had one
+
+    init_db("cli.db")
+    try:
+        assert [get_household_by_id(i).large_propane for i in (1, 2, 3)] == [1, 1, 1]
+    finally:
+        close_db()
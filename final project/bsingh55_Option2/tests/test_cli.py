@@ -0,0 +1,62 @@
+"""
+Non-interactive command-line interface.
+"""
+
+import csv
+import io
+
+import pytest
+
+import main
+from conftest import FIELDS, household, household_rows
+
+
+@pytest.fixture
+def roster(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "roster.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for row in household_rows(10):
+            writer.writerow("" if v is None else v for v in row)
+    return str(path)
+
+
+def cli(*argv):
+    return main.main(["--db", "cli.db", *argv])
+
+
+def test_import_search_stats_export(roster, tmp_path, capsys):
+    assert cli("import", roster, "--batch-size", "3") == 0
+    assert "Successfully imported: 10" in capsys.readouterr().out
+
+    assert cli("search", "--critical-meds", "yes") == 0
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert [r[0] for r in rows[1:]] == ["1", "6"]
+
+    assert cli("stats") == 0
+    stats = dict(line.rsplit(None, 1) for line in capsys.readouterr().out.splitlines())
+    assert stats["Households"] == "10"
+    assert stats["Children"] == str(sum(household(i)["children"] for i in range(10)))
+
+    out = tmp_path / "ids.csv"
+    assert cli("export", "-o", str(out), "--columns", "id,email") == 0
+    with open(out, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f))[1] == ["1", household(0)["email"]]
+
+
+def test_errors_return_non_zero(roster, capsys):
+    assert cli("import", "missing.csv") == 1
+    assert cli("export", "--columns", "id,shoe_size") == 1
+    with pytest.raises(SystemExit):
+        cli("search", "--large-propane", "maybe")
+
+
+def test_bench_uses_a_scratch_database(roster, tmp_path, capsys):
+    assert cli("bench", roster, "--lookups", "5") == 0
+
+    out = capsys.readouterr().out
+    for step in ("import:", "export:", "lookup:", "listing:"):
+        assert step in out
+    assert not (tmp_path / "cli.db").exists()
@@ -0,0 +1,64 @@
+"""
+Typed Parquet / Arrow IPC export and import.
+"""
+
+import csv
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from db import init_db, close_db, get_all_households, insert_households_bulk  # noqa: E402
+from io_csv import columnar_export, columnar_import  # noqa: E402
+from migrations import migrate  # noqa: E402
+from conftest import FIELDS, household_rows  # noqa: E402
+
+
+@pytest.mark.parametrize("name", ["out.parquet", "out.arrow"])
+def test_round_trip_keeps_every_field(database, tmp_path, name):
+    insert_households_bulk([household_rows(9)])
+    before = [tuple(h[1:18]) for h in get_all_households()]
+    path = str(tmp_path / name)
+
+    assert columnar_export(path) == 9
+    close_db()
+    init_db(str(tmp_path / "copy.db"))
+    migrate()
+    result = columnar_import(path, reject_path=str(tmp_path / "rejects.csv"))
+
+    assert (result["imported"], result["failed"]) == (9, 0)
+    assert [tuple(h[1:18]) for h in get_all_households()] == before
+
+
+def test_export_uses_typed_columns(database, tmp_path):
+    insert_households_bulk([household_rows(3)])
+    path = str(tmp_path / "out.parquet")
+    columnar_export(path)
+
+    schema = pq.read_schema(path)
+    assert schema.field("adults").type == pa.int32()
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("has_pets").type == pa.bool_()
+    assert pa.types.is_timestamp(schema.field("created_at").type)
+    fridge = pq.read_table(path).column("meds_need_fridge").to_pylist()
+    assert fridge == [row[FIELDS.index("meds_need_fridge")] for row in household_rows(3)]
+    assert None in fridge       # not answered stays distinct from "no"
+
+
+def test_flags_outside_zero_and_one_are_rejected(database, tmp_path):
+    table = pa.table({name: list(column) for name, column in zip(FIELDS, zip(*household_rows(4)))})
+    flags = pa.array([0, 1, 2, -1], pa.int64())
+    table = table.set_column(FIELDS.index("large_propane"), "large_propane", flags)
+    path = str(tmp_path / "in.parquet")
+    pq.write_table(table, path)
+    reject_path = str(tmp_path / "rejects.csv")
+
+    result = columnar_import(path, reject_path=reject_path)
+
+    assert (result["imported"], result["failed"]) == (2, 2)
+    assert [h.large_propane for h in get_all_households()] == [0, 1]
+    with open(reject_path, newline="", encoding="utf-8") as f:
+        rejected = list(csv.DictReader(f))
+    assert [row["line"] for row in rejected] == ["3", "4"]
+    assert "must be 0 or 1" in rejected[0]["reason"]
@@ -0,0 +1,66 @@
+"""
+The pooled, WAL-tuned connection manager.
+"""
+
+import threading
+import time
+
+import db
+from db import (
+    BUSY_TIMEOUT_MS, get_connection, close_thread_connection, insert_household,
+    get_household_by_id, set_export_watermark
+)
+from conftest import household
+
+
+def test_one_connection_per_thread(database):
+    assert get_connection() is get_connection()
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(get_connection()))
+    worker.start()
+    worker.join()
+    assert other[0] is not database
+
+
+def test_connections_are_tuned(database):
+    assert database.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+    assert database.execute("PRAGMA synchronous;").fetchone()[0] == 1   # NORMAL
+
+
+def test_writes_are_visible_to_other_threads(database):
+    insert_household(household(0))
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(get_household_by_id(1)))
+    worker.start()
+    worker.join()
+    assert seen[0][10] == household(0)["address"]
+
+
+def test_close_db_closes_every_connection(database):
+    db.close_db()
+    with_new = get_connection()          # reopens a default manager lazily
+    assert with_new is not database
+    db.close_db()
+
+
+def test_pooled_connections_wait_for_the_write_lock(database):
+    assert database.execute("PRAGMA busy_timeout;").fetchone()[0] == BUSY_TIMEOUT_MS
+
+    locked = threading.Event()
+
+    def hold_write_lock():
+        conn = get_connection()
+        with conn:
+            conn.execute("INSERT INTO export_watermarks (name, change_seq, exported_at) "
+                         "VALUES ('job', 0, 'x');")
+            locked.set()
+            time.sleep(0.5)
+        close_thread_connection()
+
+    worker = threading.Thread(target=hold_write_lock)
+    worker.start()
+    locked.wait()
+    set_export_watermark("menu", 1)     # waits for the lock, does not raise
+    worker.join()
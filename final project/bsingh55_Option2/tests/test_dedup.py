@@ -0,0 +1,86 @@
+"""
+Duplicate policies of db.insert_households_bulk().
+"""
+
+from db import insert_households_bulk, get_household_by_id, dedup_key
+from conftest import FIELDS, PAST, backdate, household_rows
+
+PHONE = FIELDS.index("phone")
+ADULTS = FIELDS.index("adults")
+HAS_DOGS = FIELDS.index("has_dogs")
+
+
+def with_value(row, position, value):
+    return row[:position] + (value,) + row[position + 1:]
+
+
+def test_skip_leaves_existing_households(database):
+    rows = household_rows(20)
+    assert insert_households_bulk([rows]) == {"inserted": 20, "duplicates": 0}
+
+    changed = [with_value(row, ADULTS, 9) for row in rows]
+    assert insert_households_bulk([changed]) == {"inserted": 0, "duplicates": 20}
+    assert get_household_by_id(1)[1 + ADULTS] == rows[0][ADULTS]
+
+
+def test_duplicates_inside_one_import(database):
+    rows = household_rows(5)
+    result = insert_households_bulk([rows + rows[:2]])
+    assert result == {"inserted": 5, "duplicates": 2}
+
+
+def test_merge_only_fills_empty_fields(database):
+    row = with_value(household_rows(1)[0], HAS_DOGS, None)
+    insert_households_bulk([[row]])
+
+    row = with_value(with_value(row, HAS_DOGS, 1), ADULTS, row[ADULTS] + 1)
+    insert_households_bulk([[row]], on_duplicate="merge")
+
+    household = get_household_by_id(1)
+    assert household[1 + HAS_DOGS] == 1
+    assert household[1 + ADULTS] == row[ADULTS] - 1
+
+
+def test_upsert_overwrites(database):
+    row = household_rows(1)[0]
+    insert_households_bulk([[row]])
+
+    insert_households_bulk([[with_value(row, ADULTS, row[ADULTS] + 1)]], on_duplicate="upsert")
+    assert get_household_by_id(1)[1 + ADULTS] == row[ADULTS] + 1
+
+
+def test_only_changed_households_are_rewritten(database):
+    rows = household_rows(10)
+    insert_households_bulk([rows])
+    backdate(database)
+
+    for policy in ("merge", "upsert"):
+        assert insert_households_bulk([rows], on_duplicate=policy)["duplicates"] == 10
+    stamps = {r[0] for r in database.execute("SELECT updated_at FROM households;")}
+    assert stamps == {PAST}
+
+    rows[3] = with_value(rows[3], ADULTS, rows[3][ADULTS] + 1)
+    insert_households_bulk([rows], on_duplicate="upsert")
+    moved = [r[0] for r in database.execute(
+        "SELECT id FROM households WHERE updated_at <> ?;", (PAST,))]
+    assert moved == [4]
+
+
+def test_upsert_keeps_dedup_keys_current(database):
+    rows = household_rows(10)
+    insert_households_bulk([rows])
+
+    # Same household, phone written differently (same last 10 digits)
+    row = next(r for r in rows if r[PHONE])
+    phone = row[PHONE]
+    changed = with_value(row, PHONE, "+1 (" + phone[:3] + ") " + phone[3:])
+    assert insert_households_bulk([[changed]], on_duplicate="upsert")["duplicates"] == 1
+
+    for hid, address, phone, email in database.execute(
+            "SELECT id, address, phone, email FROM households;"):
+        found = database.execute(
+            "SELECT household_id FROM household_keys WHERE dedup_key = ?;",
+            (dedup_key(address, phone, email),)
+        ).fetchone()
+        assert found == (hid,)
+    assert database.execute("SELECT COUNT(*) FROM household_keys;").fetchone()[0] == 10
@@ -0,0 +1,50 @@
+"""
+Streaming CSV export with gzip and column projection.
+"""
+
+import csv
+import gzip
+
+import pytest
+
+from db import HOUSEHOLD_COLUMNS, insert_household
+from io_csv import stream_export
+from conftest import household
+
+
+@pytest.fixture
+def three_households(database):
+    for i in range(3):
+        insert_household(household(i))
+
+
+def test_full_export_round_trips(three_households, tmp_path):
+    path = tmp_path / "out.csv"
+
+    assert stream_export(str(path), chunk_size=2) == 3
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(HOUSEHOLD_COLUMNS)
+    assert [r[0] for r in rows[1:]] == ["1", "2", "3"]
+
+
+def test_gzip_export_with_projection(three_households, tmp_path):
+    path = tmp_path / "out.csv.gz"
+
+    count = stream_export(str(path), columns=["id", "address"], compress=True)
+
+    assert count == 3
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["id", "address"]] + [
+        [str(i + 1), household(i)["address"]] for i in range(3)
+    ]
+
+
+def test_unknown_column_creates_no_file(three_households, tmp_path):
+    path = tmp_path / "out.csv"
+
+    with pytest.raises(ValueError):
+        stream_export(str(path), columns=["id", "shoe_size"])
+    assert not path.exists()
@@ -0,0 +1,82 @@
+"""
+Gazetteer coordinates and the household_geo R*Tree.
+"""
+
+import pytest
+
+from db import (
+    distance_km, get_households_in_box, get_households_near,
+    insert_households_bulk, load_gazetteer, update_household
+)
+from io_csv import import_gazetteer
+from conftest import household, household_rows
+
+CENTER = (33.45, -112.07)
+
+
+@pytest.fixture
+def located(database):
+    """
+    Twenty households on a grid of points around CENTER (0.01 degrees
+    apart, about 1.1 km north-south).
+    """
+    insert_households_bulk([household_rows(20)])
+    points = {i + 1: (CENTER[0] + 0.01 * (i % 5), CENTER[1] + 0.01 * (i // 5))
+              for i in range(20)}
+    # Gazetteer addresses are written differently from the records
+    result = load_gazetteer(
+        (household(hid - 1)["address"].upper().replace(",", ""), lat, lon)
+        for hid, (lat, lon) in points.items()
+    )
+    assert result == {"entries": 20, "located": 20}
+    return points
+
+
+def test_geo_index_is_an_rtree(database):
+    sql = database.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'household_geo';").fetchone()[0]
+    assert "rtree" in sql.lower()
+
+
+def test_near_matches_a_brute_force_scan(located):
+    radius = 2.5
+    expected = sorted(
+        (distance_km(*CENTER, lat, lon), hid) for hid, (lat, lon) in located.items()
+        if distance_km(*CENTER, lat, lon) <= radius
+    )
+
+    found = get_households_near(*CENTER, radius)
+
+    assert [(round(d, 9), h.id) for d, h in found] == [(round(d, 9), hid) for d, hid in expected]
+    assert [h.id for _, h in get_households_near(*CENTER, radius, limit=3)] == \
+        [hid for _, hid in expected[:3]]
+
+
+def test_box_query(located):
+    rows = get_households_in_box(CENTER[0] - 0.001, CENTER[1] - 0.001,
+                                 CENTER[0] + 0.011, CENTER[1] + 0.011)
+    assert [h.id for _, _, h in rows] == [1, 2, 6, 7]
+
+
+def test_coordinates_follow_address_edits(located):
+    update_household(1, {"address": "Somewhere Not In The Gazetteer"})
+    assert 1 not in [h.id for _, h in get_households_near(*CENTER, 1)]
+
+    update_household(1, {"address": household(0)["address"]})
+    assert get_households_near(*CENTER, 0.1)[0][1].id == 1
+
+
+def test_import_gazetteer_skips_bad_rows(database, tmp_path):
+    insert_households_bulk([household_rows(2)])
+    path = tmp_path / "gazetteer.csv"
+    path.write_text(
+        "address,latitude,longitude\n"
+        f"\"{household(0)['address']}\",33.1,-112.1\n"
+        "\"Nowhere\",north,-112.0\n",
+        encoding="utf-8"
+    )
+
+    result = import_gazetteer(str(path))
+
+    assert (result["entries"], result["located"], result["failed"]) == (1, 1, 1)
+    assert get_households_near(33.1, -112.1, 0.5)[0][1].id == 1
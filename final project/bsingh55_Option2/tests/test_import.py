@@ -0,0 +1,57 @@
+"""
+Streaming bulk import of household CSV files.
+"""
+
+import csv
+
+import pytest
+
+from db import get_all_households
+from io_csv import bulk_import, CSVFormatError
+from conftest import FIELDS, household_rows
+
+
+def write_csv(path, rows, headers=FIELDS):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow("" if v is None else v for v in row)
+    return str(path)
+
+
+def test_imports_every_row_across_batches(database, tmp_path):
+    path = write_csv(tmp_path / "in.csv", household_rows(23))
+
+    result = bulk_import(path, batch_size=5, reject_path=str(tmp_path / "rejects.csv"))
+
+    assert result["imported"] == 23
+    assert result["failed"] == 0
+    assert result["reject_file"] is None
+    households = get_all_households()
+    assert [h[10] for h in households] == [row[9] for row in household_rows(23)]
+
+
+def test_bad_rows_go_to_the_reject_file(database, tmp_path):
+    rows = [list(row) for row in household_rows(4)]
+    rows[2][0] = "two"                      # adults is not a number
+    path = write_csv(tmp_path / "in.csv", rows)
+    reject_path = str(tmp_path / "rejects.csv")
+
+    result = bulk_import(path, batch_size=2, reject_path=reject_path)
+
+    assert (result["imported"], result["failed"]) == (3, 1)
+    assert result["reject_file"] == reject_path
+    with open(reject_path, newline="", encoding="utf-8") as f:
+        header, reject = list(csv.reader(f))
+    assert header[:2] == ["line", "reason"]
+    assert reject[0] == "4"                 # header is line 1
+    assert reject[1].startswith("adults")
+
+
+def test_missing_headers_are_reported(database, tmp_path):
+    path = write_csv(tmp_path / "in.csv", [], headers=FIELDS[:-1])
+
+    with pytest.raises(CSVFormatError) as err:
+        bulk_import(path)
+    assert err.value.missing == ["allow_non_disaster_contact"]
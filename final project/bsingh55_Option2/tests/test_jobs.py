@@ -0,0 +1,70 @@
+"""
+Background import/export jobs and their progress reporting.
+"""
+
+import threading
+
+from db import get_all_households
+from io_csv import bulk_import, start_import_job, start_export_job
+from jobs import Progress, format_progress, start_job, writer_busy
+from conftest import household_rows
+from test_import import write_csv
+
+
+def test_import_job_reports_its_summary(database, tmp_path):
+    path = write_csv(tmp_path / "in.csv", household_rows(12))
+
+    job = start_import_job(path, batch_size=5)
+    job.join()
+
+    assert job.status == "done"
+    assert job.result["imported"] == 12
+    assert job.summary.startswith("imported 12, duplicates 0, failed 0")
+    assert job.progress.snapshot()["rows"] == 12
+    assert len(get_all_households()) == 12
+
+
+def test_cancelled_import_is_rolled_back(database, tmp_path):
+    path = write_csv(tmp_path / "in.csv", household_rows(20))
+    first_batch, resume = threading.Event(), threading.Event()
+
+    def work(report):
+        def pause_after_first_batch(rows, total=None):
+            first_batch.set()
+            resume.wait()
+            report(rows, total)
+        return bulk_import(path, batch_size=5, progress=pause_after_first_batch)
+
+    job = start_job("import", path, work, str)
+    first_batch.wait()
+    assert writer_busy()
+    job.cancel()
+    resume.set()
+    job.join()
+
+    assert job.status == "cancelled"
+    assert not writer_busy()
+    assert get_all_households() == []
+
+
+def test_export_job_writes_the_file(database, tmp_path):
+    bulk_import(write_csv(tmp_path / "in.csv", household_rows(7)))
+
+    job = start_export_job(str(tmp_path / "out.csv"))
+    job.join()
+
+    assert job.status == "done"
+    assert job.result["count"] == 7
+    with open(tmp_path / "out.csv", encoding="utf-8") as f:
+        assert len(f.readlines()) == 8
+
+
+def test_progress_estimates_rate_and_eta():
+    progress = Progress()
+    progress.update(50, total=200)
+    snapshot = progress.snapshot()
+
+    assert (snapshot["rows"], snapshot["total"]) == (50, 200)
+    assert snapshot["rate"] > 0 and snapshot["eta"] > 0
+    assert format_progress({"rows": 45000, "total": 120000, "rate": 11250.0, "eta": 7.0}) == \
+        "45,000 / ~120,000 rows | 11,250 rows/s | ETA 0:00:07"
@@ -0,0 +1,100 @@
+"""
+Change journal, as-of reconstruction and compaction.
+"""
+
+import pytest
+
+import main
+from db import (
+    init_db, close_db, compact_journal, get_household_as_of, get_household_by_id,
+    get_household_history, get_journal_start, insert_households_bulk,
+    update_household, update_households_bulk
+)
+from conftest import PAST, household_rows
+
+
+def set_times(conn, times):
+    """
+    Gives household 1's journal entries (oldest first) the given times
+    and opens the history window before them.
+    """
+    with conn:
+        seqs = [row[0] for row in conn.execute(
+            "SELECT seq FROM household_journal WHERE household_id = 1 ORDER BY seq;")]
+        for seq, when in zip(seqs, times):
+            conn.execute("UPDATE household_journal SET changed_at = ? WHERE seq = ?;",
+                         (when, seq))
+        conn.execute("UPDATE journal_state SET history_from = '2019-01-01T00:00:00';")
+
+
+def test_as_of_undoes_later_changes(database):
+    row = household_rows(1)[0]
+    insert_households_bulk([[row]])
+    update_households_bulk([(1, {"adults": 11})])
+    update_household(1, {"adults": 12, "children": 4})
+    set_times(database, ["2020-01-01T00:00:00", "2021-01-01T00:00:00", "2022-01-01T00:00:00"])
+
+    history = get_household_history(1)
+    assert [op for _, op, _ in history] == ["insert", "update", "update"]
+    assert history[2][2]["adults"] == [11, 12]
+
+    assert get_household_as_of(1, "2019-06-01") is None
+    assert get_household_as_of(1, "2020-06-01").adults == row[0]
+    assert get_household_as_of(1, "2021-06-01").adults == 11
+    latest = get_household_as_of(1, "2022-06-01")
+    assert (latest.adults, latest.children) == (12, 4)
+
+
+def test_as_of_before_the_journal_is_refused(database):
+    insert_households_bulk([household_rows(1)])
+    with pytest.raises(ValueError):
+        get_household_as_of(1, "2000-01-01")
+
+
+def test_unchanged_edits_write_nothing(database):
+    row = household_rows(1)[0]
+    insert_households_bulk([[row]])
+    with database:
+        database.execute("UPDATE households SET updated_at = ?;", (PAST,))
+
+    assert update_households_bulk([(1, {"adults": row[0]})]) == 0
+    data = {"adults": row[0], "children": row[1]}
+    assert update_household(1, data) is False
+
+    assert data == {"adults": row[0], "children": row[1]}     # caller's dict untouched
+    assert len(get_household_history(1)) == 1
+    assert get_household_by_id(1).updated_at == PAST
+
+    assert update_household(1, {"children": row[1] + 1}) is True
+    assert len(get_household_history(1)) == 2
+
+
+def test_compaction_folds_old_entries(database):
+    insert_households_bulk([household_rows(1)])
+    for adults in (5, 6, 7):
+        update_household(1, {"adults": adults})
+    set_times(database, ["2020-01-01T00:00:00", "2020-02-01T00:00:00",
+                         "2020-03-01T00:00:00", "2020-04-01T00:00:00"])
+
+    result = compact_journal("2020-03-15T00:00:00")
+
+    assert (result["households"], result["removed"]) == (1, 1)
+    assert result["history_from"] == "2020-03-15T00:00:00"
+    assert get_household_history(1)[1][2]["adults"] == [household_rows(1)[0][0], 6]
+    assert get_household_as_of(1, "2020-03-20").adults == 6
+
+    # An earlier cutoff never moves the start of exact history back
+    assert compact_journal("2019-01-01T00:00:00")["history_from"] == "2020-03-15T00:00:00"
+
+
+def test_cli_reports_the_stored_history_start(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert main.main(["--db", "cli.db", "compact-journal", "--older-than-days", "36500"]) == 0
+
+    out = capsys.readouterr().out
+    init_db("cli.db")
+    try:
+        start = get_journal_start()
+    finally:
+        close_db()
+    assert f"Exact history now starts at: {start}" in out
@@ -0,0 +1,80 @@
+"""
+Schema migrations (PRAGMA user_version).
+"""
+
+import pytest
+
+from db import (
+    init_db, close_db, get_connection, create_tables, insert_households_bulk,
+    get_household_stats, get_latest_change
+)
+from migrations import migrate, get_schema_version, LATEST_VERSION
+from models import DATA_FIELDS
+from conftest import household_rows
+
+
+@pytest.fixture
+def legacy_database(tmp_path, monkeypatch):
+    """
+    A version 0 database: only the households table, with rows, as
+    written before schema versioning existed.
+    """
+    monkeypatch.chdir(tmp_path)
+    init_db(str(tmp_path / "legacy.db"))
+    create_tables()
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            f"INSERT INTO households ({', '.join(DATA_FIELDS)}) "
+            f"VALUES ({', '.join('?' for _ in DATA_FIELDS)});",
+            household_rows(30)
+        )
+    yield conn
+    close_db()
+
+
+def test_fresh_database_is_at_latest_version(database):
+    assert get_schema_version() == LATEST_VERSION
+    assert migrate() == []
+
+
+def test_version_zero_database_is_upgraded(legacy_database):
+    assert get_schema_version() == 0
+
+    applied = migrate()
+    assert [version for version, _ in applied] == list(range(1, LATEST_VERSION + 1))
+    assert get_schema_version() == LATEST_VERSION
+
+    conn = legacy_database
+    assert conn.execute("SELECT COUNT(*) FROM household_keys;").fetchone()[0] == 30
+    assert conn.execute("SELECT COUNT(*) FROM household_risk;").fetchone()[0] == 30
+    assert conn.execute("SELECT COUNT(*) FROM households_fts;").fetchone()[0] == 30
+    assert get_household_stats()["households"] == 30
+    assert get_latest_change() == 30
+
+
+def test_interrupted_migration_reruns(legacy_database):
+    migrate(target=5)
+    assert get_schema_version() == 5
+
+    # Rerunning a finished step must not duplicate its backfill
+    with legacy_database:
+        legacy_database.execute("PRAGMA user_version = 3;")
+    migrate()
+
+    assert get_schema_version() == LATEST_VERSION
+    assert legacy_database.execute("SELECT COUNT(*) FROM household_changes;").fetchone()[0] == 30
+    assert get_household_stats()["households"] == 30
+
+
+def test_upgraded_database_detects_existing_duplicates(legacy_database):
+    migrate()
+    result = insert_households_bulk([household_rows(30)])
+    assert result == {"inserted": 0, "duplicates": 30}
+
+
+def test_newer_database_is_refused(database):
+    with database:
+        database.execute(f"PRAGMA user_version = {LATEST_VERSION + 1};")
+    with pytest.raises(RuntimeError):
+        migrate()
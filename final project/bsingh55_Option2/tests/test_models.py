@@ -0,0 +1,33 @@
+"""
+The shared Household record and its row factory.
+"""
+
+from db import (
+    get_all_households, get_household_by_id, get_households_page,
+    get_top_risk_households, insert_household, search_households
+)
+from models import Household, HOUSEHOLD_COLUMNS, DATA_FIELDS
+from conftest import FIELDS, household
+
+
+def test_columns_match_the_table(database):
+    table = [row[1] for row in database.execute("PRAGMA table_info(households);")]
+    assert list(HOUSEHOLD_COLUMNS) == table
+    assert DATA_FIELDS == FIELDS
+
+
+def test_queries_return_households_by_name(database):
+    for i in range(3):
+        insert_household(household(i))
+
+    record = get_household_by_id(2)
+    assert isinstance(record, Household)
+    assert record.id == 2
+    assert record.address == household(1)["address"]
+    assert record._asdict()["email"] == household(1)["email"]
+
+    for rows in (get_all_households(), get_households_page(limit=3),
+                 search_households(address="AZ"),
+                 [row for _, row in get_top_risk_households()]):
+        assert all(isinstance(row, Household) for row in rows)
+        assert sorted(row.id for row in rows) == [1, 2, 3]
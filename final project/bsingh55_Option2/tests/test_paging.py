@@ -0,0 +1,37 @@
+"""
+Keyset pagination over the households table.
+"""
+
+from db import get_connection, get_households_page, insert_household
+from conftest import household
+
+
+def ids(rows):
+    return [row[0] for row in rows]
+
+
+def test_pages_forward_and_back(database):
+    for i in range(12):
+        insert_household(household(i))
+
+    first = get_households_page(limit=5)
+    second = get_households_page(after_id=first[-1][0], limit=5)
+    last = get_households_page(after_id=second[-1][0], limit=5)
+
+    assert ids(first) == [1, 2, 3, 4, 5]
+    assert ids(second) == [6, 7, 8, 9, 10]
+    assert ids(last) == [11, 12]
+    assert get_households_page(after_id=12, limit=5) == []
+    assert ids(get_households_page(before_id=second[0][0], limit=5)) == ids(first)
+
+
+def test_pages_skip_deleted_ids(database):
+    for i in range(8):
+        insert_household(household(i))
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM households WHERE id IN (3, 4);")
+
+    assert ids(get_households_page(limit=3)) == [1, 2, 5]
+    assert ids(get_households_page(after_id=5, limit=3)) == [6, 7, 8]
+    assert ids(get_households_page(before_id=6, limit=3)) == [1, 2, 5]
@@ -0,0 +1,44 @@
+"""
+Precomputed risk scores and the top at-risk list.
+"""
+
+from db import (
+    get_top_risk_households, insert_household, insert_households_bulk,
+    update_household,
+)
+from conftest import household, household_rows
+
+
+def expected_score(data):
+    score = 0
+    if data["has_critical_meds"] == 1:
+        score += 40 if data["meds_need_fridge"] == 1 else 20
+    if data["special_needs"].strip().lower() not in ("", "no", "none"):
+        score += 30
+    if data["large_propane"] == 1:
+        score += 20
+    score += 5 * min(data["children"], 5)
+    if not data["has_neighbor_key"]:
+        score += 10
+    return score
+
+
+def test_top_list_matches_scores(database):
+    insert_households_bulk([household_rows(40)])
+
+    expected = sorted(((expected_score(household(i)), i + 1) for i in range(40)),
+                      key=lambda pair: (-pair[0], pair[1]))
+    top = get_top_risk_households(limit=10)
+
+    assert [(score, row[0]) for score, row in top] == expected[:10]
+
+
+def test_scores_follow_inserts_and_edits(database):
+    calm = household(1)
+    insert_household(calm)
+    assert get_top_risk_households()[0][0] == expected_score(calm)
+
+    urgent = dict(calm, has_critical_meds=1, meds_need_fridge=1, large_propane=1)
+    update_household(1, urgent)
+
+    assert get_top_risk_households()[0][0] == expected_score(urgent)
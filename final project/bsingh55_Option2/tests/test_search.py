@@ -0,0 +1,52 @@
+"""
+Household search and the Search menu option.
+"""
+
+import main
+from db import insert_household, search_households, update_household
+from conftest import household
+
+
+def ids(rows):
+    return [row[0] for row in rows]
+
+
+def test_filters_combine_with_and(database):
+    for i in range(30):
+        insert_household(household(i))
+
+    # Household i has id i + 1
+    assert ids(search_households(has_critical_meds=True)) == [i + 1 for i in range(0, 30, 5)]
+    assert ids(search_households(has_critical_meds=True, large_propane=True)) == [1]
+    assert ids(search_households(has_special_needs=True)) == [1, 8, 15, 22, 29]
+    assert ids(search_households(special_needs="WHEELCHAIR", natural_gas=False)) == [8, 22]
+
+
+def test_text_search_follows_edits(database):
+    for i in range(5):
+        insert_household(household(i))
+
+    assert ids(search_households(address="oak ave")) == [2]
+    assert ids(search_households(address="Oa")) == [2]          # short term, LIKE scan
+
+    data = household(1)
+    data["address"] = "9 Elm Ct, Mesa, AZ 85212"
+    update_household(2, data)
+    assert search_households(address="oak ave") == []
+    assert ids(search_households(address="elm ct")) == [2]
+
+
+def test_limit(database):
+    for i in range(10):
+        insert_household(household(i))
+
+    assert ids(search_households(address="AZ", limit=3)) == [1, 2, 3]
+
+
+def test_menu_quit_keeps_its_original_number(database, monkeypatch, capsys):
+    answers = iter(["5"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    main.main_menu()
+
+    assert "Goodbye!" in capsys.readouterr().out
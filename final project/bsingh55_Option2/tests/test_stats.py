@@ -0,0 +1,51 @@
+"""
+The cached readiness totals in household_stats.
+"""
+
+from db import (
+    get_household_stats, rebuild_household_stats, insert_household,
+    insert_households_bulk, update_household
+)
+from conftest import FIELDS, household, household_rows
+
+ADULTS = FIELDS.index("adults")
+HAS_DOGS = FIELDS.index("has_dogs")
+
+
+def assert_consistent():
+    cached = get_household_stats()
+    assert cached == rebuild_household_stats()
+    return cached
+
+
+def test_totals_follow_every_write_path(database):
+    insert_households_bulk([household_rows(30)], on_duplicate="skip")
+    stats = assert_consistent()
+    assert stats["households"] == 30
+    assert stats["children"] == sum(household(i)["children"] for i in range(30))
+
+    insert_household(household(30))
+    assert assert_consistent()["households"] == 31
+
+    update_household(1, {"adults": 9, "large_propane": 0, "special_needs": "no"})
+    assert_consistent()
+
+    rows = household_rows(10)
+    upserts = [row[:ADULTS] + (row[ADULTS] + 2,) + row[ADULTS + 1:] for row in rows]
+    insert_households_bulk([upserts], on_duplicate="upsert")
+    # The upsert also replaces household 1's edited adult count
+    assert assert_consistent()["adults"] == stats["adults"] + 20 + household(30)["adults"]
+
+    merges = [row[:HAS_DOGS] + (1,) + row[HAS_DOGS + 1:] for row in household_rows(10, start=10)]
+    insert_households_bulk([merges], on_duplicate="merge")
+    assert_consistent()
+
+
+def test_rebuild_repairs_outside_edits(database):
+    insert_households_bulk([household_rows(5)])
+    with database:
+        database.execute("DELETE FROM households WHERE id = 5;")
+
+    assert get_household_stats()["households"] == 5
+    assert rebuild_household_stats()["households"] == 4
+    assert get_household_stats()["households"] == 4
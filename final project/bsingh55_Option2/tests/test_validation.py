@@ -0,0 +1,74 @@
+"""
+The schema-driven validator shared by imports and interactive entry.
+"""
+
+import pytest
+
+from validation import (
+    ValidationError, ask_phone, validate_batch, validate_value
+)
+from conftest import FIELDS
+
+POSITIONS = {field: pos for pos, field in enumerate(FIELDS)}
+
+
+def raw(**cells):
+    row = {"adults": "2", "address": "1 Main St"}
+    row.update(cells)
+    return [row.get(field, "") for field in FIELDS]
+
+
+def test_valid_rows_are_converted():
+    values, errors = validate_batch(
+        [raw(), raw(children="3", has_dogs="1", phone="(480) 555-0101", email="a@b.co")],
+        POSITIONS, FIELDS
+    )
+
+    assert errors == {}
+    first = dict(zip(FIELDS, values[0]))
+    assert (first["adults"], first["children"], first["has_dogs"]) == (2, 0, None)
+    assert first["special_needs"] == "" and first["phone"] is None
+    second = dict(zip(FIELDS, values[1]))
+    assert (second["children"], second["has_dogs"]) == (3, 1)
+    assert second["phone"] == "(480) 555-0101"
+
+
+def test_every_failing_field_is_reported():
+    rows = [
+        raw(),
+        raw(adults="two", has_pets="2"),
+        raw(address=""),
+        raw(phone="555-0101", email="not-an-email"),
+        raw(children="1\n2"),                  # embedded newline
+    ]
+
+    values, errors = validate_batch(rows, POSITIONS, FIELDS)
+
+    assert len(values) == 1
+    assert set(errors[1]) == {"adults", "has_pets"}
+    assert errors[2] == {"address": "is required"}
+    assert set(errors[3]) == {"phone", "email"}
+    assert set(errors[4]) == {"children"}
+
+
+def test_short_rows_are_padded_with_blanks():
+    values, errors = validate_batch([["1", "0", "", "", "", "", "", "", "", "9 Elm"]],
+                                    POSITIONS, FIELDS)
+    assert errors == {}
+    assert dict(zip(FIELDS, values[0]))["email"] is None
+
+
+def test_validate_value():
+    assert validate_value("has_neighbor_key", " 1 ") == 1
+    assert validate_value("has_neighbor_key", "") is None
+    with pytest.raises(ValidationError) as err:
+        validate_value("adults", "-1")
+    assert set(err.value.errors) == {"adults"}
+
+
+def test_interactive_entry_uses_the_same_rules(monkeypatch, capsys):
+    answers = iter(["555-0101", "+1 480 555 0101"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    assert ask_phone("Phone: ") == "+1 480 555 0101"
+    assert "10–15 digits" in capsys.readouterr().out
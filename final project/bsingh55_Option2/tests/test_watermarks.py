@@ -0,0 +1,80 @@
+"""
+Incremental exports and their change-number watermarks.
+"""
+
+import csv
+
+from db import (
+    INSERT_SQL, backfill_change_numbers, create_watermark_table, get_export_watermark,
+    insert_households_bulk, update_household
+)
+from io_csv import incremental_export
+from conftest import PAST, backdate, household, household_rows
+
+
+def exported_ids(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [int(row["id"]) for row in csv.DictReader(f)]
+
+
+def test_second_run_without_changes_exports_nothing(database):
+    insert_households_bulk([household_rows(25)])
+
+    first = incremental_export("first.csv")
+    assert first["since"] is None
+    assert first["count"] == 25
+
+    second = incremental_export("second.csv")
+    assert second["since"] == first["watermark"]
+    assert second["count"] == 0
+    assert second["watermark"] == first["watermark"]
+
+
+def test_only_changed_rows_are_exported(database):
+    insert_households_bulk([household_rows(10)])
+    incremental_export("first.csv")
+
+    update_household(8, {"children": 5})
+    update_household(3, {"adults": 7})
+    result = incremental_export("changes.csv")
+
+    assert result["count"] == 2
+    assert exported_ids("changes.csv") == [8, 3]       # change order
+    assert get_export_watermark("county_eoc") == result["watermark"]
+
+
+def test_late_commit_with_an_old_timestamp_is_not_lost(database):
+    insert_households_bulk([household_rows(3)])
+    incremental_export("first.csv")
+
+    # A writer that stamped its row before the previous export ran but
+    # only committed afterwards
+    values = tuple(household(3).values()) + (PAST, PAST)
+    with database:
+        database.execute(INSERT_SQL, values)
+
+    result = incremental_export("late.csv")
+    assert result["count"] == 1
+    assert exported_ids("late.csv") == [4]
+
+
+def test_watermarks_are_kept_per_name(database):
+    insert_households_bulk([household_rows(3)])
+
+    assert incremental_export("a.csv", name="a")["count"] == 3
+    assert incremental_export("b.csv", name="b")["count"] == 3
+    assert incremental_export("a2.csv", name="a")["count"] == 0
+
+
+def test_existing_households_are_numbered_by_updated_at(database):
+    insert_households_bulk([household_rows(4)])
+    backdate(database)
+    with database:
+        database.execute("UPDATE households SET updated_at = '2021-01-01T00:00:00' WHERE id = 2;")
+        database.execute("DROP TABLE household_changes;")
+
+    create_watermark_table()
+    backfill_change_numbers(batch_size=10)
+
+    incremental_export("all.csv")
+    assert exported_ids("all.csv") == [1, 3, 4, 2]
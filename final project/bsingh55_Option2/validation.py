@@ -12,12 +12,24 @@ Purpose:
 
     Functions:
         • ask_int()      – Validated integer input with range support.
+        • ask_float()    – Validated decimal input with range support.
         • ask_yes_no()   – Yes/No prompts with optional defaults.
         • ask_text()     – Generic text input with optional blank.
         • ask_email()    – Basic email format validation.
         • ask_phone()    – Basic phone number validation (10–15 digits).
+        • ask_choice()   – Pick one option from a fixed list.
+
+    Schema-driven validation (shared by imports, bulk edits and the
+    interactive prompts):
+        • HOUSEHOLD_SCHEMA  – Value kind and blank handling per column.
+        • validate_batch()  – Validates whole batches column by column.
+        • validate_value()  – Validates one cell against its column.
+        • check_value()     – Error message (or None) for one value kind.
 """
 
+import math
+import re
+
 
 def ask_int(prompt, allow_blank=False, min_value=None, max_value=None, default=None):
     """
@@ -39,7 +51,7 @@ def ask_int(prompt, allow_blank=False, min_value=None, max_value=None, default=N
         if allow_blank and val == "":
             return default
 
-        if not val.isdigit():
+        if check_value("count", val) is not None:
             print("Please enter a valid number.")
             continue
 
@@ -56,6 +68,46 @@ def ask_int(prompt, allow_blank=False, min_value=None, max_value=None, default=N
         return num
 
 
+def ask_float(prompt, allow_blank=False, min_value=None, max_value=None, default=None):
+    """
+    Asks the user for a decimal number with validation.
+
+    Parameters:
+        prompt (str)        – The input prompt shown to the user.
+        allow_blank (bool)  – If True, user may press Enter to return default.
+        min_value (float)   – Minimum allowed value (optional).
+        max_value (float)   – Maximum allowed value (optional).
+        default (float)     – Returned when blank is allowed.
+
+    Returns:
+        float or None – A validated number or default value.
+    """
+    while True:
+        val = input(prompt).strip()
+
+        if allow_blank and val == "":
+            return default
+
+        try:
+            num = float(val)
+        except ValueError:
+            num = None
+
+        if num is None or not math.isfinite(num):
+            print("Please enter a valid number.")
+            continue
+
+        if min_value is not None and num < min_value:
+            print(f"Value must be at least {min_value}.")
+            continue
+
+        if max_value is not None and num > max_value:
+            print(f"Value must be no more than {max_value}.")
+            continue
+
+        return num
+
+
 def ask_yes_no(prompt, allow_blank=False, default=None):
     """
     Asks a yes/no question and returns True or False.
@@ -125,7 +177,7 @@ def ask_email(prompt, allow_blank=False, default=None):
         if allow_blank and val == "":
             return default
 
-        if "@" in val and "." in val:
+        if check_value("email", val) is None:
             return val
 
         print("Please enter a valid email address.")
@@ -149,9 +201,221 @@ def ask_phone(prompt, allow_blank=False, default=None):
         if allow_blank and val == "":
             return default
 
-        digits = "".join(ch for ch in val if ch.isdigit())
+        if check_value("phone", val) is None:
+            return val
+
+        print("Please enter a valid phone number (10–15 digits).")
+
+
+def ask_choice(prompt, choices, default=None):
+    """
+    Asks the user to pick one of a fixed set of options.
+
+    Parameters:
+        prompt (str)        – Displayed prompt.
+        choices (sequence)  – Allowed answers (compared case-insensitively).
+        default (str)       – Returned when the user presses Enter
+                              (blank is rejected when None).
+
+    Returns:
+        str
+    """
+    while True:
+        val = input(prompt).strip().lower()
+
+        if val == "" and default is not None:
+            return default
 
-        if 10 <= len(digits) <= 15:
+        if val in choices:
             return val
 
-        print("Please enter a valid phone number (10–15 digits).")
\ No newline at end of file
+        print("Please enter one of: " + ", ".join(choices) + ".")
+
+
+# -----------------------------------------------------------
+# SCHEMA-DRIVEN BATCH VALIDATION
+# -----------------------------------------------------------
+# Rules for each kind of value. "pattern" matches one stripped,
+# non-blank cell (None accepts any text) and never matches a newline,
+# so a whole column joined with newlines can be checked with a single
+# regex call. "convert" turns a valid cell into its stored value.
+VALUE_KINDS = {
+    "count": {"pattern": r"\d+", "convert": int,
+              "message": "must be a whole number"},
+    "flag": {"pattern": r"[01]", "convert": int,
+             "message": "must be 0 or 1"},
+    "text": {"pattern": None, "convert": None, "message": None},
+    "phone": {"pattern": r"(?:[^\d\n]*\d){10,15}[^\d\n]*", "convert": None,
+              "message": "must contain 10–15 digits"},
+    "email": {"pattern": r"[^@\s]+@[^@\s]+\.[^@\s]+", "convert": None,
+              "message": "must be a valid email address"},
+}
+
+# Precompile the per-cell and whole-column regexes once
+for _kind in VALUE_KINDS.values():
+    if _kind["pattern"] is None:
+        _kind["cell"] = _kind["column"] = None
+    else:
+        _kind["cell"] = re.compile(_kind["pattern"])
+        _kind["column"] = re.compile(rf"(?:{_kind['pattern']})?(?:\n(?:{_kind['pattern']})?)*")
+
+# Marks a column whose blank cells are rejected
+REQUIRED = object()
+
+# Value kind of each household column and what a blank cell becomes
+HOUSEHOLD_SCHEMA = {
+    "adults": {"kind": "count", "blank": 0},
+    "children": {"kind": "count", "blank": 0},
+    "has_pets": {"kind": "flag", "blank": 0},
+    "has_dogs": {"kind": "flag", "blank": None},
+    "has_critical_meds": {"kind": "flag", "blank": 0},
+    "meds_need_fridge": {"kind": "flag", "blank": None},
+    "special_needs": {"kind": "text", "blank": ""},
+    "large_propane": {"kind": "flag", "blank": 0},
+    "natural_gas": {"kind": "flag", "blank": 0},
+    "address": {"kind": "text", "blank": REQUIRED},
+    "phone": {"kind": "phone", "blank": None},
+    "email": {"kind": "email", "blank": None},
+    "has_med_training": {"kind": "flag", "blank": None},
+    "know_neighbors": {"kind": "flag", "blank": None},
+    "has_neighbor_key": {"kind": "flag", "blank": None},
+    "wants_newsletter": {"kind": "flag", "blank": None},
+    "allow_non_disaster_contact": {"kind": "flag", "blank": None},
+}
+
+
+class ValidationError(ValueError):
+    """
+    Raised when values fail validation. errors maps each failing
+    field to its message.
+    """
+
+    def __init__(self, errors):
+        self.errors = dict(errors)
+        super().__init__(format_errors(self.errors))
+
+
+def format_errors(errors):
+    """
+    Formats {field: message} as one line, e.g. for a reject file.
+    """
+    return "; ".join(f"{field}: {message}" for field, message in errors.items())
+
+
+def check_value(kind, text):
+    """
+    Returns the error message for a non-blank value of the given kind
+    (see VALUE_KINDS), or None when it is valid.
+    """
+    rule = VALUE_KINDS[kind]
+    if rule["cell"] is None or rule["cell"].fullmatch(text):
+        return None
+    return rule["message"]
+
+
+def validate_column(field, cells):
+    """
+    Validates and converts one column of stripped cells.
+
+    The whole column is first checked at once: a membership test for
+    blank required cells and one regex match over the joined column.
+    Only a column that fails is re-checked cell by cell to find the
+    offending rows.
+
+    Returns:
+        (values, errors): values holds one converted value per cell
+        (None for invalid cells); errors maps cell index to message.
+    """
+    rule = HOUSEHOLD_SCHEMA[field]
+    kind = VALUE_KINDS[rule["kind"]]
+    blank = rule["blank"]
+    convert = kind["convert"]
+
+    clean = blank is not REQUIRED or "" not in cells
+    if clean and kind["column"] is not None:
+        joined = "\n".join(cells)
+        clean = (joined.count("\n") == len(cells) - 1
+                 and kind["column"].fullmatch(joined) is not None)
+
+    if clean:
+        # Convert through a lookup table of the distinct values so the
+        # per-cell work stays inside map()
+        if convert is None:
+            return list(map({"": blank}.get, cells, cells)), {}
+        table = {c: convert(c) for c in set(cells) if c}
+        table[""] = blank
+        return list(map(table.__getitem__, cells)), {}
+
+    values = []
+    errors = {}
+    for i, cell in enumerate(cells):
+        if not cell:
+            if blank is REQUIRED:
+                errors[i] = "is required"
+            values.append(None if blank is REQUIRED else blank)
+            continue
+
+        message = check_value(rule["kind"], cell)
+        if message is not None:
+            errors[i] = f"{message} (got {cell!r})"
+            values.append(None)
+        else:
+            values.append(convert(cell) if convert else cell)
+
+    return values, errors
+
+
+def validate_batch(raw_rows, positions, fields):
+    """
+    Validates a batch of raw CSV rows column by column.
+
+    Parameters:
+        raw_rows (list): Rows of raw cell strings.
+        positions (dict): Column position of each field in a row.
+        fields (sequence): Fields to read, in output order.
+
+    Returns:
+        (values, errors): values is a list of tuples in fields order
+        for the valid rows; errors maps the index of each rejected row
+        (within raw_rows) to {field: message}.
+    """
+    errors = {}
+    columns = []
+
+    # Transpose the batch in one step when every row is full width
+    width = max(positions[field] for field in fields) + 1
+    transposed = None
+    if raw_rows and min(map(len, raw_rows)) >= width:
+        transposed = list(zip(*raw_rows))
+
+    for field in fields:
+        pos = positions[field]
+        if transposed is not None:
+            cells = list(map(str.strip, transposed[pos]))
+        else:
+            cells = [row[pos].strip() if pos < len(row) else "" for row in raw_rows]
+
+        column, column_errors = validate_column(field, cells)
+        for i, message in column_errors.items():
+            errors.setdefault(i, {})[field] = message
+        columns.append(column)
+
+    rows = zip(*columns)
+    if not errors:
+        return list(rows), errors
+
+    values = [row for i, row in enumerate(rows) if i not in errors]
+    return values, errors
+
+
+def validate_value(field, text):
+    """
+    Validates and converts one cell of the given household column.
+
+    Raises:
+        ValidationError: If the value is invalid.
+    """
+    values, errors = validate_column(field, [text.strip()])
+    if errors:
+        raise ValidationError({field: errors[0]})
+    return values[0]